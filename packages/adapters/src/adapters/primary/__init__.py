@@ -8,7 +8,8 @@ from .decorators import (
     exception_decorator,
     auto_response_decorator,
 )
-from .routers import v1, v2
+from .responses import FastJSONResponse, NDJSONResponse
+from .routers import v1, v2, metrics
 
 __all__ = [
     # Middlewares
@@ -19,7 +20,11 @@ __all__ = [
     # Decorators
     "exception_decorator",
     "auto_response_decorator",
+    # Responses
+    "FastJSONResponse",
+    "NDJSONResponse",
     # Routers
     "v1",
     "v2",
+    "metrics",
 ]
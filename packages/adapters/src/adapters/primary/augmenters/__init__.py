@@ -18,8 +18,8 @@ class Augmenter:
         self.account_collection = database.get_collection(CollectionName.ACCOUNTS)
         self.post_collection = database.get_collection(CollectionName.POSTS)
 
-        self.account_augmenter = AccountAugmenter(self.account_collection, CollectionName.ACCOUNTS)
-        self.post_augmenter = PostAugmenter(self.post_collection, CollectionName.POSTS)
+        self.account_augmenter = AccountAugmenter(self.account_collection, CollectionName.ACCOUNTS, account_csv)
+        self.post_augmenter = PostAugmenter(self.post_collection, CollectionName.POSTS, post_csv)
 
     async def monitor(self):
         logger.info("Skipping account augmenter monitoring for now 🥹")
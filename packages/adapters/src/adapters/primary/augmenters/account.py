@@ -11,26 +11,22 @@ class AccountAugmenter(Augmentation[AccountEntity]):
         self,
         collection: AsyncCollection,
         collection_name: CollectionName,
+        csv: str,
     ) -> None:
-        super().__init__(collection, collection_name)
+        super().__init__(collection, collection_name, AccountEntity, csv)
 
-    async def insert_one(self, attrs=None) -> Optional[AccountEntity]:
+    def build(self, attrs=None) -> Optional[AccountEntity]:
         if attrs is None:
             attrs = []
 
         [username, email, avatar] = attrs
         device_token = "bGV1c2VyY29udGVudC5jb20iLCJhdWQiOiI3MzE0MzU2NjE0ODctbX"
-        entity = AccountEntity.create(
+        return AccountEntity.create(
             username=username,
             email=email,
             password=None,
             avatar=avatar,
         )
 
-        entity_dict = entity.model_dump(exclude_unset=True)
-        result = await self.collection.insert_one(entity_dict)
-        entity.id = str(result.inserted_id)
-        return entity
-
     def process_line(self, line: str) -> List[str]:
         return line.strip().split(",")
@@ -1,13 +1,14 @@
 import asyncio
 import os
-from bson import ObjectId
 from domain.entities.base_entity import BaseEntity
 from loguru import logger
-from typing import List, Optional, TypeVar, Generic
+from typing import List, Optional, TypeVar, Generic, Type
 from pymongo.asynchronous.collection import AsyncCollection
 from core.database import CollectionName
 from abc import ABC, abstractmethod
 
+from adapters.secondary.repositories import BaseRepository
+
 T = TypeVar("T", bound="BaseEntity")
 
 
@@ -25,21 +26,13 @@ class Augmentation(Generic[T], ABC):
         self,
         collection: AsyncCollection,
         collection_name: CollectionName,
+        model: Type[T],
+        csv: str,
     ) -> None:
         self.collection = collection
         self.collection_name = collection_name
-
-    async def create(self, entity: T) -> T:
-        entity_dict = entity.model_dump(exclude_unset=True)
-
-        # convert all fields contain "_id" string to ObjectId
-        for key, value in entity_dict.items():
-            if "_id" in key and key != "_id":
-                entity_dict[key] = ObjectId(value)
-
-        result = await self.collection.insert_one(entity_dict)
-        entity.id = str(result.inserted_id)
-        return entity
+        self.csv = csv
+        self.repository = BaseRepository(collection, model)
 
     async def monitor(self) -> None:
         num_required = self.NUM_COLLECTION_REQUIRED.get(self.collection_name, 0)
@@ -75,22 +68,19 @@ class Augmentation(Generic[T], ABC):
                 count += 1
 
         logger.info(f"Number of entities to insert: {len(entities)}")
-        tasks = []
-        for entity in entities:
-            tasks.append(self.insert_one(entity))
-
-        results = await asyncio.gather(*tasks)
-        for result in results:
-            if result is None:
-                continue
+        built = [entity for entity in (self.build(parts) for parts in entities) if entity is not None]
 
-            logger.info(f"Inserted entity: {result}")
+        # one unordered bulk write per chunk instead of one round trip per document
+        report = await self.repository.create_many(built)
+        logger.info(f"Inserted {report.inserted_count} entities into {self.collection_name}")
+        for failure in report.failed:
+            logger.warning(f"Failed to insert entity #{failure.index}: {failure.message}")
 
         end_time = asyncio.get_event_loop().time()
         logger.info(f"Time taken to insert entities: {end_time - start_time:.2f} seconds")
 
     @abstractmethod
-    async def insert_one(self, attrs=None) -> Optional[T]: ...
+    def build(self, attrs=None) -> Optional[T]: ...
 
     @abstractmethod
     def process_line(self, line: str) -> List[str]: ...
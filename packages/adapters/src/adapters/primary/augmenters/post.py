@@ -50,8 +50,9 @@ class PostAugmenter(Augmentation[PostEntity]):
         self,
         collection: AsyncCollection,
         collection_name: CollectionName,
+        csv: str,
     ) -> None:
-        super().__init__(collection, collection_name)
+        super().__init__(collection, collection_name, PostEntity, csv)
         self.accounts = []
 
     def process_line(self, line: str) -> List[str]:
@@ -65,7 +66,7 @@ class PostAugmenter(Augmentation[PostEntity]):
     def provide_accounts(self, accounts: List[str]) -> None:
         self.accounts = accounts
 
-    async def insert_one(self, attrs=None) -> Optional[PostEntity]:
+    def build(self, attrs=None) -> Optional[PostEntity]:
         if attrs is None:
             attrs = []
 
@@ -82,12 +83,10 @@ class PostAugmenter(Augmentation[PostEntity]):
         captions = random.sample(content, k=random.randint(2, 3))
         selected_tags = random.sample(tags, k=random.randint(3, 5))
 
-        entity = PostEntity.create(
+        return PostEntity.create(
             account_id=account_id,
             image_url=image_url,
             title=title,
             captions=captions,
             tags=selected_tags,
         )
-
-        return await self.create(entity)
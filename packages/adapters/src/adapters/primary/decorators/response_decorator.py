@@ -1,11 +1,11 @@
 from functools import wraps
 from fastapi import status
-from fastapi.responses import JSONResponse
-from fastapi.encoders import jsonable_encoder
 
 from core.exceptions import ExceptionHandler, ErrorCodes
 from core.base import HttpResponse, HttpPaginationResponse, Meta
 
+from adapters.primary.responses import FastJSONResponse
+
 
 def http_response(
     message: str = "Request processed successfully 🐳",
@@ -23,7 +23,7 @@ def http_response(
                     data=result,
                 )
 
-                return JSONResponse(content=jsonable_encoder(response))
+                return FastJSONResponse(content=response)
 
             except ExceptionHandler:
                 # Re-raise ExceptionHandler
@@ -58,7 +58,7 @@ def http_pagination_response(message: str = "Request processed successfully 🐳
                         data=result,
                     )
 
-                return JSONResponse(content=jsonable_encoder(response))
+                return FastJSONResponse(content=response)
 
             except ExceptionHandler:
                 # Re-raise ExceptionHandler
@@ -99,7 +99,7 @@ def auto_response_decorator(message: str = "Request processed successfully 🐳"
                         data=result,
                     )
 
-                return JSONResponse(content=jsonable_encoder(response))
+                return FastJSONResponse(content=response)
 
             except ExceptionHandler:
                 # Re-raise ExceptionHandler
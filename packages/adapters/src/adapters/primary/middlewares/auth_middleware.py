@@ -1,34 +1,42 @@
 from fastapi import Depends, Request
 
-from core.secures import Jwt, JwtPayload, KeyType
+from core.secures import Jwt, JwtPayload, KeyType, TokenCache
 from core.exceptions import ErrorCodes, ExceptionHandler
-from domain.entities import AccountEntity
+from domain.entities import AccountSummary
 from domain.services import AccountService
 
-from adapters.shared.dependencies import build_account_service, build_jwt
+from adapters.shared.dependencies import build_account_service, build_jwt, token_cache_from_state
 
 
-async def required_authentication(req: Request, jwt: Jwt) -> JwtPayload:
+async def required_authentication(req: Request, jwt: Jwt, token_cache: TokenCache) -> JwtPayload:
     authorization = req.headers.get("Authorization", "")
     if not authorization.startswith("Bearer "):
         raise ExceptionHandler(code=ErrorCodes.UNAUTHORIZED, msg="Invalid or missing Bearer token 👀")
 
     token = authorization.removeprefix("Bearer ").strip()
-    claims = jwt.decode(token, KeyType.ACCESS)
+    claims = token_cache.get_claims(token)
+    if claims is None:
+        claims = jwt.decode(token, KeyType.ACCESS)
+        token_cache.set_claims(token, claims)
+
     return claims
 
 
 async def auth_middleware(
     req: Request,
     jwt: Jwt = Depends(build_jwt),
+    token_cache: TokenCache = Depends(token_cache_from_state),
     account_service: AccountService = Depends(build_account_service),
-) -> AccountEntity:
+) -> AccountSummary:
     try:
-        claims = await required_authentication(req, jwt)
-        account = await account_service.find_by_id(claims.account_id)
-
-        if not account:
-            raise ExceptionHandler(code=ErrorCodes.UNAUTHORIZED, msg="Account not found in database 🐔")
+        claims = await required_authentication(req, jwt, token_cache)
+        account = token_cache.get_account(claims.account_id)
+        if account is None:
+            account = await account_service.find_summary_by_id(claims.account_id)
+            if not account:
+                raise ExceptionHandler(code=ErrorCodes.UNAUTHORIZED, msg="Account not found in database 🐔")
+
+            token_cache.set_account(claims.account_id, account)
 
         req.state.account = account
         return account
@@ -1,48 +1,76 @@
-from datetime import datetime, timedelta
+import math
+from typing import Dict, List, Optional, Tuple
 from fastapi.responses import JSONResponse
-from fastapi import Request, status
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi import status
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from adapters.secondary.limiters import RateLimiter, RateLimitRule
 
-class RateLimitingMiddleware(BaseHTTPMiddleware):
-    # Rate limiting configurations
-    RATE_LIMIT_DURATION = timedelta(minutes=1)
-    RATE_LIMIT_REQUESTS = 100  # Maximum requests allowed in the duration
 
-    def __init__(self, app):
-        super().__init__(app)
-        # Dictionary to store request counts for each IP
-        self.request_counts = {}
+class RateLimitingMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        limiter: RateLimiter,
+        requests: int,
+        duration: int,
+        rules: Optional[Dict[str, Tuple[int, int]]] = None,
+    ):
+        self.app = app
+        self.limiter = limiter
+        self.default_rule = RateLimitRule(requests=requests, duration=duration)
+
+        # route prefix -> rule, longest prefix wins
+        self.rules: List[Tuple[str, RateLimitRule]] = sorted(
+            [(prefix, RateLimitRule(*rule)) for prefix, rule in (rules or {}).items()],
+            key=lambda item: len(item[0]),
+            reverse=True,
+        )
+
+    def resolve_rule(self, path: str) -> Tuple[str, RateLimitRule]:
+        for prefix, rule in self.rules:
+            if path.startswith(prefix):
+                return prefix, rule
+
+        return "*", self.default_rule
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-    async def dispatch(self, request: Request, call_next):
         # Get the client's IP address
-        client_ip = request.client.host  # type: ignore
+        client = scope.get("client")
+        client_ip = client[0] if client else "Unknown"
+
+        prefix, rule = self.resolve_rule(scope["path"])
+        result = await self.limiter.hit(f"{prefix}:{client_ip}", rule)
 
-        # Check if IP is already present in request_counts
-        request_count, last_request = self.request_counts.get(client_ip, (0, datetime.min))
+        headers = {
+            "X-RateLimit-Limit": str(rule.requests),
+            "X-RateLimit-Remaining": str(result.remaining),
+        }
 
-        # Calculate the time elapsed since the last request
-        elapsed_time = datetime.now() - last_request
+        if not result.allowed:
+            headers["Retry-After"] = str(math.ceil(result.retry_after))
+            response = JSONResponse(
+                status_code=status.HTTP_200_OK,
+                content={
+                    "statusCode": status.HTTP_429_TOO_MANY_REQUESTS,
+                    "message": "Rate limit exceeded. Please try again later.",
+                },
+                headers=headers,
+            )
 
-        if elapsed_time > self.RATE_LIMIT_DURATION:
-            # If the elapsed time is greater than the rate limit duration, reset the count
-            request_count = 1
-        else:
-            if request_count >= self.RATE_LIMIT_REQUESTS:
-                # If the request count exceeds the rate limit, return a JSON response with an error message
-                return JSONResponse(
-                    status_code=status.HTTP_200_OK,
-                    content={
-                        "statusCode": status.HTTP_429_TOO_MANY_REQUESTS,
-                        "message": "Rate limit exceeded. Please try again later.",
-                    },
-                )
+            await response(scope, receive, send)
+            return
 
-            request_count += 1
+        async def send_with_headers(message: Message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).update(headers)
 
-        # Update the request count and last request timestamp for the IP
-        self.request_counts[client_ip] = (request_count, datetime.now())
+            await send(message)
 
         # Proceed with the request
-        response = await call_next(request)
-        return response
+        await self.app(scope, receive, send_with_headers)
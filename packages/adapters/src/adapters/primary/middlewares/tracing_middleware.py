@@ -1,29 +1,63 @@
 import time
 from loguru import logger
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from core.metrics import REGISTRY
 
-class TracingMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app):
-        super().__init__(app)
+HTTP_REQUEST_DURATION = REGISTRY.histogram(
+    "http_request_duration_seconds",
+    "Duration of HTTP requests by route template",
+    ("method", "route", "status"),
+)
 
-    async def dispatch(self, request: Request, call_next):
-        start_time = time.perf_counter()
-
-        client_ip = request.client.host if request.client else "Unknown"
-        method = request.method
-        url = str(request.url)
-        user_agent = request.headers.get("User-Agent", "Unknown")
 
-        logger.info(f"📌 [Request] IP: {client_ip}, Method: {method}, URL: {url}, User-Agent: {user_agent}")
+class TracingMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
 
-        response = await call_next(request)
-        process_time = time.perf_counter() - start_time
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        logger.info(
-            f"✅ [Response] IP: {client_ip}, Method: {method}, URL: {url}, User-Agent: {user_agent}, Process Time: {process_time:.4f}s"
-        )
-
-        response.headers["X-Process-Time"] = str(process_time)
-        return response
+        start_time = time.perf_counter()
+        status_code = 500
+
+        async def send_with_process_time(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers["X-Process-Time"] = str(time.perf_counter() - start_time)
+
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_process_time)
+        finally:
+            process_time = time.perf_counter() - start_time
+
+            # the router stores the matched route in the scope, label by its template to bound cardinality
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION.observe(
+                process_time,
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                str(status_code),
+            )
+
+            client = scope.get("client")
+            query_string = scope.get("query_string", b"")
+            url = scope["path"] + ("?" + query_string.decode("latin-1") if query_string else "")
+
+            # the message is still formatted here, on the request path, only the sink write is queued by enqueue=True
+            logger.info(
+                "✅ [Response] IP: {}, Method: {}, URL: {}, User-Agent: {}, Status: {}, Process Time: {:.4f}s",
+                client[0] if client else "Unknown",
+                scope["method"],
+                url,
+                Headers(scope=scope).get("user-agent", "Unknown"),
+                status_code,
+                process_time,
+            )
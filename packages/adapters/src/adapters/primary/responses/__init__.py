@@ -0,0 +1,4 @@
+from .json_response import FastJSONResponse, serialize
+from .ndjson_response import NDJSONResponse
+
+__all__ = ["FastJSONResponse", "NDJSONResponse", "serialize"]
@@ -0,0 +1,25 @@
+from typing import Any
+import orjson
+from pydantic import BaseModel
+from pydantic_core import PydanticSerializationError
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response
+
+
+def serialize(content: Any) -> bytes:
+    try:
+        if isinstance(content, BaseModel):
+            # compiled serializer, camelCase aliases match what jsonable_encoder produced before
+            content = content.model_dump(mode="json", by_alias=True)
+
+        return orjson.dumps(content)
+    except (PydanticSerializationError, TypeError):
+        # values neither pydantic nor orjson understand (raw ObjectId, custom classes, ...)
+        return orjson.dumps(jsonable_encoder(content))
+
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return serialize(content)
@@ -0,0 +1,29 @@
+from typing import Any, AsyncIterator
+from fastapi.responses import StreamingResponse
+
+from .json_response import serialize
+
+
+async def encode_lines(items: AsyncIterator[Any], chunk_size: int) -> AsyncIterator[bytes]:
+    # lines are coalesced into ~chunk_size writes instead of one ASGI message per document
+    buffer = bytearray()
+    async for item in items:
+        buffer += serialize(item)
+        buffer += b"\n"
+        if len(buffer) >= chunk_size:
+            yield bytes(buffer)
+            buffer.clear()
+
+    if buffer:
+        yield bytes(buffer)
+
+
+class NDJSONResponse(StreamingResponse):
+    media_type = "application/x-ndjson"
+
+    def __init__(self, items: AsyncIterator[Any], filename: str = "", chunk_size: int = 64 * 1024, **kwargs):
+        headers = kwargs.pop("headers", None) or {}
+        if filename:
+            headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+
+        super().__init__(encode_lines(items, chunk_size), headers=headers, **kwargs)
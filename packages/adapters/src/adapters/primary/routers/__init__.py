@@ -1,4 +1,5 @@
 from .v1.routes import router as v1
 from .v2.routes import router as v2
+from .metrics import router as metrics
 
-__all__ = ["v1", "v2"]
+__all__ = ["v1", "v2", "metrics"]
@@ -0,0 +1,16 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from core.configuration import Configuration
+from core.metrics import REGISTRY
+
+from adapters.shared.dependencies import config_from_state
+
+router = APIRouter(tags=["Metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics(config: Configuration = Depends(config_from_state)):
+    # with METRICS_DIRECTORY set, every worker's latest snapshot is merged into one exposition
+    content = REGISTRY.exposition(config.METRICS_DIRECTORY or None)
+    return PlainTextResponse(content, media_type="text/plain; version=0.0.4; charset=utf-8")
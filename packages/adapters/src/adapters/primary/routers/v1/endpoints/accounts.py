@@ -1,12 +1,14 @@
 from typing import Annotated
 from fastapi import APIRouter, Depends, Query, status
 
+from core.base import ExportQuery
+
 from domain.usecases import FindAccountsQuery, CreateAccountRequest, FindAccountByEmailQuery, CreateProviderParams
 from domain.services import AccountService
-from domain.entities import EnumRole, AccountEntity
+from domain.entities import EnumRole, AccountSummary
 
 from adapters.primary import auth_middleware, role_middleware
-from adapters.primary import auto_response_decorator, exception_decorator
+from adapters.primary import auto_response_decorator, exception_decorator, NDJSONResponse
 
 from adapters.shared.dependencies import build_account_service
 
@@ -36,13 +38,24 @@ async def find_account_by_email(
     status_code=status.HTTP_200_OK,
 )
 async def find_account_profile(
-    account: AccountEntity = Depends(auth_middleware),
+    account: AccountSummary = Depends(auth_middleware),
     passed: bool = Depends(role_middleware(required=[])),
     account_service: AccountService = Depends(build_account_service),
 ):
     return await account_service.find_by_id(str(account.id))
 
 
+@router.get("/export")
+@exception_decorator
+async def export_accounts(
+    query: Annotated[ExportQuery, Query()],
+    account: AccountSummary = Depends(auth_middleware),
+    passed: bool = Depends(role_middleware(required=[EnumRole.ADMIN, EnumRole.SUPER])),
+    account_service: AccountService = Depends(build_account_service),
+):
+    return NDJSONResponse(account_service.export_accounts(query), filename="accounts.ndjson")
+
+
 @router.post("/{account_id}/create-provider")
 @exception_decorator
 @auto_response_decorator(
@@ -52,7 +65,7 @@ async def find_account_profile(
 async def create_provider(
     account_id: str,
     params: CreateProviderParams,
-    account: AccountEntity = Depends(auth_middleware),
+    account: AccountSummary = Depends(auth_middleware),
     passed: bool = Depends(role_middleware(required=[])),
     account_service: AccountService = Depends(build_account_service),
 ):
@@ -67,7 +80,7 @@ async def create_provider(
 )
 async def find_account_by_id(
     account_id: str,
-    account: AccountEntity = Depends(auth_middleware),
+    account: AccountSummary = Depends(auth_middleware),
     passed: bool = Depends(role_middleware(required=[])),
     account_service: AccountService = Depends(build_account_service),
 ):
@@ -82,7 +95,7 @@ async def find_account_by_id(
 )
 async def find_accounts(
     query: Annotated[FindAccountsQuery, Query()],
-    account: AccountEntity = Depends(auth_middleware),
+    account: AccountSummary = Depends(auth_middleware),
     passed: bool = Depends(role_middleware(required=[])),
     account_service: AccountService = Depends(build_account_service),
 ):
@@ -97,7 +110,7 @@ async def find_accounts(
 )
 async def create_account(
     req: CreateAccountRequest,
-    account: AccountEntity = Depends(auth_middleware),
+    account: AccountSummary = Depends(auth_middleware),
     passed: bool = Depends(role_middleware(required=[EnumRole.SUPER])),
     account_service: AccountService = Depends(build_account_service),
 ):
@@ -1,4 +1,4 @@
-from domain.entities.account_entity import AccountEntity
+from domain.entities import AccountSummary
 from domain.usecases.auth_usecases import RefreshTokenParams
 from fastapi import APIRouter, Depends, Request, status
 
@@ -64,7 +64,7 @@ async def refresh_token(
     status_code=status.HTTP_200_OK,
 )
 async def sign_out(
-    account: AccountEntity = Depends(auth_middleware),
+    account: AccountSummary = Depends(auth_middleware),
     passed: bool = Depends(role_middleware(required=[])),
     auth_service: AuthService = Depends(build_auth_service),
 ):
@@ -1,6 +1,4 @@
 from fastapi import APIRouter, Depends, status, File, Form
-from fastapi.responses import JSONResponse
-from fastapi.encoders import jsonable_encoder
 from typing import Annotated, Literal
 
 from core.secures import JwtPayload
@@ -12,7 +10,7 @@ from domain.usecases import UploadMediaRequest
 
 from adapters.shared.dependencies import build_media_service
 from adapters.primary import auth_middleware, role_middleware
-from adapters.primary import exception_decorator
+from adapters.primary import exception_decorator, FastJSONResponse
 
 
 router = APIRouter(
@@ -39,4 +37,4 @@ async def upload_media(
         data=response,
     )
 
-    return JSONResponse(content=jsonable_encoder(response))
+    return FastJSONResponse(content=response)
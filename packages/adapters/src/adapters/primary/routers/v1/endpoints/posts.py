@@ -1,15 +1,16 @@
-from fastapi import APIRouter, Depends, status
+from typing import Annotated
+from fastapi import APIRouter, Depends, status, Query
 from fastapi.responses import JSONResponse
 from fastapi.encoders import jsonable_encoder
 
-from core.base import HttpResponse
-from core.secures import JwtPayload
+from core.base import HttpResponse, ExportQuery
 
+from domain.entities import AccountSummary, EnumRole
 from domain.services.post_service import PostService
-from domain.usecases import CreatePostRequest
+from domain.usecases import CreatePostRequest, FindPostsQuery
 
 from adapters.shared.dependencies import build_post_service
-from adapters.primary import exception_decorator, auto_response_decorator
+from adapters.primary import exception_decorator, auto_response_decorator, NDJSONResponse
 from adapters.primary import auth_middleware, role_middleware
 
 router = APIRouter(
@@ -26,8 +27,34 @@ router = APIRouter(
 )
 async def create_post(
     req: CreatePostRequest,
-    claims: JwtPayload = Depends(auth_middleware),
+    account: AccountSummary = Depends(auth_middleware),
     passed: bool = Depends(role_middleware(required=[])),
     post_service: PostService = Depends(build_post_service),
 ):
-    return await post_service.create_post(claims.account_id, req)
+    return await post_service.create_post(str(account.id), req)
+
+
+@router.get("/")
+@exception_decorator
+@auto_response_decorator(
+    message="Posts retrieved successfully 🐳",
+    status_code=status.HTTP_200_OK,
+)
+async def find_posts(
+    query: Annotated[FindPostsQuery, Query()],
+    account: AccountSummary = Depends(auth_middleware),
+    passed: bool = Depends(role_middleware(required=[])),
+    post_service: PostService = Depends(build_post_service),
+):
+    return await post_service.find_posts(query)
+
+
+@router.get("/export")
+@exception_decorator
+async def export_posts(
+    query: Annotated[ExportQuery, Query()],
+    account: AccountSummary = Depends(auth_middleware),
+    passed: bool = Depends(role_middleware(required=[EnumRole.ADMIN, EnumRole.SUPER])),
+    post_service: PostService = Depends(build_post_service),
+):
+    return NDJSONResponse(post_service.export_posts(query), filename="posts.ndjson")
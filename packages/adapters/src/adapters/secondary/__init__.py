@@ -2,9 +2,11 @@ from .apis import *
 from .queues import *
 from .repositories import *
 from .schedulers import *
+from .limiters import *
 
 __all__ = []
 __all__.extend(apis.__all__)
 __all__.extend(queues.__all__)
 __all__.extend(repositories.__all__)
 __all__.extend(schedulers.__all__)
+__all__.extend(limiters.__all__)
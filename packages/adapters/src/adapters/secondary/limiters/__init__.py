@@ -0,0 +1,5 @@
+from .base import RateLimiter, RateLimitRule, RateLimitResult
+from .memory_limiter import MemoryRateLimiter
+from .redis_limiter import RedisRateLimiter
+
+__all__ = ["RateLimiter", "RateLimitRule", "RateLimitResult", "MemoryRateLimiter", "RedisRateLimiter"]
@@ -0,0 +1,27 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimitRule:
+    requests: int  # bucket capacity
+    duration: int  # seconds to refill a full bucket
+
+    @property
+    def rate(self) -> float:
+        return self.requests / self.duration
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimitResult:
+    allowed: bool
+    remaining: int
+    retry_after: float  # seconds until the next token is available
+
+
+class RateLimiter(ABC):
+    @abstractmethod
+    async def hit(self, key: str, rule: RateLimitRule) -> RateLimitResult: ...
+
+    async def close(self) -> None:
+        pass
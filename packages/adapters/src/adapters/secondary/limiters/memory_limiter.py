@@ -0,0 +1,30 @@
+import time
+from collections import OrderedDict
+from typing import Tuple
+
+from .base import RateLimiter, RateLimitResult, RateLimitRule
+
+
+class MemoryRateLimiter(RateLimiter):
+    # Token bucket per key, least recently seen clients are evicted past max_clients
+    def __init__(self, max_clients: int):
+        self.max_clients = max_clients
+        self.buckets: OrderedDict[str, Tuple[float, float]] = OrderedDict()
+
+    async def hit(self, key: str, rule: RateLimitRule) -> RateLimitResult:
+        now = time.monotonic()
+        tokens, updated_at = self.buckets.get(key, (float(rule.requests), now))
+        tokens = min(float(rule.requests), tokens + (now - updated_at) * rule.rate)
+
+        if tokens >= 1:
+            tokens -= 1
+            result = RateLimitResult(allowed=True, remaining=int(tokens), retry_after=0.0)
+        else:
+            result = RateLimitResult(allowed=False, remaining=0, retry_after=(1 - tokens) / rule.rate)
+
+        self.buckets[key] = (tokens, now)
+        self.buckets.move_to_end(key)
+        while len(self.buckets) > self.max_clients:
+            self.buckets.popitem(last=False)
+
+        return result
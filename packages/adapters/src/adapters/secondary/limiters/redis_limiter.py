@@ -0,0 +1,58 @@
+from loguru import logger
+from redis.asyncio import Redis
+
+from .base import RateLimiter, RateLimitResult, RateLimitRule
+
+# Token bucket evaluated atomically inside Redis, using the server clock so workers never disagree
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(bucket[1]) or capacity
+local updated_at = tonumber(bucket[2]) or now
+
+tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * rate)
+
+local allowed = 0
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    retry_after = math.ceil((1 - tokens) / rate)
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated_at', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate))
+
+return {allowed, math.floor(tokens), retry_after}
+"""
+
+
+class RedisRateLimiter(RateLimiter):
+    KEY_PREFIX = "agrismart:ratelimit:"
+
+    def __init__(self, url: str):
+        self.redis = Redis.from_url(url)
+        self.script = self.redis.register_script(TOKEN_BUCKET_SCRIPT)
+
+    async def hit(self, key: str, rule: RateLimitRule) -> RateLimitResult:
+        try:
+            # rate is expressed in tokens per millisecond inside the script
+            allowed, remaining, retry_after = await self.script(
+                keys=[self.KEY_PREFIX + key],
+                args=[rule.requests, rule.rate / 1000],
+            )
+        except Exception as exception:
+            # fail open, an unavailable Redis must not take the API down with it
+            logger.error(f"Rate limiter backend is unavailable: {exception} 😵‍💫")
+            return RateLimitResult(allowed=True, remaining=rule.requests, retry_after=0.0)
+
+        return RateLimitResult(allowed=bool(allowed), remaining=int(remaining), retry_after=int(retry_after) / 1000)
+
+    async def close(self) -> None:
+        await self.redis.aclose()
@@ -1,3 +1,26 @@
-from .rabbitmq import RabbitMQConnection
+from .rabbitmq import RabbitMQConnection, QUEUE_CONFIG
+from .publisher import ChannelPool, PublisherOutbox
+from .batch_consumer import BatchConsumer, RetryMessages
+from .flow_control import FlowController, LoopLagMonitor
+from .topology import QueueTopology, DEAD_LETTER_EXCHANGE, RETRY_COUNT_HEADER
+from .memory_broker import MemoryBroker, MemoryBrokerConnection
+from .message_codec import MessageCodec, decode, decode_message
 
-__all__ = ["RabbitMQConnection"]
+__all__ = [
+    "RabbitMQConnection",
+    "QUEUE_CONFIG",
+    "ChannelPool",
+    "PublisherOutbox",
+    "BatchConsumer",
+    "RetryMessages",
+    "FlowController",
+    "LoopLagMonitor",
+    "QueueTopology",
+    "DEAD_LETTER_EXCHANGE",
+    "RETRY_COUNT_HEADER",
+    "MemoryBroker",
+    "MemoryBrokerConnection",
+    "MessageCodec",
+    "decode",
+    "decode_message",
+]
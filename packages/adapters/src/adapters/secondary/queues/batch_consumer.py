@@ -0,0 +1,205 @@
+import time
+import asyncio
+from typing import Awaitable, Callable, Iterable, List, Optional, Set
+from loguru import logger
+from aio_pika.abc import AbstractChannel, AbstractIncomingMessage, AbstractQueue
+
+from core.metrics import REGISTRY
+
+from .flow_control import FlowController
+from .publisher import ChannelPool
+from .topology import QueueTopology
+
+QUEUE_BATCH_SIZE = REGISTRY.histogram(
+    "queue_batch_size",
+    "Messages handled per batch",
+    ("queue",),
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500, 1000),
+)
+QUEUE_HANDLER_DURATION = REGISTRY.histogram(
+    "queue_handler_duration_seconds",
+    "Duration of one batch handler call",
+    ("queue",),
+)
+QUEUE_MESSAGES = REGISTRY.counter(
+    "queue_messages_total",
+    "Consumed messages by outcome",
+    ("queue", "outcome"),
+)
+
+# a batch handler returns the indexes of the messages it rejects (poison, dead-lettered at once),
+# every other message is acked, raising sends the whole batch to the retry queues (RetryMessages: part of it)
+BatchHandler = Callable[[List[AbstractIncomingMessage]], Awaitable[Iterable[int]]]
+
+
+class RetryMessages(Exception):
+    # raised by a handler when only part of a batch failed transiently: the indexes go to the retry queues,
+    # rejected ones are dead-lettered and the rest, already handled, are acked
+    def __init__(self, indexes: Iterable[int], rejected: Iterable[int] = ()):
+        self.indexes = set(indexes)
+        self.rejected = set(rejected) - self.indexes
+        super().__init__(f"{len(self.indexes)} messages to retry")
+
+
+class BatchConsumer:
+    def __init__(
+        self,
+        topology: QueueTopology,
+        handler: BatchHandler,
+        batch_size: int,
+        max_wait: float,
+        prefetch: int,
+        concurrency: int,
+        publisher: ChannelPool,
+        controller: Optional[FlowController] = None,
+        control_interval: float = 1.0,
+    ):
+        self.topology = topology
+        self.queue_name = topology.name
+        self.handler = handler
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.prefetch = prefetch
+        self.concurrency = concurrency
+        # retries are published with confirms before the original delivery is acked
+        self.publisher = publisher
+        self.controller = controller
+        self.control_interval = control_interval
+
+        # deliveries wait here until a worker pulls them into its next batch
+        self.buffer: asyncio.Queue[AbstractIncomingMessage] = asyncio.Queue()
+        self.consumer_tag: Optional[str] = None
+
+    async def on_message(self, message: AbstractIncomingMessage) -> None:
+        await self.buffer.put(message)
+
+    async def next_batch(self) -> List[AbstractIncomingMessage]:
+        # a batch closes at batch_size messages or max_wait after its first message
+        batch = [await self.buffer.get()]
+        deadline = time.monotonic() + self.max_wait
+
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+
+            try:
+                batch.append(await asyncio.wait_for(self.buffer.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def process(self, batch: List[AbstractIncomingMessage]) -> None:
+        QUEUE_BATCH_SIZE.observe(len(batch), self.queue_name)
+        start_time = time.perf_counter()
+
+        retrying: Set[int] = set()
+        try:
+            rejected = set(await self.handler(batch))
+        except RetryMessages as retry:
+            logger.warning(f"Retrying {len(retry.indexes)} of {len(batch)} messages from {self.queue_name}")
+            rejected, retrying = retry.rejected, retry.indexes
+        except Exception as exception:
+            logger.error(f"Error handling a batch of {len(batch)} messages from {self.queue_name}: {exception}")
+            await self.retry(batch)
+            return
+        finally:
+            duration = time.perf_counter() - start_time
+            QUEUE_HANDLER_DURATION.observe(duration, self.queue_name)
+            if self.controller:
+                self.controller.observe(duration)
+
+        for index, message in enumerate(batch):
+            if index in retrying:
+                continue
+
+            if index in rejected:
+                # dead-lettered by the broker through the queue's x-dead-letter-exchange
+                await message.nack(requeue=False)
+            else:
+                await message.ack()
+
+        QUEUE_MESSAGES.inc(self.queue_name, "ack", amount=len(batch) - len(rejected) - len(retrying))
+        QUEUE_MESSAGES.inc(self.queue_name, "dead", amount=len(rejected))
+
+        if retrying:
+            await self.retry([message for index, message in enumerate(batch) if index in retrying])
+
+    async def retry(self, batch: List[AbstractIncomingMessage]) -> None:
+        # the delay is spent in the TTL retry queues, never in this worker
+        retryable = [message for message in batch if self.topology.retry_count(message) < self.topology.max_retries]
+        exhausted = [message for message in batch if self.topology.retry_count(message) >= self.topology.max_retries]
+
+        if retryable:
+            try:
+                await self.topology.schedule_retries(retryable, self.publisher)
+            except Exception as exception:
+                # without a confirmed copy the original goes back to the queue instead
+                logger.error(f"Error scheduling retries for {self.queue_name}: {exception}")
+                for message in retryable:
+                    await message.nack(requeue=True)
+
+                QUEUE_MESSAGES.inc(self.queue_name, "requeue", amount=len(retryable))
+                retryable = []
+
+        for message in retryable:
+            await message.ack()
+
+        for message in exhausted:
+            await message.nack(requeue=False)
+
+        QUEUE_MESSAGES.inc(self.queue_name, "retry", amount=len(retryable))
+        QUEUE_MESSAGES.inc(self.queue_name, "dead", amount=len(exhausted))
+
+    async def work(self) -> None:
+        while True:
+            batch = await self.next_batch()
+            try:
+                await self.process(batch)
+            except Exception as exception:
+                # ack/nack failed (channel closed), the broker redelivers the unacked messages
+                logger.error(f"Error settling a batch from {self.queue_name}: {exception}")
+
+    async def control(self, channel: AbstractChannel, queue: AbstractQueue) -> None:
+        assert self.controller is not None
+        prefetch = self.prefetch
+
+        while True:
+            await asyncio.sleep(self.control_interval)
+            next_prefetch, is_paused = self.controller.decide()
+
+            if next_prefetch != prefetch:
+                await channel.set_qos(prefetch_count=next_prefetch, global_=True)
+                prefetch = next_prefetch
+
+            if is_paused and self.consumer_tag:
+                # deliveries already buffered are still handled, the broker just stops sending new ones
+                await queue.cancel(self.consumer_tag)
+                self.consumer_tag = None
+                logger.warning(f"Paused consuming from {self.queue_name}, downstream is saturated 🚧")
+            elif not is_paused and not self.consumer_tag:
+                self.consumer_tag = await queue.consume(self.on_message)
+                logger.info(f"Resumed consuming from {self.queue_name} ✅")
+
+    async def run(self, channel: AbstractChannel) -> None:
+        # prefetch bounds the unacked messages held by this consumer across all of its workers,
+        # the channel is dedicated to this consumer, so a channel-wide (global) limit can be resized live
+        await channel.set_qos(prefetch_count=self.prefetch, global_=True)
+        queue = await self.topology.declare(channel)
+
+        workers = [asyncio.create_task(self.work()) for _ in range(self.concurrency)]
+        self.consumer_tag = await queue.consume(self.on_message)
+        if self.controller:
+            workers.append(asyncio.create_task(self.control(channel, queue)))
+
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+
+            await asyncio.gather(*workers, return_exceptions=True)
+            if self.consumer_tag:
+                await queue.cancel(self.consumer_tag)
+                self.consumer_tag = None
@@ -1,13 +1,60 @@
-import json
+from typing import List, Set
 from loguru import logger
 from aio_pika.abc import AbstractIncomingMessage
 
+from core.database import Database, CollectionName
 
-async def notification_consumer(message: AbstractIncomingMessage):
-    async with message.process():
+from ..batch_consumer import RetryMessages
+from ..message_codec import decode_message
+
+# write errors that fail again on every retry: duplicate key, document validation
+PERMANENT_WRITE_ERRORS = {11000, 121}
+
+
+async def notification_consumer(messages: List[AbstractIncomingMessage], database: Database) -> Set[int]:
+    # NOTE: imported on use, domain.services imports this package (RabbitMQConnection) while it is initialised
+    from domain.entities import NotificationEntity, NotificationType
+    from adapters.secondary.repositories import BaseRepository
+
+    rejected: Set[int] = set()
+    positions: List[int] = []
+    notifications: List[NotificationEntity] = []
+
+    for index, message in enumerate(messages):
         try:
-            body = json.loads(message.body.decode())
-            logger.info(f"Processing notification: {body}")
-            # Your notification logic here
+            body = decode_message(message)
+            notification = NotificationEntity.create(
+                account_id=body["account_id"],
+                ref_id=body.get("ref_id", ""),
+                ref_type=NotificationType(body.get("ref_type", NotificationType.POST.value)),
+                content=body["message"],
+            )
         except Exception as e:
-            logger.error(f"Error processing notification: {e}")
+            logger.error(f"Invalid notification message: {e}")
+            rejected.add(index)
+            continue
+
+        positions.append(index)
+        notifications.append(notification)
+
+    if not notifications:
+        return rejected
+
+    # the whole batch is written with one insert_many
+    repository = BaseRepository(database.get_collection(CollectionName.NOTIFICATIONS), NotificationEntity)
+    report = await repository.create_many(notifications)
+    logger.info(f"Saved {len(report.succeeded)} notifications")
+
+    # timeouts and pool errors come back without a code, those messages go through the retry queues
+    retrying: Set[int] = set()
+    for failure in report.failed:
+        logger.error(f"Error saving notification: {failure.message}")
+        if failure.code in PERMANENT_WRITE_ERRORS:
+            rejected.add(positions[failure.index])
+        else:
+            retrying.add(positions[failure.index])
+
+    if retrying:
+        raise RetryMessages(retrying, rejected)
+
+    return rejected
@@ -1,13 +1,21 @@
-import json
-from aio_pika.abc import AbstractIncomingMessage
+from typing import List, Set
 from loguru import logger
+from aio_pika.abc import AbstractIncomingMessage
+
+from core.database import Database
 
+from ..message_codec import decode_message
 
-async def submission_consumer(message: AbstractIncomingMessage):
-    async with message.process():
+
+async def submission_consumer(messages: List[AbstractIncomingMessage], database: Database) -> Set[int]:
+    rejected: Set[int] = set()
+    for index, message in enumerate(messages):
         try:
-            body = json.loads(message.body.decode())
-            logger.info(f"Processing notification: {body}")
-            # Your notification logic here
+            body = decode_message(message)
+            logger.info(f"Processing submission: {body}")
+            # Your submission logic here
         except Exception as e:
-            logger.error(f"Error processing notification: {e}")
+            logger.error(f"Error processing submission: {e}")
+            rejected.add(index)
+
+    return rejected
@@ -0,0 +1,115 @@
+import asyncio
+from typing import Callable, List, Optional, Tuple
+
+from core.metrics import REGISTRY, GaugeMerge
+
+EVENT_LOOP_LAG = REGISTRY.gauge(
+    "event_loop_lag_seconds",
+    "Delay of a scheduled wake-up on the event loop",
+    merge=GaugeMerge.MAX,
+)
+QUEUE_PREFETCH = REGISTRY.gauge("queue_prefetch", "Current prefetch count of a consumer", ("queue",))
+QUEUE_PAUSED = REGISTRY.gauge(
+    "queue_paused",
+    "Whether a consumer is paused by backpressure",
+    ("queue",),
+    merge=GaugeMerge.MAX,
+)
+
+# event loop lag thresholds (seconds): below LOW prefetch may grow, above HIGH it is halved,
+# above PAUSE consumption stops until the lag is back under RESUME for RESUME_CHECKS checks in a row
+LOOP_LAG_LOW = 0.01
+LOOP_LAG_HIGH = 0.05
+LOOP_LAG_PAUSE = 0.25
+LOOP_LAG_RESUME = 0.02
+RESUME_CHECKS = 3
+
+# weight of the latest batch in the handler latency moving average
+LATENCY_SMOOTHING = 0.3
+
+
+class LoopLagMonitor:
+    # one per process: how late a sleep wakes up is what every coroutine on the loop is waiting extra
+    def __init__(self, interval: float = 0.1):
+        self.interval = interval
+        self.lag = 0.0
+        self.task: Optional[asyncio.Task] = None
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start_time = loop.time()
+            await asyncio.sleep(self.interval)
+            self.lag = max(0.0, loop.time() - start_time - self.interval)
+            EVENT_LOOP_LAG.set(self.lag)
+
+    def start(self) -> None:
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+            self.task = None
+
+
+class FlowController:
+    """
+    Adjusts a consumer's prefetch from its handler latency and the event loop lag (additive increase,
+    multiplicative decrease), and pauses it while a downstream dependency reports saturation.
+    """
+
+    def __init__(
+        self,
+        queue_name: str,
+        prefetch: int,
+        min_prefetch: int,
+        max_prefetch: int,
+        target_latency: float,
+        monitor: LoopLagMonitor,
+        probes: Optional[List[Callable[[], bool]]] = None,
+    ):
+        self.queue_name = queue_name
+        self.prefetch = prefetch
+        self.min_prefetch = min_prefetch
+        self.max_prefetch = max_prefetch
+        self.target_latency = target_latency
+        self.monitor = monitor
+        # each probe returns True while its dependency (Mongo pool, model executor, ...) is saturated
+        self.probes = probes or []
+
+        self.latency = 0.0
+        self.is_paused = False
+        self.calm_checks = 0
+
+        QUEUE_PREFETCH.set(prefetch, queue_name)
+        QUEUE_PAUSED.set(0, queue_name)
+
+    def observe(self, duration: float) -> None:
+        self.latency = LATENCY_SMOOTHING * duration + (1 - LATENCY_SMOOTHING) * self.latency
+
+    def is_saturated(self) -> bool:
+        return any(probe() for probe in self.probes)
+
+    def decide(self) -> Tuple[int, bool]:
+        lag = self.monitor.lag
+        is_saturated = self.is_saturated()
+
+        # hysteresis: pausing is immediate, resuming needs RESUME_CHECKS calm checks in a row
+        if not self.is_paused and (is_saturated or lag >= LOOP_LAG_PAUSE):
+            self.is_paused = True
+            self.calm_checks = 0
+        elif self.is_paused:
+            self.calm_checks = self.calm_checks + 1 if not is_saturated and lag <= LOOP_LAG_RESUME else 0
+            if self.calm_checks >= RESUME_CHECKS:
+                self.is_paused = False
+
+        if self.latency > self.target_latency or lag > LOOP_LAG_HIGH:
+            self.prefetch = max(self.min_prefetch, self.prefetch // 2)
+        elif not self.is_paused and self.latency < self.target_latency * 0.8 and lag < LOOP_LAG_LOW:
+            self.prefetch = min(self.max_prefetch, self.prefetch + self.min_prefetch)
+
+        QUEUE_PREFETCH.set(self.prefetch, self.queue_name)
+        QUEUE_PAUSED.set(int(self.is_paused), self.queue_name)
+        return self.prefetch, self.is_paused
@@ -0,0 +1,387 @@
+import asyncio
+import itertools
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Deque, Dict, List, Optional, Set, Tuple
+from loguru import logger
+from aio_pika import DeliveryMode, Message
+
+from .rabbitmq import RabbitMQConnection
+
+# NOTE: an in-process stand-in for the small part of the AMQP model the application uses: the default and
+# direct exchanges, durable queues with x-message-ttl / x-dead-letter-* arguments, channel-wide prefetch,
+# publisher confirms, ack / nack / requeue and basic.get. Messages never leave the process.
+
+
+class DeclarationResult:
+    def __init__(self, queue: "MemoryQueue"):
+        self.queue = queue
+
+    @property
+    def message_count(self) -> int:
+        return len(self.queue.ready)
+
+    @property
+    def consumer_count(self) -> int:
+        return len(self.queue.consumers)
+
+
+class MemoryMessage:
+    def __init__(
+        self,
+        body: bytes,
+        routing_key: str,
+        headers: Optional[Dict[str, Any]] = None,
+        content_type: Optional[str] = None,
+        content_encoding: Optional[str] = None,
+        message_id: Optional[str] = None,
+        delivery_mode: DeliveryMode = DeliveryMode.NOT_PERSISTENT,
+    ):
+        self.body = body
+        self.routing_key = routing_key
+        self.headers = headers or {}
+        self.content_type = content_type
+        self.content_encoding = content_encoding
+        self.message_id = message_id
+        self.delivery_mode = delivery_mode
+
+        self.redelivered = False
+        self.delivery_tag: Optional[int] = None
+        self.channel: Optional["MemoryChannel"] = None
+        self.queue: Optional["MemoryQueue"] = None
+        self.expiry: Optional[asyncio.TimerHandle] = None
+
+    @classmethod
+    def from_message(cls, message: Message, routing_key: str) -> "MemoryMessage":
+        return cls(
+            body=message.body,
+            routing_key=routing_key,
+            headers=dict(message.headers or {}),
+            content_type=message.content_type,
+            content_encoding=message.content_encoding,
+            message_id=message.message_id,
+            delivery_mode=message.delivery_mode,
+        )
+
+    def copy(self, routing_key: str, headers: Dict[str, Any]) -> "MemoryMessage":
+        return MemoryMessage(
+            self.body,
+            routing_key,
+            headers,
+            self.content_type,
+            self.content_encoding,
+            self.message_id,
+            self.delivery_mode,
+        )
+
+    def settle(self) -> Tuple["MemoryChannel", "MemoryQueue"]:
+        if self.channel is None or self.queue is None:
+            raise RuntimeError("Message is already settled")
+
+        channel, queue = self.channel, self.queue
+        self.channel = None
+        channel.unacked.discard(self)
+        return channel, queue
+
+    async def ack(self, multiple: bool = False) -> None:
+        channel, _ = self.settle()
+        channel.dispatch()
+
+    async def nack(self, multiple: bool = False, requeue: bool = True) -> None:
+        channel, queue = self.settle()
+        if requeue:
+            self.redelivered = True
+            queue.enqueue(self, front=True)
+        else:
+            queue.dead_letter(self, "rejected")
+
+        channel.dispatch()
+
+    async def reject(self, requeue: bool = False) -> None:
+        await self.nack(requeue=requeue)
+
+
+class MemoryQueue:
+    def __init__(self, broker: "MemoryBroker", name: str, arguments: Optional[Dict[str, Any]] = None):
+        self.broker = broker
+        self.name = name
+        self.arguments = arguments or {}
+
+        self.ready: Deque[MemoryMessage] = deque()
+        self.consumers: Dict[str, Tuple["MemoryChannel", Callable]] = {}
+        # consumers take turns, like RabbitMQ's round robin between consumers of one queue
+        self.rotation: Deque[str] = deque()
+
+    def enqueue(self, message: MemoryMessage, front: bool = False) -> None:
+        message.queue = self
+        if front:
+            self.ready.appendleft(message)
+        else:
+            self.ready.append(message)
+
+        ttl = self.arguments.get("x-message-ttl")
+        if ttl is not None and message.expiry is None:
+            message.expiry = asyncio.get_running_loop().call_later(ttl / 1000, self.expire, message)
+
+        self.dispatch()
+
+    def take(self) -> MemoryMessage:
+        message = self.ready.popleft()
+        if message.expiry is not None:
+            message.expiry.cancel()
+            message.expiry = None
+
+        return message
+
+    def expire(self, message: MemoryMessage) -> None:
+        message.expiry = None
+        if message in self.ready:
+            self.ready.remove(message)
+            self.dead_letter(message, "expired")
+
+    def dead_letter(self, message: MemoryMessage, reason: str) -> None:
+        exchange = self.arguments.get("x-dead-letter-exchange")
+        if exchange is None:
+            return
+
+        routing_key = self.arguments.get("x-dead-letter-routing-key", message.routing_key)
+        deaths = [{"queue": self.name, "reason": reason, "count": 1}, *message.headers.get("x-death", [])]
+        self.broker.route(exchange, routing_key, message.copy(routing_key, {**message.headers, "x-death": deaths}))
+
+    def dispatch(self) -> None:
+        while self.ready and self.rotation:
+            for _ in range(len(self.rotation)):
+                tag = self.rotation[0]
+                self.rotation.rotate(-1)
+
+                channel, callback = self.consumers[tag]
+                if channel.has_capacity():
+                    channel.deliver(self.take(), self, callback)
+                    break
+            else:
+                # every consumer is at its prefetch limit, an ack or a qos change dispatches again
+                return
+
+
+class MemoryExchange:
+    def __init__(self, broker: "MemoryBroker", name: str):
+        self.broker = broker
+        self.name = name
+        self.bindings: Dict[str, Set[str]] = {}
+
+    async def publish(self, message: Message, routing_key: str, **kwargs: Any) -> None:
+        # the injected latency stands for the round trip until the broker confirms
+        if self.broker.latency:
+            await asyncio.sleep(self.broker.latency)
+
+        self.broker.route(self.name, routing_key, MemoryMessage.from_message(message, routing_key))
+
+
+class MemoryQueueHandle:
+    # queue operations are channel bound in AMQP, consumers belong to the channel that started them
+    def __init__(self, queue: MemoryQueue, channel: "MemoryChannel"):
+        self.queue = queue
+        self.channel = channel
+        self.name = queue.name
+        self.declaration_result = DeclarationResult(queue)
+
+    async def consume(self, callback: Callable, no_ack: bool = False, **kwargs: Any) -> str:
+        tag = f"ctag-{next(self.channel.broker.counter)}"
+        self.queue.consumers[tag] = (self.channel, callback)
+        self.queue.rotation.append(tag)
+        self.channel.consumed.add(self.queue)
+        self.queue.dispatch()
+        return tag
+
+    async def cancel(self, consumer_tag: str, **kwargs: Any) -> None:
+        self.queue.consumers.pop(consumer_tag, None)
+        if consumer_tag in self.queue.rotation:
+            self.queue.rotation.remove(consumer_tag)
+
+    async def bind(self, exchange: MemoryExchange, routing_key: str, **kwargs: Any) -> None:
+        exchange.bindings.setdefault(routing_key, set()).add(self.queue.name)
+
+    async def get(self, no_ack: bool = False, fail: bool = True, **kwargs: Any) -> Optional[MemoryMessage]:
+        if not self.queue.ready:
+            if fail:
+                raise LookupError(f"Queue {self.queue.name} is empty")
+
+            return None
+
+        message = self.queue.take()
+        message.queue = self.queue
+        if not no_ack:
+            message.channel = self.channel
+            self.channel.unacked.add(message)
+
+        return message
+
+    async def purge(self, **kwargs: Any) -> None:
+        self.queue.ready.clear()
+
+    async def delete(self, if_unused: bool = True, if_empty: bool = True, **kwargs: Any) -> None:
+        self.channel.broker.queues.pop(self.queue.name, None)
+
+
+class MemoryChannel:
+    def __init__(self, broker: "MemoryBroker", publisher_confirms: bool = True):
+        self.broker = broker
+        self.publisher_confirms = publisher_confirms
+        self.is_closed = False
+
+        # prefetch is channel wide (global), 0 means unlimited as in AMQP
+        self.prefetch = 0
+        self.unacked: Set[MemoryMessage] = set()
+        self.consumed: Set[MemoryQueue] = set()
+        # the loop only keeps weak references to tasks, pending deliveries are held here until they finish
+        self.deliveries: Set[asyncio.Task] = set()
+        self.default_exchange = broker.exchanges[""]
+
+    def has_capacity(self) -> bool:
+        return not self.is_closed and (self.prefetch == 0 or len(self.unacked) < self.prefetch)
+
+    def deliver(self, message: MemoryMessage, queue: MemoryQueue, callback: Callable) -> None:
+        message.channel = self
+        message.queue = queue
+        message.delivery_tag = next(self.broker.counter)
+        self.unacked.add(message)
+
+        delivery = asyncio.create_task(self.invoke(callback, message))
+        self.deliveries.add(delivery)
+        delivery.add_done_callback(self.deliveries.discard)
+
+    async def invoke(self, callback: Callable, message: MemoryMessage) -> None:
+        if self.broker.latency:
+            await asyncio.sleep(self.broker.latency)
+
+        try:
+            await callback(message)
+        except Exception as exception:
+            # aio_pika logs consumer callback errors and keeps the delivery unacked, so does this broker
+            logger.error(f"Error in consumer callback for {message.routing_key}: {exception}")
+
+    def dispatch(self) -> None:
+        for queue in list(self.consumed):
+            queue.dispatch()
+
+    async def set_qos(self, prefetch_count: int = 0, global_: bool = False, **kwargs: Any) -> None:
+        self.prefetch = prefetch_count
+        self.dispatch()
+
+    async def declare_exchange(self, name: str, *args: Any, **kwargs: Any) -> MemoryExchange:
+        exchange = self.broker.exchanges.get(name)
+        if exchange is None:
+            exchange = MemoryExchange(self.broker, name)
+            self.broker.exchanges[name] = exchange
+
+        return exchange
+
+    async def declare_queue(
+        self,
+        name: str,
+        durable: bool = False,
+        arguments: Optional[Dict[str, Any]] = None,
+        passive: bool = False,
+        **kwargs: Any,
+    ) -> MemoryQueueHandle:
+        queue = self.broker.queues.get(name)
+        if queue is None:
+            if passive:
+                raise LookupError(f"Queue {name} does not exist")
+
+            queue = MemoryQueue(self.broker, name, arguments)
+            self.broker.queues[name] = queue
+        elif arguments is not None and queue.arguments != arguments:
+            # RabbitMQ answers PRECONDITION_FAILED when a queue is redeclared with other arguments
+            raise ValueError(f"Queue {name} already exists with arguments {queue.arguments}")
+
+        return MemoryQueueHandle(queue, self)
+
+    async def queue_delete(self, queue_name: str, **kwargs: Any) -> None:
+        self.broker.queues.pop(queue_name, None)
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[None]:
+        yield
+
+    async def close(self) -> None:
+        if self.is_closed:
+            return
+
+        self.is_closed = True
+        # a consumer callback may close its own channel, it must not wait for itself
+        deliveries = [delivery for delivery in self.deliveries if delivery is not asyncio.current_task()]
+        for delivery in deliveries:
+            delivery.cancel()
+
+        await asyncio.gather(*deliveries, return_exceptions=True)
+        for queue in self.consumed:
+            for tag, (channel, _) in list(queue.consumers.items()):
+                if channel is self:
+                    queue.consumers.pop(tag)
+                    queue.rotation.remove(tag)
+
+        # unacked deliveries of a closed channel go back to their queues, flagged as redelivered
+        for message in list(self.unacked):
+            queue = message.queue
+            message.channel = None
+            message.redelivered = True
+            if queue is not None:
+                queue.enqueue(message, front=True)
+
+        self.unacked.clear()
+
+
+class MemoryConnection:
+    def __init__(self, broker: "MemoryBroker"):
+        self.broker = broker
+        self.is_closed = False
+        self.channels: List[MemoryChannel] = []
+
+    async def channel(self, publisher_confirms: bool = True, **kwargs: Any) -> MemoryChannel:
+        channel = MemoryChannel(self.broker, publisher_confirms)
+        self.channels.append(channel)
+        return channel
+
+    async def close(self) -> None:
+        for channel in self.channels:
+            await channel.close()
+
+        self.channels.clear()
+        self.is_closed = True
+
+
+class MemoryBroker:
+    def __init__(self, latency: float = 0.0):
+        # seconds added to every publish confirm and every delivery
+        self.latency = latency
+        self.counter = itertools.count(1)
+
+        self.queues: Dict[str, MemoryQueue] = {}
+        self.exchanges: Dict[str, MemoryExchange] = {"": MemoryExchange(self, "")}
+
+    def route(self, exchange_name: str, routing_key: str, message: MemoryMessage) -> None:
+        # unroutable messages are dropped, as published without the mandatory flag
+        if exchange_name == "":
+            names = {routing_key}
+        else:
+            exchange = self.exchanges.get(exchange_name)
+            names = exchange.bindings.get(routing_key, set()) if exchange else set()
+
+        for name in names:
+            queue = self.queues.get(name)
+            if queue is not None:
+                queue.enqueue(message.copy(routing_key, dict(message.headers)))
+
+    def connect(self) -> MemoryConnection:
+        return MemoryConnection(self)
+
+
+class MemoryBrokerConnection(RabbitMQConnection):
+    # RabbitMQConnection on top of MemoryBroker, selected with QUEUE_BACKEND=memory
+    def __init__(self, latency_ms: float = 0, **kwargs: Any):
+        super().__init__("memory://", **kwargs)
+        self.broker = MemoryBroker(latency_ms / 1000)
+
+    async def open_connection(self):
+        return self.broker.connect()
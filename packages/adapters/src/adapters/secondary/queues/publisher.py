@@ -0,0 +1,110 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+from aio_pika import Message
+from aio_pika.abc import AbstractRobustChannel, AbstractRobustConnection
+
+
+class ChannelPool:
+    # channels with publisher confirms, a publisher holds one channel for the whole batch it sends
+    def __init__(self, connection: AbstractRobustConnection, size: int, confirm_batch_size: int):
+        self.connection = connection
+        self.size = size
+        self.confirm_batch_size = confirm_batch_size
+
+        self.channels: List[AbstractRobustChannel] = []
+        self.idle: asyncio.Queue[AbstractRobustChannel] = asyncio.Queue()
+
+    async def open(self) -> None:
+        for _ in range(self.size):
+            channel = await self.connection.channel(publisher_confirms=True)
+            self.channels.append(channel)  # type: ignore
+            self.idle.put_nowait(channel)  # type: ignore
+
+    async def close(self) -> None:
+        for channel in self.channels:
+            if not channel.is_closed:
+                await channel.close()
+
+        self.channels.clear()
+        self.idle = asyncio.Queue()
+
+    def is_open(self) -> bool:
+        return any(not channel.is_closed for channel in self.channels)
+
+    def statistics(self) -> Dict[str, float]:
+        return {"size": len(self.channels), "idle": self.idle.qsize()}
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[AbstractRobustChannel]:
+        channel = await self.idle.get()
+        try:
+            yield channel
+        finally:
+            self.idle.put_nowait(channel)
+
+    async def publish(self, messages: List[Message], routing_key: str) -> None:
+        async with self.acquire() as channel:
+            exchange = channel.default_exchange
+
+            # every publish of a batch is on the wire before the first confirm is awaited,
+            # a nack or a returned message raises for the whole batch
+            for offset in range(0, len(messages), self.confirm_batch_size):
+                batch = messages[offset : offset + self.confirm_batch_size]
+                await asyncio.gather(*(exchange.publish(message, routing_key=routing_key) for message in batch))
+
+
+class PublisherOutbox:
+    # messages published within linger seconds of each other share one pooled publish per routing key,
+    # callers still wait until the broker confirmed their own messages
+    def __init__(self, pool: ChannelPool, linger: float):
+        self.pool = pool
+        self.linger = linger
+
+        self.pending: Dict[str, List[Tuple[Message, asyncio.Future]]] = {}
+        # the flush still collecting messages, and every flush until its publish is confirmed
+        self.flush_task: Optional[asyncio.Task] = None
+        self.flush_tasks: Set[asyncio.Task] = set()
+
+    async def publish(self, messages: List[Message], routing_key: str) -> None:
+        loop = asyncio.get_running_loop()
+        futures = []
+        for message in messages:
+            future = loop.create_future()
+            self.pending.setdefault(routing_key, []).append((message, future))
+            futures.append(future)
+
+        if self.flush_task is None:
+            self.flush_task = asyncio.create_task(self.flush_later())
+            self.flush_tasks.add(self.flush_task)
+            self.flush_task.add_done_callback(self.flush_tasks.discard)
+
+        await asyncio.gather(*futures)
+
+    async def flush_later(self) -> None:
+        await asyncio.sleep(self.linger)
+
+        # messages arriving while this flush publishes go out with the next one
+        pending, self.pending = self.pending, {}
+        self.flush_task = None
+
+        await asyncio.gather(*(self.flush(routing_key, items) for routing_key, items in pending.items()))
+
+    async def flush(self, routing_key: str, items: List[Tuple[Message, asyncio.Future]]) -> None:
+        try:
+            await self.pool.publish([message for message, _ in items], routing_key)
+        except Exception as exception:
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(exception)
+
+            return
+
+        for _, future in items:
+            if not future.done():
+                future.set_result(None)
+
+    async def close(self) -> None:
+        # the pool is closed after this, no flush may still hold one of its channels
+        while self.flush_tasks:
+            await asyncio.gather(*self.flush_tasks, return_exceptions=True)
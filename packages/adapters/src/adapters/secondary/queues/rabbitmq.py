@@ -1,52 +1,112 @@
+import time
 import asyncio
 from tabulate import tabulate
-from typing import List, Callable
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional
 from loguru import logger
-from aio_pika import connect_robust, Message
-from aio_pika.abc import AbstractRobustConnection, AbstractRobustChannel
+from aio_pika import connect_robust, Message, DeliveryMode
+from aio_pika.abc import AbstractRobustConnection
 
-from .consumers import notification_consumer, submission_consumer
-
-PARALLEL_TASKS = 10
+from core.database import Database
+from core.metrics import REGISTRY
 
-QUEUE_CONFIG = {
+from .batch_consumer import BatchConsumer
+from .flow_control import FlowController, LoopLagMonitor
+from .topology import QueueTopology
+from .message_codec import MessageCodec
+from .consumers import notification_consumer, submission_consumer
+from .publisher import ChannelPool, PublisherOutbox
+
+QUEUE_PUBLISH_DURATION = REGISTRY.histogram(
+    "rabbitmq_publish_duration_seconds",
+    "Duration of publishing a batch of messages",
+    ("routing_key",),
+)
+
+# prefetch bounds the unacked messages of a queue, concurrency is the number of batch workers,
+# a batch closes at batch_size messages or max_wait_ms after its first message,
+# prefetch adapts between min_prefetch and max_prefetch to keep a batch under target_latency_ms
+# queues are durable, a failed batch is retried max_retries times with retry_delay_ms * 2^attempt backoff
+# before its messages land in <name>.dead (see QueueTopology)
+QUEUE_CONFIG: Dict[str, Dict[str, Any]] = {
     "notifications": {
         "name": "agrismart.notifications",
         "handler": notification_consumer,
-        "auto_delete": True,
+        "max_retries": 5,
+        "retry_delay_ms": 1000,
+        "prefetch": 200,
+        "min_prefetch": 100,
+        "max_prefetch": 1000,
+        "target_latency_ms": 200,
+        "concurrency": 2,
+        "batch_size": 100,
+        "max_wait_ms": 50,
     },
     "submissions": {
         "name": "agrismart.submissions",
         "handler": submission_consumer,
-        "auto_delete": True,
+        "max_retries": 3,
+        "retry_delay_ms": 5000,
+        "prefetch": 20,
+        "min_prefetch": 5,
+        "max_prefetch": 100,
+        "target_latency_ms": 2000,
+        "concurrency": 4,
+        "batch_size": 5,
+        "max_wait_ms": 20,
     },
 }
 
 
 class RabbitMQConnection:
-    def __init__(self, uri: str):
+    def __init__(
+        self,
+        uri: str,
+        channel_pool_size: int = 4,
+        confirm_batch_size: int = 256,
+        outbox_linger_ms: int = 0,
+        message_format: str = "json",
+        compression_threshold: int = 0,
+    ):
         self.uri = uri
+        self.channel_pool_size = channel_pool_size
+        self.confirm_batch_size = confirm_batch_size
+        self.outbox_linger_ms = outbox_linger_ms
+        self.codec = MessageCodec(message_format, compression_threshold)
+
         self.connection: AbstractRobustConnection | None = None
-        self.channel: AbstractRobustChannel | None = None
+        self.pool: Optional[ChannelPool] = None
+        self.outbox: Optional[PublisherOutbox] = None
         self.consumer_tasks: List[asyncio.Task] = []
+        self.loop_monitor = LoopLagMonitor()
 
     async def _clear(self) -> None:
-        if self.channel and not self.channel.is_closed:
-            await self.channel.close()
+        if self.outbox:
+            await self.outbox.close()
+        if self.pool:
+            await self.pool.close()
         if self.connection and not self.connection.is_closed:
             await self.connection.close()
 
         self.connection = None
-        self.channel = None
+        self.pool = None
+        self.outbox = None
 
     async def disconnect(self) -> None:
         await self._clear()
         logger.info("Disconnected from RabbitMQ successfully! 👋🏻 🐰")
 
+    async def open_connection(self) -> AbstractRobustConnection:
+        return await connect_robust(self.uri)
+
     async def connect(self) -> None:
         try:
-            self.connection = await connect_robust(self.uri)
-            self.channel = await self.connection.channel(publisher_confirms=False)  # type: ignore
+            self.connection = await self.open_connection()
+            self.pool = ChannelPool(self.connection, self.channel_pool_size, self.confirm_batch_size)
+            await self.pool.open()
+
+            if self.outbox_linger_ms > 0:
+                self.outbox = PublisherOutbox(self.pool, self.outbox_linger_ms / 1000)
 
             logger.info("Connected to RabbitMQ successfully! 🐰")
         except Exception as exception:
@@ -56,75 +116,112 @@ class RabbitMQConnection:
     def status(self) -> bool:
         if not self.connection or self.connection.is_closed:
             return False
-        if not self.channel or self.channel.is_closed:
+        if not self.pool or not self.pool.is_open():
             return False
 
         return True
 
-    async def send_messages(self, messages: dict, routing_key: str) -> None:
-        if not self.status():
-            logger.error("RabbitMQ connection is not established. Cannot send messages.")
-            return
+    def statistics(self) -> Dict[str, float]:
+        return self.pool.statistics() if self.pool else {"size": 0, "idle": 0}
 
-        if not self.channel:
-            logger.error("Channel is not established. Cannot send messages.")
+    async def send_messages(self, messages: List[dict], routing_key: str) -> None:
+        if not self.status() or not self.pool:
+            logger.error("RabbitMQ connection is not established. Cannot send messages.")
             return
 
-        async with self.channel.transaction():
-            for message in messages:
-                message = Message(
-                    body=message.encode(),
-                    delivery_mode=2,  # make message persistent
+        start_time = time.perf_counter()
+        payloads = []
+        for message in messages:
+            body, content_type, content_encoding, headers = self.codec.encode(message)
+            payloads.append(
+                Message(
+                    body=body,
+                    headers=headers,
+                    content_type=content_type,
+                    content_encoding=content_encoding,
+                    delivery_mode=DeliveryMode.PERSISTENT,
                 )
+            )
 
-                await self.channel.default_exchange.publish(
-                    message,
-                    routing_key=routing_key,
-                )
+        # returns once the broker confirmed every message, a nack raises
+        if self.outbox:
+            await self.outbox.publish(payloads, routing_key)
+        else:
+            await self.pool.publish(payloads, routing_key)
+
+        QUEUE_PUBLISH_DURATION.observe(time.perf_counter() - start_time, routing_key)
 
-    async def start_consumer(self, queue_name: str, handler: Callable, auto_delete: bool) -> asyncio.Task:
+    async def start_consumer(self, consumer: BatchConsumer) -> asyncio.Task:
         async def _consume():
             if not self.connection or self.connection.is_closed:
                 return
 
             channel = await self.connection.channel()
-            await channel.set_qos(prefetch_count=PARALLEL_TASKS)
-            queue = await channel.declare_queue(queue_name, auto_delete=auto_delete)
-
-            logger.info(f"Started consuming from {queue_name} 👀")
-            await queue.consume(handler)
+            logger.info(f"Started consuming from {consumer.queue_name} 👀")
 
             try:
-                await asyncio.Future()
+                await consumer.run(channel)
             except asyncio.CancelledError:
                 await channel.close()
-                logger.info(f"Stopped consuming from {queue_name} 👋🏻")
+                logger.info(f"Stopped consuming from {consumer.queue_name} 👋🏻")
                 raise
 
         return asyncio.create_task(_consume())
 
-    async def start_all_consumers(self) -> List[asyncio.Task]:
+    @staticmethod
+    def topology(queue_config: Dict[str, Any]) -> QueueTopology:
+        return QueueTopology(queue_config["name"], queue_config["max_retries"], queue_config["retry_delay_ms"])
+
+    async def start_all_consumers(
+        self,
+        database: Database,
+        probes: Optional[List[Callable[[], bool]]] = None,
+    ) -> List[asyncio.Task]:
         consumer_tasks = []
+        self.loop_monitor.start()
 
         for queue_config in QUEUE_CONFIG.values():
             if queue_config["handler"]:
-                task = await self.start_consumer(
+                controller = FlowController(
                     queue_config["name"],
-                    queue_config["handler"],
-                    queue_config["auto_delete"],
+                    prefetch=queue_config["prefetch"],
+                    min_prefetch=queue_config["min_prefetch"],
+                    max_prefetch=queue_config["max_prefetch"],
+                    target_latency=queue_config["target_latency_ms"] / 1000,
+                    monitor=self.loop_monitor,
+                    probes=probes,
+                )
+                consumer = BatchConsumer(
+                    self.topology(queue_config),
+                    partial(queue_config["handler"], database=database),
+                    batch_size=queue_config["batch_size"],
+                    max_wait=queue_config["max_wait_ms"] / 1000,
+                    prefetch=queue_config["prefetch"],
+                    concurrency=queue_config["concurrency"],
+                    publisher=self.pool,  # type: ignore
+                    controller=controller,
                 )
 
+                task = await self.start_consumer(consumer)
                 consumer_tasks.append(task)
 
         table = []
         for queue_name, config in QUEUE_CONFIG.items():
-            row = [queue_name, config["handler"].__name__, config["auto_delete"]]
+            row = [
+                queue_name,
+                config["handler"].__name__,
+                config["max_retries"],
+                config["prefetch"],
+                config["concurrency"],
+                config["batch_size"],
+                config["max_wait_ms"],
+            ]
             table.append(row)
 
         print(
             tabulate(
                 table,
-                headers=["Queue Name", "Handler", "Auto Delete"],
+                headers=["Queue Name", "Handler", "Max Retries", "Prefetch", "Concurrency", "Batch Size", "Max Wait (ms)"],
                 tablefmt="pretty",
             )
         )
@@ -141,3 +238,4 @@ class RabbitMQConnection:
                 pass
 
         self.consumer_tasks.clear()
+        await self.loop_monitor.stop()
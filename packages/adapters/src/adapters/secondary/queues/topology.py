@@ -0,0 +1,111 @@
+from typing import List
+from aio_pika import DeliveryMode, ExchangeType, Message
+from aio_pika.abc import AbstractChannel, AbstractIncomingMessage, AbstractQueue
+
+from .publisher import ChannelPool
+
+DEAD_LETTER_EXCHANGE = "agrismart.dead"
+RETRY_COUNT_HEADER = "x-retry-count"
+
+
+class QueueTopology:
+    """
+    Durable layout of one work queue:
+    - <name>: the work queue, rejected messages are dead-lettered to DEAD_LETTER_EXCHANGE
+    - <name>.retry.<level>: one queue per retry level, its TTL (retry_delay * 2^level) expires messages
+      back into <name>, one TTL per queue keeps expiry in order without head-of-line blocking
+    - <name>.dead: bound to DEAD_LETTER_EXCHANGE, holds poison messages and exhausted retries
+    """
+
+    def __init__(self, name: str, max_retries: int, retry_delay_ms: int):
+        self.name = name
+        self.max_retries = max_retries
+        self.retry_delay_ms = retry_delay_ms
+
+    @property
+    def dead_queue_name(self) -> str:
+        return f"{self.name}.dead"
+
+    def retry_queue_name(self, level: int) -> str:
+        return f"{self.name}.retry.{level}"
+
+    def retry_delay(self, level: int) -> int:
+        return self.retry_delay_ms * 2**level
+
+    async def declare(self, channel: AbstractChannel) -> AbstractQueue:
+        dead_exchange = await channel.declare_exchange(DEAD_LETTER_EXCHANGE, ExchangeType.DIRECT, durable=True)
+        dead_queue = await channel.declare_queue(self.dead_queue_name, durable=True)
+        await dead_queue.bind(dead_exchange, routing_key=self.name)
+
+        for level in range(self.max_retries):
+            await channel.declare_queue(
+                self.retry_queue_name(level),
+                durable=True,
+                arguments={
+                    "x-message-ttl": self.retry_delay(level),
+                    "x-dead-letter-exchange": "",
+                    "x-dead-letter-routing-key": self.name,
+                },
+            )
+
+        return await channel.declare_queue(
+            self.name,
+            durable=True,
+            arguments={
+                "x-dead-letter-exchange": DEAD_LETTER_EXCHANGE,
+                "x-dead-letter-routing-key": self.name,
+            },
+        )
+
+    @staticmethod
+    def retry_count(message: AbstractIncomingMessage) -> int:
+        return int((message.headers or {}).get(RETRY_COUNT_HEADER, 0))  # type: ignore
+
+    @staticmethod
+    def copy(message: AbstractIncomingMessage, retry_count: int) -> Message:
+        headers = {key: value for key, value in (message.headers or {}).items() if key != "x-death"}
+        headers[RETRY_COUNT_HEADER] = retry_count
+
+        return Message(
+            body=message.body,
+            headers=headers,
+            content_type=message.content_type,
+            content_encoding=message.content_encoding,
+            message_id=message.message_id,
+            delivery_mode=DeliveryMode.PERSISTENT,
+        )
+
+    async def schedule_retries(self, messages: List[AbstractIncomingMessage], pool: ChannelPool) -> None:
+        # the copy is confirmed before the caller acks the original, a crash in between only duplicates it
+        levels: dict = {}
+        for message in messages:
+            level = self.retry_count(message)
+            levels.setdefault(level, []).append(self.copy(message, level + 1))
+
+        for level, copies in levels.items():
+            await pool.publish(copies, self.retry_queue_name(level))
+
+    async def replay(self, channel: AbstractChannel, pool: ChannelPool, limit: int, batch_size: int = 100) -> int:
+        dead_queue = await channel.declare_queue(self.dead_queue_name, durable=True)
+
+        replayed = 0
+        while replayed < limit:
+            batch: List[AbstractIncomingMessage] = []
+            while len(batch) < min(batch_size, limit - replayed):
+                message = await dead_queue.get(no_ack=False, fail=False)
+                if message is None:
+                    break
+
+                batch.append(message)
+
+            if not batch:
+                break
+
+            # replayed messages start over with a fresh retry budget
+            await pool.publish([self.copy(message, 0) for message in batch], self.name)
+            for message in batch:
+                await message.ack()
+
+            replayed += len(batch)
+
+        return replayed
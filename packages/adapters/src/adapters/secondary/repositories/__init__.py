@@ -2,8 +2,9 @@ from .base_repository import BaseRepository
 from .account_repository import AccountRepository
 from .post_repository import PostRepository
 from .role_repository import RoleRepository
-from .session_repository import SessionRepository
+from .session_repository import SessionRepository, SessionStorageMode
 from .provider_repository import ProviderRepository
+from .indexes import sync_indexes, find_collection_scans, assert_no_collection_scans
 
 __all__ = [
     "BaseRepository",
@@ -11,5 +12,9 @@ __all__ = [
     "PostRepository",
     "RoleRepository",
     "SessionRepository",
+    "SessionStorageMode",
     "ProviderRepository",
+    "sync_indexes",
+    "find_collection_scans",
+    "assert_no_collection_scans",
 ]
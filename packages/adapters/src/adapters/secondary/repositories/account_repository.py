@@ -1,11 +1,24 @@
+from pymongo import ASCENDING, IndexModel
 from pymongo.asynchronous.collection import AsyncCollection
 
+from core.database import CollectionName
+
 from domain.entities import AccountEntity
 from domain.repositories import IAccountRepository
 
-from .base_repository import BaseRepository
+from .base_repository import BaseRepository, PAGINATION_INDEXES, PAGINATION_QUERY_PLANS
 
 
 class AccountRepository(BaseRepository[AccountEntity], IAccountRepository):
+    COLLECTION_NAME = CollectionName.ACCOUNTS
+    INDEXES = [
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+        *PAGINATION_INDEXES,
+    ]
+    QUERY_PLANS = [
+        ({"email": "probe@agrismart.dev"}, None),
+        *PAGINATION_QUERY_PLANS,
+    ]
+
     def __init__(self, collection: AsyncCollection):
         super().__init__(collection, AccountEntity)
@@ -1,48 +1,96 @@
 import asyncio
-from bson import ObjectId
-from typing import TypeVar, Type, Optional, List, Tuple
+import bson
+from bson import ObjectId, json_util
+from bson.raw_bson import RawBSONDocument
+from typing import TypeVar, Type, Optional, List, Tuple, Union, Dict, AsyncIterator, ClassVar
 from pymongo.asynchronous.collection import AsyncCollection
-from pymongo import ASCENDING, DESCENDING
+from pymongo import ASCENDING, DESCENDING, IndexModel, InsertOne, ReplaceOne, UpdateOne
+from pymongo.errors import BulkWriteError, PyMongoError
 from pymongo.asynchronous.collection import AsyncCollection
 
-from core.base import Meta
+from core.base import Meta, Cursor, BulkWriteReport, BulkWriteFailure
+from core.helpers import TTLCache, BatchHelper, TimeHelper
+from core.database import CollectionName
 
-from domain.entities import BaseEntity
+from domain.entities import BaseEntity, BaseReadModel
 from domain.repositories import IBaseRepository
 
+from .codec import ModelCodec
+
 T = TypeVar("T", bound=BaseEntity)
+R = TypeVar("R", bound=BaseReadModel)
+
+# repositories are built per request, so filtered counts are cached per process for a short while
+COUNT_CACHE: TTLCache[Tuple[str, str], int] = TTLCache(maxsize=1024, ttl=30)
+
+# paginated() sorts on (order_by, _id), one compound index per allowed order_by serves both directions
+PAGINATION_INDEXES = [
+    IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="created_at_id"),
+    IndexModel([("updated_at", DESCENDING), ("_id", DESCENDING)], name="updated_at_id"),
+]
+PAGINATION_QUERY_PLANS: List[Tuple[dict, Optional[list]]] = [
+    ({}, [("created_at", DESCENDING), ("_id", DESCENDING)]),
+    ({}, [("updated_at", ASCENDING), ("_id", ASCENDING)]),
+]
 
 
 class BaseRepository(IBaseRepository[T]):
+    # bulk writes are split by document count and encoded size, well below the 48MB wire message limit
+    BULK_MAX_DOCUMENTS = 1000
+    BULK_MAX_BYTES = 8 * 1024 * 1024
+
+    COLLECTION_NAME: ClassVar[Optional[CollectionName]] = None
+    # declarative index spec, reconciled at startup by sync_indexes
+    INDEXES: ClassVar[List[IndexModel]] = []
+    # representative hot queries (filter, sort), explain() must never plan a COLLSCAN for them
+    QUERY_PLANS: ClassVar[List[Tuple[dict, Optional[list]]]] = []
+
     def __init__(self, collection: AsyncCollection, model: Type[T]):
         self.collection = collection
         self.model = model
+        self.codec = ModelCodec.for_model(model)
+
+    def convert_doc_to_model(self, doc: dict, model: Type[Union[T, R]]) -> Union[T, R]:
+        return ModelCodec.for_model(model).decode(doc)
+
+    def convert_docs_to_models(self, docs: List[dict], model: Type[Union[T, R]]) -> List[Union[T, R]]:
+        return ModelCodec.for_model(model).decode_many(docs)
 
     def convert_doc_to_entity(self, doc: dict) -> T:
-        # NOTE: doc["id"] is field will be converted for encode and decode json field
-        doc["id"] = str(doc["_id"])
+        return self.convert_doc_to_model(doc, self.model)  # type: ignore
+
+    def convert_docs_to_entities(self, docs: List[dict]) -> List[T]:
+        return self.convert_docs_to_models(docs, self.model)  # type: ignore
 
-        # convert all fields contain "_id" from ObjectId to string
-        for key, value in doc.items():
-            if "_id" in key and key != "_id":
-                doc[key] = str(value) if isinstance(value, ObjectId) else value
+    def convert_entity_to_doc(self, entity: T) -> dict:
+        return self.codec.encode(entity)
 
-        return self.model(**doc)
+    def scope_query(self, query: Optional[dict]) -> dict:
+        # every read goes through here, repositories narrow it to the rows that are visible (e.g. not expired)
+        return query or {}
 
     async def find_one(self, query: dict) -> Optional[T]:
-        entity_dict = await self.collection.find_one(query)
+        entity_dict = await self.collection.find_one(self.scope_query(query))
         if entity_dict:
             return self.convert_doc_to_entity(entity_dict)
 
         return None
 
-    async def update_one(self, entity: T) -> T:
-        entity_dict = entity.model_dump(exclude_unset=True)
+    async def find_one_projected(self, query: dict, model: Type[R]) -> Optional[R]:
+        doc = await self.collection.find_one(self.scope_query(query), projection=model.projection())
+        if doc:
+            return self.convert_doc_to_model(doc, model)  # type: ignore
+
+        return None
 
-        # convert all fields contain "_id" string to ObjectId
-        for key, value in entity_dict.items():
-            if "_id" in key and key != "_id":
-                entity_dict[key] = ObjectId(value)
+    @staticmethod
+    def touch(entity: T) -> None:
+        # updated_at is the sync watermark, every write path has to move it forward
+        entity.updated_at = TimeHelper.vn_timezone()
+
+    async def update_one(self, entity: T) -> T:
+        self.touch(entity)
+        entity_dict = self.convert_entity_to_doc(entity)
 
         await self.collection.update_one({"_id": ObjectId(entity.id)}, {"$set": entity_dict})
         return entity
@@ -56,25 +104,172 @@ class BaseRepository(IBaseRepository[T]):
         return result.deleted_count
 
     async def find(self, query=None) -> list[T]:
-        if query is None:
-            query = {}
+        cursor = self.collection.find(self.scope_query(query))
+        docs = await cursor.to_list(length=None)
+        return self.convert_docs_to_entities(docs)
 
-        cursor = self.collection.find(query)
+    async def find_projected(self, query: Optional[dict], model: Type[R]) -> List[R]:
+        cursor = self.collection.find(self.scope_query(query), projection=model.projection())
         docs = await cursor.to_list(length=None)
-        return [self.convert_doc_to_entity(doc) for doc in docs]
+        return self.convert_docs_to_models(docs, model)  # type: ignore
 
-    async def create(self, entity: T) -> T:
-        entity_dict = entity.model_dump(exclude_unset=True)
+    async def iter_batches(
+        self,
+        query: Optional[dict],
+        model: Type[Union[T, R]],
+        batch_size: int,
+        projection: Optional[dict] = None,
+    ) -> AsyncIterator[List[Union[T, R]]]:
+        # at most one batch of raw documents and its hydrated entities are held in memory at a time
+        cursor = self.collection.find(self.scope_query(query), projection=projection, batch_size=batch_size)
+        try:
+            while docs := await cursor.to_list(length=batch_size):
+                yield self.convert_docs_to_models(docs, model)
+        finally:
+            await cursor.close()
+
+    async def iter_find(self, query: Optional[dict] = None, batch_size: int = 500) -> AsyncIterator[T]:
+        async for entities in self.iter_batches(query, self.model, batch_size):
+            for entity in entities:
+                yield entity  # type: ignore
 
-        # convert all fields contain "_id" string to ObjectId
-        for key, value in entity_dict.items():
-            if "_id" in key and key != "_id":
-                entity_dict[key] = ObjectId(value)
+    async def iter_find_projected(
+        self,
+        query: Optional[dict],
+        model: Type[R],
+        batch_size: int = 500,
+    ) -> AsyncIterator[R]:
+        async for entities in self.iter_batches(query, model, batch_size, model.projection()):
+            for entity in entities:
+                yield entity  # type: ignore
+
+    async def create(self, entity: T) -> T:
+        entity_dict = self.convert_entity_to_doc(entity)
 
         result = await self.collection.insert_one(entity_dict)
         entity.id = str(result.inserted_id)
         return entity
 
+    def encode_raw(self, entity: T, _id: Optional[ObjectId] = None) -> RawBSONDocument:
+        doc = self.convert_entity_to_doc(entity)
+        doc.pop("id", None)
+        if _id is not None:
+            doc["_id"] = _id
+
+        # encoded once: the size drives chunking and pymongo sends the raw bytes as they are
+        return RawBSONDocument(bson.encode(doc))
+
+    async def bulk_write_chunks(self, ids: List[Optional[str]], requests: list, sizes: List[int]) -> BulkWriteReport:
+        report = BulkWriteReport()
+        indexes = list(range(len(requests)))
+
+        for _, chunk in BatchHelper.chunk(indexes, sizes, self.BULK_MAX_DOCUMENTS, self.BULK_MAX_BYTES):
+            errors: Dict[int, dict] = {}
+            try:
+                result = await self.collection.bulk_write([requests[index] for index in chunk], ordered=False)
+                counts = result.bulk_api_result
+            except BulkWriteError as error:
+                # unordered: everything except the reported writes was applied
+                counts = error.details
+                errors = {chunk[item["index"]]: item for item in error.details.get("writeErrors", [])}
+            except PyMongoError as error:
+                counts = {}
+                errors = {index: {"errmsg": str(error)} for index in chunk}
+
+            report.inserted_count += counts.get("nInserted", 0)
+            report.matched_count += counts.get("nMatched", 0)
+            report.modified_count += counts.get("nModified", 0)
+            report.upserted_count += counts.get("nUpserted", 0)
+
+            for index in chunk:
+                error = errors.get(index)
+                if error is None:
+                    report.succeeded.append(ids[index])  # type: ignore
+                    continue
+
+                report.failed.append(
+                    BulkWriteFailure(
+                        index=index,
+                        id=ids[index],
+                        code=error.get("code"),
+                        message=error.get("errmsg", "Unknown error"),
+                    )
+                )
+
+        return report
+
+    async def create_many(self, entities: List[T]) -> BulkWriteReport:
+        # ids are assigned up front so every item can be reported, even when its chunk fails
+        object_ids = [ObjectId(entity.id) if entity.id else ObjectId() for entity in entities]
+        docs = [self.encode_raw(entity, _id) for entity, _id in zip(entities, object_ids)]
+        ids = [str(_id) for _id in object_ids]
+
+        report = await self.bulk_write_chunks(ids, [InsertOne(doc) for doc in docs], [len(doc.raw) for doc in docs])
+
+        failed = {failure.index for failure in report.failed}
+        for index, entity in enumerate(entities):
+            if index not in failed:
+                entity.id = ids[index]
+
+        return report
+
+    async def upsert_many(self, entities: List[T]) -> BulkWriteReport:
+        object_ids = [ObjectId(entity.id) if entity.id else ObjectId() for entity in entities]
+        docs = [self.encode_raw(entity, _id) for entity, _id in zip(entities, object_ids)]
+        requests = [ReplaceOne({"_id": _id}, doc, upsert=True) for _id, doc in zip(object_ids, docs)]
+
+        for entity, _id in zip(entities, object_ids):
+            entity.id = str(_id)
+
+        return await self.bulk_write_chunks(
+            [str(_id) for _id in object_ids],
+            requests,
+            [len(doc.raw) for doc in docs],
+        )
+
+    async def bulk_update(self, entities: List[T]) -> BulkWriteReport:
+        ids: List[Optional[str]] = []
+        requests = []
+        sizes = []
+
+        missing = []
+        for index, entity in enumerate(entities):
+            if not entity.id:
+                missing.append(BulkWriteFailure(index=index, message="Entity has no id to update"))
+                continue
+
+            self.touch(entity)
+            doc = self.encode_raw(entity)
+            ids.append(entity.id)
+            requests.append(UpdateOne({"_id": ObjectId(entity.id)}, {"$set": doc}))
+            sizes.append(len(doc.raw))
+
+        report = await self.bulk_write_chunks(ids, requests, sizes)
+        if missing:
+            # positions reported by bulk_write_chunks are relative to the entities that had an id
+            positions = [index for index, entity in enumerate(entities) if entity.id]
+            for failure in report.failed:
+                failure.index = positions[failure.index]
+
+            report.failed.extend(missing)
+
+        return report
+
+    async def count(self, query: dict) -> int:
+        scoped = self.scope_query(query)
+        if not scoped:
+            # metadata based, does not scan the collection
+            return await self.collection.estimated_document_count()
+
+        # keyed by the caller's query, a scope may hold time-varying predicates (now()) that would never repeat
+        key = (self.collection.name, json_util.dumps(query or {}, sort_keys=True))
+        total = COUNT_CACHE.get(key)
+        if total is None:
+            total = await self.collection.count_documents(scoped)
+            COUNT_CACHE.set(key, total)
+
+        return total
+
     async def paginated(
         self,
         query=None,
@@ -82,29 +277,79 @@ class BaseRepository(IBaseRepository[T]):
         page_size: int = 20,
         order: str = "asc",
         order_by: str = "created_at",
+        cursor: Optional[str] = None,
+        include_total: bool = True,
     ) -> Tuple[List[T], Meta]:
-        if query is None:
-            query = {}
+        return await self.paginate(self.model, query, page, page_size, order, order_by, cursor, include_total)
+
+    async def paginated_projected(
+        self,
+        model: Type[R],
+        query=None,
+        page: int = 1,
+        page_size: int = 20,
+        order: str = "asc",
+        order_by: str = "created_at",
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+    ) -> Tuple[List[R], Meta]:
+        return await self.paginate(model, query, page, page_size, order, order_by, cursor, include_total)
+
+    async def paginate(
+        self,
+        model: Type,
+        query: Optional[dict],
+        page: int,
+        page_size: int,
+        order: str,
+        order_by: str,
+        cursor: Optional[str],
+        include_total: bool,
+    ) -> Tuple[list, Meta]:
+        scoped = self.scope_query(query)
 
-        skip = (page - 1) * page_size
-        limit = page_size
+        # read models fetch their own fields, plus order_by which the next cursor is built from
+        projection = {**model.projection(), order_by: 1} if issubclass(model, BaseReadModel) else None
+        direction = ASCENDING if order == "asc" else DESCENDING
+        # _id breaks ties between equal order_by values so pages never overlap or skip documents
+        sort = [(order_by, direction), ("_id", direction)]
 
-        cursor = (
-            self.collection.find(query)
-            .skip(skip)
-            .limit(limit)
-            .sort(order_by, ASCENDING if order == "asc" else DESCENDING)
-        )
+        if cursor:
+            # keyset mode: continue strictly after the last (order_by, _id) seen, served by the index
+            value, last_id = Cursor.decode(cursor, order_by, order)
+            operator = "$gt" if order == "asc" else "$lt"
+            after = {
+                "$or": [
+                    {order_by: {operator: value}},
+                    {order_by: value, "_id": {operator: last_id}},
+                ]
+            }
+
+            find = self.collection.find({"$and": [scoped, after]} if scoped else after, projection=projection)
+        else:
+            find = self.collection.find(scoped, projection=projection).skip((page - 1) * page_size)
+
+        find = find.sort(sort).limit(page_size)
+        if include_total:
+            docs, total = await asyncio.gather(find.to_list(length=None), self.count(query or {}))
+        else:
+            docs, total = await find.to_list(length=None), None
+
+        next_cursor = None
+        if page_size and len(docs) == page_size:
+            last = docs[-1]
+            next_cursor = Cursor.encode(order_by, order, last.get(order_by), last["_id"])
 
-        tasks = [cursor.to_list(length=None), self.collection.count_documents(query)]
-        docs, total = await asyncio.gather(*tasks)
+        total_page = None
+        if total is not None and page_size:
+            total_page = (total // page_size) + (1 if total % page_size > 0 else 0)
 
-        total_page = (total // page_size) + (1 if total % page_size > 0 else 0)
         meta = Meta(
             page=page,
             page_size=page_size,
             total_record=total,
             total_page=total_page,
+            next_cursor=next_cursor,
         )
 
-        return [self.convert_doc_to_entity(doc) for doc in docs], meta
+        return self.convert_docs_to_models(docs, model), meta
@@ -0,0 +1,55 @@
+from bson import ObjectId
+from pydantic import BaseModel, TypeAdapter
+from typing import Any, ClassVar, Dict, Generic, List, Tuple, Type, TypeVar
+
+M = TypeVar("M", bound=BaseModel)
+
+
+class ModelCodec(Generic[M]):
+    # Everything that depends only on the model is computed once and shared by every repository instance
+    codecs: ClassVar[Dict[type, "ModelCodec"]] = {}
+
+    def __init__(self, model: Type[M]):
+        self.model = model
+
+        # by convention every "<name>_id" field holds an ObjectId reference in MongoDB and a string in the entity
+        self.reference_fields: Tuple[str, ...] = tuple(name for name in model.model_fields if "_id" in name)
+        self.adapter = TypeAdapter(List[model])  # type: ignore
+
+    @classmethod
+    def for_model(cls, model: Type[M]) -> "ModelCodec[M]":
+        codec = cls.codecs.get(model)
+        if codec is None:
+            codec = cls(model)
+            cls.codecs[model] = codec
+
+        return codec
+
+    def prepare(self, doc: Dict[str, Any]) -> Dict[str, Any]:
+        # NOTE: doc["id"] is field will be converted for encode and decode json field
+        doc["id"] = str(doc.pop("_id"))
+
+        for name in self.reference_fields:
+            value = doc.get(name)
+            if isinstance(value, ObjectId):
+                doc[name] = str(value)
+
+        return doc
+
+    def decode(self, doc: Dict[str, Any]) -> M:
+        return self.model.model_validate(self.prepare(doc))
+
+    def decode_many(self, docs: List[Dict[str, Any]]) -> List[M]:
+        docs = [self.prepare(doc) for doc in docs]
+        # one validator call for the whole batch instead of one per document
+        return self.adapter.validate_python(docs)
+
+    def encode(self, entity: M) -> Dict[str, Any]:
+        doc = entity.model_dump(exclude_unset=True)
+
+        for name in self.reference_fields:
+            value = doc.get(name)
+            if isinstance(value, str):
+                doc[name] = ObjectId(value)
+
+        return doc
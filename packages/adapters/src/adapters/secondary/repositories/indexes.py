@@ -0,0 +1,106 @@
+from typing import Any, List, Type
+from loguru import logger
+from pymongo import IndexModel
+from pymongo.errors import OperationFailure
+
+from core.database import Database
+
+from .base_repository import BaseRepository
+from .account_repository import AccountRepository
+from .post_repository import PostRepository
+from .role_repository import RoleRepository
+from .session_repository import SessionRepository
+from .provider_repository import ProviderRepository
+
+INDEXED_REPOSITORIES: List[Type[BaseRepository]] = [
+    AccountRepository,
+    PostRepository,
+    RoleRepository,
+    SessionRepository,
+    ProviderRepository,
+]
+
+# options that make two indexes with the same name different, anything else is informational
+INDEX_OPTIONS = ("unique", "sparse", "expireAfterSeconds", "partialFilterExpression")
+
+
+def has_same_keys(declared: IndexModel, existing: dict) -> bool:
+    return list(declared.document["key"].items()) == [tuple(key) for key in existing["key"]]
+
+
+def is_same_index(declared: IndexModel, existing: dict) -> bool:
+    document = declared.document
+    if not has_same_keys(declared, existing):
+        return False
+
+    return all(document.get(option) == existing.get(option) for option in INDEX_OPTIONS)
+
+
+async def sync_indexes(database: Database) -> None:
+    for repository in INDEXED_REPOSITORIES:
+        collection = database.get_collection(repository.COLLECTION_NAME)  # type: ignore
+        existing = await collection.index_information()
+        declared = {index.document["name"] for index in repository.INDEXES} | {"_id_"}
+
+        for index in repository.INDEXES:
+            name = index.document["name"]
+            current = existing.get(name)
+            if current is not None and is_same_index(index, current):
+                continue
+
+            try:
+                if current is not None:
+                    # changed spec under the same name, MongoDB cannot alter an index in place
+                    await collection.drop_index(name)
+
+                for other in existing.keys() - declared:
+                    # a superseded index on the same keys would make the new one conflict
+                    if has_same_keys(index, existing[other]):
+                        await collection.drop_index(other)
+                        existing.pop(other)
+                        logger.info(f"Dropped superseded index {collection.name}.{other}")
+
+                await collection.create_indexes([index])
+                logger.info(f"Created index {collection.name}.{name} 🗂️")
+            except OperationFailure as exception:
+                # e.g. duplicates blocking a unique index, the app keeps running and the log says why
+                logger.error(f"Failed to create index {collection.name}.{name}: {exception}")
+
+        existing = await collection.index_information()
+        for name in existing.keys() - declared:
+            logger.warning(f"Index {collection.name}.{name} is not declared by {repository.__name__}")
+
+
+def has_collection_scan(plan: Any) -> bool:
+    # winning plans nest their stages (inputStage, inputStages, queryPlan, ...) depending on the engine
+    if isinstance(plan, dict):
+        if plan.get("stage") == "COLLSCAN":
+            return True
+
+        return any(has_collection_scan(value) for value in plan.values())
+
+    if isinstance(plan, list):
+        return any(has_collection_scan(value) for value in plan)
+
+    return False
+
+
+async def find_collection_scans(database: Database) -> List[str]:
+    offenders = []
+    for repository in INDEXED_REPOSITORIES:
+        collection = database.get_collection(repository.COLLECTION_NAME)  # type: ignore
+        for query, sort in repository.QUERY_PLANS:
+            cursor = collection.find(query).limit(1)
+            if sort:
+                cursor = cursor.sort(sort)
+
+            explanation = await cursor.explain()
+            if has_collection_scan(explanation["queryPlanner"]["winningPlan"]):
+                offenders.append(f"{collection.name}: filter={query} sort={sort}")
+
+    return offenders
+
+
+async def assert_no_collection_scans(database: Database) -> None:
+    offenders = await find_collection_scans(database)
+    assert not offenders, "Queries planned as COLLSCAN:\n" + "\n".join(offenders)
@@ -1,11 +1,17 @@
 from pymongo.asynchronous.collection import AsyncCollection
 
+from core.database import CollectionName
+
 from domain.entities import PostEntity
 from domain.repositories import IPostRepository
 
-from .base_repository import BaseRepository
+from .base_repository import BaseRepository, PAGINATION_INDEXES, PAGINATION_QUERY_PLANS
 
 
 class PostRepository(BaseRepository[PostEntity], IPostRepository):
+    COLLECTION_NAME = CollectionName.POSTS
+    INDEXES = [*PAGINATION_INDEXES]
+    QUERY_PLANS = [*PAGINATION_QUERY_PLANS]
+
     def __init__(self, collection: AsyncCollection):
         super().__init__(collection, PostEntity)
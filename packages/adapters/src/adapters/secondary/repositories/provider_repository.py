@@ -1,10 +1,23 @@
+from bson import ObjectId
+from pymongo import ASCENDING, IndexModel
 from pymongo.asynchronous.collection import AsyncCollection
 
+from core.database import CollectionName
+
 from domain.entities import ProviderEntity
 from domain.repositories import IProviderRepository
 from .base_repository import BaseRepository
 
 
 class ProviderRepository(BaseRepository[ProviderEntity], IProviderRepository):
+    COLLECTION_NAME = CollectionName.PROVIDERS
+    INDEXES = [
+        # one provider of each kind per account, also serves lookups by account_id alone
+        IndexModel([("account_id", ASCENDING), ("provider", ASCENDING)], name="account_id_provider_unique", unique=True),
+    ]
+    QUERY_PLANS = [
+        ({"account_id": ObjectId(), "provider": "google"}, None),
+    ]
+
     def __init__(self, collection: AsyncCollection):
         super().__init__(collection, ProviderEntity)
@@ -1,10 +1,25 @@
+from bson import ObjectId
+from pymongo import ASCENDING, IndexModel
 from pymongo.asynchronous.collection import AsyncCollection
 
+from core.database import CollectionName
+
 from domain.entities import RoleEntity
 from domain.repositories import IRoleRepository
-from .base_repository import BaseRepository
+from .base_repository import BaseRepository, PAGINATION_INDEXES, PAGINATION_QUERY_PLANS
 
 
 class RoleRepository(BaseRepository[RoleEntity], IRoleRepository):
+    COLLECTION_NAME = CollectionName.ROLES
+    INDEXES = [
+        # RoleService looks a role up by account and assumes there is at most one
+        IndexModel([("account_id", ASCENDING)], name="account_id_unique", unique=True),
+        *PAGINATION_INDEXES,
+    ]
+    QUERY_PLANS = [
+        ({"account_id": ObjectId()}, None),
+        *PAGINATION_QUERY_PLANS,
+    ]
+
     def __init__(self, collection: AsyncCollection):
         super().__init__(collection, RoleEntity)
@@ -1,10 +1,83 @@
+import time
+from datetime import datetime, timezone
+from typing import List, Optional, Type
+from bson import ObjectId
+from pymongo import ASCENDING, IndexModel
 from pymongo.asynchronous.collection import AsyncCollection
 
+from core.database import CollectionName
+
 from domain.entities import SessionEntity
 from domain.repositories import ISessionRepository
 from .base_repository import BaseRepository
 
 
+class SessionStorageMode:
+    # expired_at as a BSON date, MongoDB's TTL monitor removes expired sessions
+    TTL = "ttl"
+    # expired_at as epoch seconds, CleanSessionBackground sweeps expired sessions
+    SWEEP = "sweep"
+
+
 class SessionRepository(BaseRepository[SessionEntity], ISessionRepository):
-    def __init__(self, collection: AsyncCollection):
+    COLLECTION_NAME = CollectionName.SESSIONS
+    INDEXES = [
+        IndexModel([("access_token_jti", ASCENDING)], name="access_token_jti_unique", unique=True),
+        IndexModel([("account_id", ASCENDING)], name="account_id"),
+        # the TTL monitor only acts on date values, in sweep mode this is a plain range index
+        IndexModel([("expired_at", ASCENDING)], name="expired_at_ttl", expireAfterSeconds=0),
+    ]
+    QUERY_PLANS = [
+        ({"access_token_jti": "probe"}, None),
+        ({"account_id": ObjectId()}, None),
+        ({"expired_at": {"$lt": 0}}, None),
+    ]
+
+    def __init__(self, collection: AsyncCollection, storage_mode: str = SessionStorageMode.TTL):
         super().__init__(collection, SessionEntity)
+        self.storage_mode = storage_mode
+
+    def now(self):
+        if self.storage_mode == SessionStorageMode.TTL:
+            return datetime.now(timezone.utc)
+
+        return time.time()
+
+    def scope_query(self, query: Optional[dict]) -> dict:
+        # the TTL monitor runs once a minute, an expired session must not be readable in between
+        active = {"expired_at": {"$gt": self.now()}}
+        return {"$and": [query, active]} if query else active
+
+    def convert_entity_to_doc(self, entity: SessionEntity) -> dict:
+        doc = super().convert_entity_to_doc(entity)
+        if self.storage_mode == SessionStorageMode.TTL and isinstance(doc.get("expired_at"), int):
+            doc["expired_at"] = datetime.fromtimestamp(doc["expired_at"], tz=timezone.utc)
+
+        return doc
+
+    @staticmethod
+    def normalize_doc(doc: dict) -> dict:
+        # entities keep epoch seconds whatever the storage mode is
+        expired_at = doc.get("expired_at")
+        if isinstance(expired_at, datetime):
+            doc["expired_at"] = int(expired_at.replace(tzinfo=timezone.utc).timestamp())
+
+        return doc
+
+    def convert_doc_to_model(self, doc: dict, model: Type):
+        return super().convert_doc_to_model(self.normalize_doc(doc), model)
+
+    def convert_docs_to_models(self, docs: List[dict], model: Type) -> list:
+        return super().convert_docs_to_models([self.normalize_doc(doc) for doc in docs], model)
+
+    async def migrate_storage(self) -> int:
+        # converts rows written under the other mode, so one comparison type is enough on reads
+        if self.storage_mode == SessionStorageMode.TTL:
+            query = {"expired_at": {"$type": "number"}}
+            pipeline = [{"$set": {"expired_at": {"$toDate": {"$multiply": ["$expired_at", 1000]}}}}]
+        else:
+            query = {"expired_at": {"$type": "date"}}
+            pipeline = [{"$set": {"expired_at": {"$toLong": {"$divide": [{"$toLong": "$expired_at"}, 1000]}}}}]
+
+        result = await self.collection.update_many(query, pipeline)
+        return result.modified_count
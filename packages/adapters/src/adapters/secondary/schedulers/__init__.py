@@ -1,3 +1,3 @@
-from .sync_scheduler import SyncScheduler
+from .sync_scheduler import SyncScheduler, SyncMode
 
-__all__ = ["SyncScheduler"]
+__all__ = ["SyncScheduler", "SyncMode"]
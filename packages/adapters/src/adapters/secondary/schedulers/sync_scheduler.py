@@ -1,58 +1,551 @@
+import time
 import asyncio
-from typing import Dict
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Set, Tuple
 from loguru import logger
+from bson import ObjectId
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
+from pymongo import ASCENDING, DeleteOne, InsertOne, ReplaceOne, ReturnDocument
+from pymongo.errors import OperationFailure
+from pymongo.asynchronous.change_stream import AsyncChangeStream
 
+from core.base import BulkWriteFailure
 from core.configuration import Configuration
-from core.database import Database, CollectionName
+from core.database import DatabaseRegistry, CollectionName
+
+from domain.entities import BaseEntity
+from ..repositories import BaseRepository
+
+
+class SyncMode:
+    # every local document is compared with its remote copy on each run
+    FULL = "full"
+    # only documents changed since the persisted updated_at watermark (minus a safety lag) are sent
+    INCREMENTAL = "incremental"
+    # changes are tailed from a change stream (replica sets only), falls back to INCREMENTAL otherwise
+    STREAM = "stream"
+    # bucketed content hashes of both sides are compared, only differing buckets are drilled into
+    CHECKSUM = "checksum"
+
+
+# server error codes meaning the deployment has no change streams (standalone server)
+CHANGE_STREAM_UNSUPPORTED = {40573}
+# the stored resume token is no longer in the oplog
+CHANGE_STREAM_HISTORY_LOST = {260, 280, 286}
+# write errors that fail again on every attempt: duplicate key, document validation, document too large
+PERMANENT_WRITE_ERRORS = {11000, 121, 10334}
+# delay before reopening a stream after a failed batch, doubled per consecutive failure up to the maximum
+STREAM_REOPEN_DELAY = 1.0
+STREAM_MAX_REOPEN_DELAY = 300.0
+# nominal size of a DeleteOne request when chunking
+DELETE_REQUEST_SIZE = 64
+# $toHashedIndexKey needs MongoDB 7.0, older servers answer with InvalidPipelineOperator
+CHECKSUM_UNSUPPORTED = {168}
+# each drill level extends the ObjectId hex prefix by one byte, 256 buckets at most per level
+CHECKSUM_PREFIX_STEP = 2
+OBJECT_ID_HEX_LENGTH = 24
+
+# stable 64-bit hash of the whole stored document, computed by the server so only hashes travel
+DOCUMENT_HASH = {"$toHashedIndexKey": "$$ROOT"}
+# buckets are ObjectId hex prefixes, documents with any other _id type are compared one by one
+OBJECT_IDS = {"_id": {"$type": "objectId"}}
+OTHER_IDS = {"_id": {"$not": {"$type": "objectId"}}}
 
 
 class SyncScheduler:
-    def __init__(self, config: Configuration):
+    SYNC_COLLECTIONS = [
+        CollectionName.ACCOUNTS,
+        CollectionName.POSTS,
+        CollectionName.ROLES,
+    ]
+    RESUME_TOKEN_ID = "change_stream"
+
+    def __init__(self, config: Configuration, databases: DatabaseRegistry):
         self.config = config
-        self.local_db = Database(config, is_local=True)
-        self.remote_db = Database(config, is_local=False)
-        self.semaphore = asyncio.Semaphore(50)
+        self.local_db = databases.get(is_local=True)
+        self.remote_db = databases.get(is_local=False)
+        # global budget of in-flight remote batches, shared by every collection synced concurrently
+        self.semaphore = asyncio.Semaphore(config.SYNC_MAX_CONCURRENCY)
+
+        self.mode = config.SYNC_MODE
+        self.batch_size = config.SYNC_BATCH_SIZE
+        self.watermark_lag = timedelta(seconds=config.SYNC_WATERMARK_LAG_SECONDS)
+        self.stream_max_wait = config.SYNC_STREAM_MAX_WAIT_MS / 1000
+        self.checksum_leaf_size = config.SYNC_CHECKSUM_LEAF_SIZE
+        self.checksum_delete_extra = config.SYNC_CHECKSUM_DELETE_EXTRA
+        self.states = self.local_db.get_collection(CollectionName.SYNC_STATES)
+        self.max_attempts = config.SYNC_MAX_ATTEMPTS
+        self.failures = self.local_db.get_collection(CollectionName.SYNC_FAILURES)
+        # collections with failures still being retried, loaded on first use
+        self.retried_collections: Optional[Set[str]] = None
+        # batches in a row the change stream could not apply, drives the reopen backoff
+        self.stream_failures = 0
 
     async def sync_collection(self, collection_name: CollectionName) -> Dict[str, int]:
-        logger.info(f"Starting sync for collection: {collection_name.value}")
+        if self.mode == SyncMode.CHECKSUM:
+            return await self.sync_checksum(collection_name)
+
+        # STREAM uses the watermark scan to catch up and whenever the change stream is unavailable
+        if self.mode in (SyncMode.INCREMENTAL, SyncMode.STREAM):
+            return await self.sync_changes(collection_name)
+
+        return await self.sync_collection_full(collection_name)
+
+    async def load_watermark(self, collection_name: CollectionName) -> Optional[dict]:
+        return await self.states.find_one({"_id": collection_name.value})
+
+    async def save_watermark(self, collection_name: CollectionName, doc: RawBSONDocument) -> None:
+        updated_at = doc.get("updated_at")
+        if updated_at is None:
+            return
+
+        await self.states.update_one(
+            {"_id": collection_name.value},
+            {"$set": {"updated_at": updated_at, "last_id": doc["_id"], "synced_at": datetime.now(timezone.utc)}},
+            upsert=True,
+        )
+
+    def changed_since(self, watermark: Optional[dict]) -> dict:
+        if watermark is None:
+            return {}
+
+        # updated_at is stamped by the application clock before the write commits, so a document can become
+        # visible after a newer one was already synced (a slower writer, clock skew between workers).
+        # Every run re-scans SYNC_WATERMARK_LAG_SECONDS before the watermark, upserts are idempotent and
+        # unchanged documents only count as skipped. A change is only missed when its commit lands more than
+        # the lag after its updated_at stamp, or when worker clocks drift apart by more than the lag.
+        return {"updated_at": {"$gte": watermark["updated_at"] - self.watermark_lag}}
+
+    async def record_failures(self, collection_name: CollectionName, failures: List[BulkWriteFailure]) -> Set[int]:
+        """
+        Keeps every failed write in sync_failures with its attempt count and returns the indexes that are retried.
+        Permanent errors, and transient ones past SYNC_MAX_ATTEMPTS, are skipped so they never block the sync.
+        """
+        retrying: Set[int] = set()
+        for failure in failures:
+            state = await self.failures.find_one_and_update(
+                {"_id": f"{collection_name.value}:{failure.id}"},
+                {
+                    "$set": {
+                        "collection": collection_name.value,
+                        "document_id": failure.id,
+                        "code": failure.code,
+                        "message": failure.message,
+                        "failed_at": datetime.now(timezone.utc),
+                    },
+                    "$inc": {"attempts": 1},
+                },
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+
+            if failure.code in PERMANENT_WRITE_ERRORS or state["attempts"] >= self.max_attempts:
+                await self.failures.update_one({"_id": state["_id"]}, {"$set": {"is_skipped": True}})
+                logger.error(
+                    f"Skipping document {failure.id} of {collection_name.value} after {state['attempts']} attempts, "
+                    f"it is kept in {CollectionName.SYNC_FAILURES.value}: {failure.message}"
+                )
+                continue
+
+            logger.warning(f"Error syncing document {failure.id}, attempt {state['attempts']}: {failure.message}")
+            retrying.add(failure.index)
+
+        if retrying and self.retried_collections is not None:
+            self.retried_collections.add(collection_name.value)
+
+        return retrying
+
+    async def clear_failures(self, collection_name: CollectionName, ids: List[str]) -> None:
+        # documents written after a transient failure get their attempt budget back
+        if self.retried_collections is None:
+            pending = await self.failures.distinct("collection", {"is_skipped": {"$ne": True}})
+            self.retried_collections = set(pending)
+
+        if not ids or collection_name.value not in self.retried_collections:
+            return
+
+        await self.failures.delete_many(
+            {"collection": collection_name.value, "document_id": {"$in": ids}, "is_skipped": {"$ne": True}}
+        )
+        if not await self.failures.find_one({"collection": collection_name.value, "is_skipped": {"$ne": True}}):
+            self.retried_collections.discard(collection_name.value)
+
+    async def sync_changes(self, collection_name: CollectionName) -> Dict[str, int]:
+        logger.info(f"Starting incremental sync for collection: {collection_name.value}")
+        # raw documents are forwarded to the remote as they are, without a decode/encode round trip
+        local_collection = self.local_db.get_collection(collection_name).with_options(
+            codec_options=CodecOptions(document_class=RawBSONDocument)
+        )
+        remote = BaseRepository(self.remote_db.get_collection(collection_name), BaseEntity)
+
+        watermark = await self.load_watermark(collection_name)
+        cursor = local_collection.find(
+            self.changed_since(watermark),
+            sort=[("updated_at", ASCENDING), ("_id", ASCENDING)],
+            batch_size=self.batch_size,
+        )
+
+        synced = 0
+        skipped = 0
+        errors = 0
+
+        try:
+            while True:
+                docs = await cursor.to_list(length=self.batch_size)
+                if not docs:
+                    break
+
+                async with self.semaphore:
+                    report = await remote.bulk_write_chunks(
+                        [str(doc["_id"]) for doc in docs],
+                        [ReplaceOne({"_id": doc["_id"]}, doc, upsert=True) for doc in docs],
+                        [len(doc.raw) for doc in docs],
+                    )
+
+                synced += report.upserted_count + report.modified_count
+                skipped += report.matched_count - report.modified_count
+                errors += len(report.failed)
+
+                # the whole batch was written (unordered), failures only decide how far the watermark moves
+                retrying = await self.record_failures(collection_name, report.failed) if report.failed else set()
+                await self.clear_failures(collection_name, report.succeeded)
+                if retrying:
+                    # the watermark stops right before the first retried document, the next run resumes there
+                    first_failure = min(retrying)
+                    if first_failure > 0:
+                        await self.save_watermark(collection_name, docs[first_failure - 1])
+
+                    break
+
+                await self.save_watermark(collection_name, docs[-1])
+        finally:
+            await cursor.close()
+
+        logger.info(
+            f"Collection {collection_name.value} incremental sync completed - "
+            f"Synced: {synced}, Skipped: {skipped}, Errors: {errors}"
+        )
+
+        return {"synced": synced, "skipped": skipped, "errors": errors}
+
+    @staticmethod
+    def prefix_range(prefix: str) -> dict:
+        # every ObjectId whose hex form starts with prefix, served by the _id index
+        if not prefix:
+            return OBJECT_IDS
+
+        lower = ObjectId(prefix.ljust(OBJECT_ID_HEX_LENGTH, "0"))
+        upper = ObjectId(prefix.ljust(OBJECT_ID_HEX_LENGTH, "f"))
+        return {"_id": {"$gte": lower, "$lte": upper}}
+
+    async def bucket_hashes(self, collection, prefix: str) -> Dict[str, Tuple[int, Decimal]]:
+        length = len(prefix) + CHECKSUM_PREFIX_STEP
+        pipeline = [
+            {"$match": self.prefix_range(prefix)},
+            {
+                "$group": {
+                    "_id": {"$substrCP": [{"$toString": "$_id"}, 0, length]},
+                    "count": {"$sum": 1},
+                    # decimal sum is exact and order independent, both sides get the same value for the same content
+                    "hash": {"$sum": {"$toDecimal": DOCUMENT_HASH}},
+                }
+            },
+        ]
+
+        async with self.semaphore:
+            cursor = await collection.aggregate(pipeline)
+            buckets = await cursor.to_list(None)
+
+        return {bucket["_id"]: (bucket["count"], bucket["hash"].to_decimal()) for bucket in buckets}
+
+    async def document_hashes(self, collection, query: dict) -> Dict[Any, int]:
+        pipeline = [{"$match": query}, {"$project": {"hash": DOCUMENT_HASH}}]
+
+        async with self.semaphore:
+            cursor = await collection.aggregate(pipeline)
+            docs = await cursor.to_list(None)
+
+        return {doc["_id"]: doc["hash"] for doc in docs}
+
+    async def differing_buckets(self, local_collection, remote_collection, prefix: str = "") -> List[str]:
+        local_buckets, remote_buckets = await asyncio.gather(
+            self.bucket_hashes(local_collection, prefix),
+            self.bucket_hashes(remote_collection, prefix),
+        )
+
+        leaves: List[str] = []
+        for bucket in sorted(local_buckets.keys() | remote_buckets.keys()):
+            local_bucket, remote_bucket = local_buckets.get(bucket), remote_buckets.get(bucket)
+            if local_bucket == remote_bucket:
+                continue
+
+            count = max(local_bucket[0] if local_bucket else 0, remote_bucket[0] if remote_bucket else 0)
+            if count <= self.checksum_leaf_size or len(bucket) + CHECKSUM_PREFIX_STEP > OBJECT_ID_HEX_LENGTH:
+                leaves.append(bucket)
+            else:
+                leaves.extend(await self.differing_buckets(local_collection, remote_collection, bucket))
+
+        return leaves
+
+    async def repair_bucket(self, collection_name: CollectionName, query: dict) -> Dict[str, int]:
         local_collection = self.local_db.get_collection(collection_name)
         remote_collection = self.remote_db.get_collection(collection_name)
 
-        # Get all docs from local
-        local_docs = await local_collection.find({}).to_list(None)
-        total_docs = len(local_docs)
-        logger.info(f"Found {total_docs} documents in {collection_name.value}")
+        local_hashes, remote_hashes = await asyncio.gather(
+            self.document_hashes(local_collection, query),
+            self.document_hashes(remote_collection, query),
+        )
+        changed = [_id for _id, value in local_hashes.items() if remote_hashes.get(_id) != value]
+        # a document missing locally is not proof of a delete, the remote may have been written directly
+        extra = [_id for _id in remote_hashes if _id not in local_hashes]
+        deleted = extra if self.checksum_delete_extra else []
+        if extra and not deleted:
+            logger.warning(f"{len(extra)} documents of {collection_name.value} only exist on the remote, kept")
+
+        raw_collection = local_collection.with_options(codec_options=CodecOptions(document_class=RawBSONDocument))
+        docs = await raw_collection.find({"_id": {"$in": changed}}).to_list(None) if changed else []
+
+        ids = [str(doc["_id"]) for doc in docs] + [str(_id) for _id in deleted]
+        requests = [ReplaceOne({"_id": doc["_id"]}, doc, upsert=True) for doc in docs]
+        requests += [DeleteOne({"_id": _id}) for _id in deleted]
+        sizes = [len(doc.raw) for doc in docs] + [DELETE_REQUEST_SIZE] * len(deleted)
+
+        if not requests:
+            return {"synced": 0, "skipped": len(local_hashes), "errors": 0, "extra": len(extra)}
+
+        async with self.semaphore:
+            report = await BaseRepository(remote_collection, BaseEntity).bulk_write_chunks(ids, requests, sizes)
+
+        for failure in report.failed:
+            logger.error(f"Error repairing document {failure.id}: {failure.message}")
+
+        return {
+            "synced": len(report.succeeded),
+            "skipped": len(local_hashes) - len(changed),
+            "errors": len(report.failed),
+            "extra": len(extra) - len(deleted),
+        }
+
+    async def sync_checksum(self, collection_name: CollectionName) -> Dict[str, int]:
+        logger.info(f"Starting checksum sync for collection: {collection_name.value}")
+        local_collection = self.local_db.get_collection(collection_name)
+        remote_collection = self.remote_db.get_collection(collection_name)
+
+        try:
+            buckets = await self.differing_buckets(local_collection, remote_collection)
+        except OperationFailure as exception:
+            if exception.code not in CHECKSUM_UNSUPPORTED:
+                raise
+
+            logger.warning(f"Server side hashing is not available, falling back to the watermark scan: {exception}")
+            return await self.sync_changes(collection_name)
+
+        result = {"synced": 0, "skipped": 0, "errors": 0, "extra": 0}
+        for query in [*(self.prefix_range(bucket) for bucket in buckets), OTHER_IDS]:
+            repaired = await self.repair_bucket(collection_name, query)
+            for key, value in repaired.items():
+                result[key] += value
+
+        logger.info(
+            f"Collection {collection_name.value} checksum sync completed - {len(buckets)} differing buckets, "
+            f"Synced: {result['synced']}, Skipped: {result['skipped']}, Errors: {result['errors']}, "
+            f"Remote only: {result['extra']}"
+        )
+
+        return result
+
+    async def load_resume_token(self) -> Optional[Any]:
+        state = await self.states.find_one({"_id": self.RESUME_TOKEN_ID})
+        return state["token"] if state else None
+
+    async def save_resume_token(self, token: Optional[Any]) -> None:
+        if token is None:
+            await self.states.delete_one({"_id": self.RESUME_TOKEN_ID})
+            return
+
+        await self.states.update_one(
+            {"_id": self.RESUME_TOKEN_ID},
+            {"$set": {"token": token, "synced_at": datetime.now(timezone.utc)}},
+            upsert=True,
+        )
+
+    async def open_stream(self, token: Optional[Any]) -> AsyncChangeStream:
+        database = self.local_db.db.with_options(codec_options=CodecOptions(document_class=RawBSONDocument))
+        pipeline = [{"$match": {"ns.coll": {"$in": [name.value for name in self.SYNC_COLLECTIONS]}}}]
+
+        return await database.watch(
+            pipeline,
+            full_document="updateLookup",
+            start_after=token,
+            batch_size=self.batch_size,
+            max_await_time_ms=max(1, int(self.stream_max_wait * 1000)),
+        )
+
+    async def next_changes(self, stream: AsyncChangeStream) -> List[RawBSONDocument]:
+        # a micro-batch closes at batch_size events or stream_max_wait after its first event
+        changes: List[RawBSONDocument] = []
+        deadline: Optional[float] = None
+
+        while stream.alive and len(changes) < self.batch_size:
+            change = await stream.try_next()
+            if change is not None:
+                changes.append(change)
+                deadline = deadline or time.monotonic() + self.stream_max_wait
+
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+
+        return changes
+
+    async def apply_changes(self, changes: List[RawBSONDocument]) -> Dict[str, Dict[str, int]]:
+        # only the last change of a document matters, which also makes unordered writes safe
+        latest: Dict[str, Dict[Any, RawBSONDocument]] = {}
+        for change in changes:
+            if change["operationType"] in ("insert", "update", "replace", "delete"):
+                latest.setdefault(change["ns"]["coll"], {})[change["documentKey"]["_id"]] = change
+
+        results: Dict[str, Dict[str, int]] = {}
+        for name, documents in latest.items():
+            ids, requests, sizes = [], [], []
+            for _id, change in documents.items():
+                doc = change.get("fullDocument")
+                if change["operationType"] == "delete":
+                    requests.append(DeleteOne({"_id": _id}))
+                    sizes.append(DELETE_REQUEST_SIZE)
+                elif doc is not None:
+                    requests.append(ReplaceOne({"_id": _id}, doc, upsert=True))
+                    sizes.append(len(doc.raw))
+                else:
+                    # deleted before the update lookup ran, its delete event is part of the stream too
+                    continue
+
+                ids.append(str(_id))
+
+            remote = BaseRepository(self.remote_db.get_collection(CollectionName(name)), BaseEntity)
+            async with self.semaphore:
+                report = await remote.bulk_write_chunks(ids, requests, sizes)
+
+            collection_name = CollectionName(name)
+            retrying = await self.record_failures(collection_name, report.failed) if report.failed else set()
+            await self.clear_failures(collection_name, report.succeeded)
+
+            results[name] = {
+                "synced": len(report.succeeded),
+                "skipped": len(documents) - len(ids),
+                "errors": len(report.failed),
+                "retrying": len(retrying),
+            }
+
+        return results
+
+    def reopen_delay(self) -> float:
+        if not self.stream_failures:
+            return STREAM_REOPEN_DELAY
+
+        return min(STREAM_MAX_REOPEN_DELAY, STREAM_REOPEN_DELAY * 2**self.stream_failures)
+
+    async def tail_changes(self) -> bool:
+        """
+        Applies local changes to the remote until cancelled. Returns False when the deployment
+        has no change streams, True when the stream stopped and can be reopened from the stored token.
+        """
+        token = await self.load_resume_token()
+        try:
+            stream = await self.open_stream(token)
+        except OperationFailure as exception:
+            if exception.code in CHANGE_STREAM_UNSUPPORTED:
+                logger.warning(f"Change streams are not available, falling back to the watermark scan: {exception}")
+                return False
+
+            if exception.code in CHANGE_STREAM_HISTORY_LOST:
+                logger.warning("Resume token is no longer in the oplog, catching up with the watermark scan")
+                await self.save_resume_token(None)
+                return True
+
+            raise
+
+        async with stream:
+            if token is None:
+                # the stream is positioned first, so nothing written during the catch up scan is missed
+                await self.sync_collections()
+                await self.save_resume_token(stream.resume_token)
+
+            logger.info("Tailing local changes 📡")
+            while stream.alive:
+                try:
+                    changes = await self.next_changes(stream)
+                except OperationFailure as exception:
+                    if exception.code in CHANGE_STREAM_HISTORY_LOST:
+                        await self.save_resume_token(None)
+                        return True
+
+                    raise
+
+                if not changes:
+                    continue
+
+                results = await self.apply_changes(changes)
+                if any(result["retrying"] for result in results.values()):
+                    # the token stays before this batch, reopening retries it until its failures are skipped
+                    self.stream_failures += 1
+                    return True
+
+                self.stream_failures = 0
+                await self.save_resume_token(stream.resume_token)
+                logger.info(f"Applied {len(changes)} changes: {results}")
+
+        return True
+
+    async def sync_collection_full(self, collection_name: CollectionName) -> Dict[str, int]:
+        logger.info(f"Starting sync for collection: {collection_name.value}")
+        local_collection = self.local_db.get_collection(collection_name).with_options(
+            codec_options=CodecOptions(document_class=RawBSONDocument)
+        )
+        remote_collection = self.remote_db.get_collection(collection_name)
+        remote = BaseRepository(remote_collection, BaseEntity)
 
         synced = 0
         skipped = 0
         errors = 0
 
-        # Process documents in batches to avoid too many open connections
-        batch_size = 100  # Process 100 documents at a time
+        cursor = local_collection.find({}, batch_size=self.batch_size)
+        try:
+            while True:
+                docs = await cursor.to_list(length=self.batch_size)
+                if not docs:
+                    break
 
-        for i in range(0, len(local_docs), batch_size):
-            batch = local_docs[i : i + batch_size]
-            logger.info(
-                f"Processing batch {i//batch_size + 1}/{(total_docs + batch_size - 1)//batch_size} "
-                f"({len(batch)} documents)"
-            )
+                async with self.semaphore:
+                    # one existence check per batch, the comparison happens in memory
+                    existing = await remote_collection.find(
+                        {"_id": {"$in": [doc["_id"] for doc in docs]}}, {"updated_at": 1}
+                    ).to_list(None)
+                    remote_updated_at = {item["_id"]: item.get("updated_at") for item in existing}
 
-            tasks = []
-            for doc in batch:
-                tasks.append(self.sync_document_with_semaphore(remote_collection, doc))
+                    ids, requests, sizes = [], [], []
+                    for doc in docs:
+                        if doc["_id"] not in remote_updated_at:
+                            requests.append(InsertOne(doc))
+                        elif remote_updated_at[doc["_id"]] != doc.get("updated_at"):
+                            requests.append(ReplaceOne({"_id": doc["_id"]}, doc))
+                        else:
+                            skipped += 1
+                            continue
 
-            batch_results = await asyncio.gather(*tasks, return_exceptions=True)
+                        ids.append(str(doc["_id"]))
+                        sizes.append(len(doc.raw))
 
-            for result in batch_results:
-                if isinstance(result, Exception):
-                    logger.error(f"Error syncing document: {result}")
-                    errors += 1
-                    continue
+                    report = await remote.bulk_write_chunks(ids, requests, sizes)
 
-                synced += result.get("synced", 0)  # type: ignore
-                skipped += result.get("skipped", 0)  # type: ignore
+                for failure in report.failed:
+                    logger.error(f"Error syncing document {failure.id}: {failure.message}")
 
-            logger.info(f"Batch completed - Progress: {min(i + batch_size, total_docs)}/{total_docs}")
+                synced += len(report.succeeded)
+                errors += len(report.failed)
+        finally:
+            await cursor.close()
 
         logger.info(
             f"Collection {collection_name.value} sync completed - "
@@ -61,45 +554,24 @@ class SyncScheduler:
 
         return {"synced": synced, "skipped": skipped, "errors": errors}
 
-    async def sync_document_with_semaphore(self, remote_collection, doc: Dict) -> Dict[str, int]:
-        async with self.semaphore:
-            return await self.sync_document(remote_collection, doc)
-
-    async def sync_document(self, remote_collection, doc: Dict) -> Dict[str, int]:
+    async def sync_collection_timed(self, collection_name: CollectionName) -> Dict[str, float]:
+        start_time = time.perf_counter()
         try:
-            existing = await remote_collection.find_one({"_id": doc["_id"]})
-            if existing:
-                if existing.get("updated_at") != doc.get("updated_at"):
-                    await remote_collection.replace_one({"_id": doc["_id"]}, doc)
-                    return {"synced": 1, "skipped": 0}
-                else:
-                    return {"synced": 0, "skipped": 1}
-            else:
-                await remote_collection.insert_one(doc)
-                return {"synced": 1, "skipped": 0}
+            result: Dict[str, float] = {**await self.sync_collection(collection_name)}
         except Exception as e:
-            logger.error(f"Error syncing document {doc['_id']}: {e}")
-            return {"synced": 0, "skipped": 0}
-
-    async def sync_collections(self) -> Dict[str, int]:
-        collections_to_sync = [
-            CollectionName.ACCOUNTS,
-            CollectionName.POSTS,
-            CollectionName.ROLES,
-        ]
-
-        results = {}
+            logger.error(f"Error syncing collection {collection_name.value}: {e}")
+            result = {"synced": 0, "skipped": 0, "errors": 1}
 
-        for collection_name in collections_to_sync:
-            try:
-                logger.info(f"Starting sync for collection: {collection_name.value}")
-                collection_result = await self.sync_collection(collection_name)
-                results[collection_name.value] = collection_result
-                await asyncio.sleep(1)
+        duration = time.perf_counter() - start_time
+        processed = result["synced"] + result["skipped"] + result["errors"]
+        result["duration"] = duration
+        result["docs_per_second"] = processed / duration if duration > 0 else 0.0
+        return result
 
-            except Exception as e:
-                logger.error(f"Error syncing collection {collection_name.value}: {e}")
-                results[collection_name.value] = {"synced": 0, "skipped": 0, "errors": 1}
+    async def sync_collections(self) -> Dict[str, Dict[str, float]]:
+        # collections run concurrently, remote round trips share the global semaphore budget
+        outcomes = await asyncio.gather(*(self.sync_collection_timed(name) for name in self.SYNC_COLLECTIONS))
+        results = {name.value: outcome for name, outcome in zip(self.SYNC_COLLECTIONS, outcomes)}
 
         total_synced = sum(r.get("synced", 0) for r in results.values())
         total_skipped = sum(r.get("skipped", 0) for r in results.values())
@@ -112,6 +584,5 @@ class SyncScheduler:
         return results
 
     async def close(self):
-        await self.local_db.close()
-        await self.remote_db.close()
-        print("Databases closed successfully 👋🏻")
+        # NOTE: clients are owned by the shared DatabaseRegistry and closed on application shutdown
+        logger.info("Sync scheduler closed successfully 👋🏻")
@@ -2,9 +2,13 @@ from .shared_dependencies import (
     config_from_state,
     queue_from_state,
     cryptography_from_state,
+    databases_from_state,
+    token_cache_from_state,
+    password_executor_from_state,
     build_supabase,
     build_jwt,
     build_database,
+    build_rate_limiter,
 )
 
 from .repository_dependencies import (
@@ -27,9 +31,13 @@ __all__ = [
     "config_from_state",
     "queue_from_state",
     "cryptography_from_state",
+    "databases_from_state",
+    "token_cache_from_state",
+    "password_executor_from_state",
     "build_supabase",
     "build_database",
     "build_jwt",
+    "build_rate_limiter",
     "build_account_repository",
     "build_role_repository",
     "build_post_repository",
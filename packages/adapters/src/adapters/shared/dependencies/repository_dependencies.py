@@ -1,4 +1,5 @@
 from fastapi import Depends
+from core.configuration import Configuration
 from core.database import Database, CollectionName
 
 
@@ -19,7 +20,7 @@ from adapters.secondary import (
     ProviderRepository,
 )
 
-from .shared_dependencies import build_database
+from .shared_dependencies import build_database, config_from_state
 
 
 def build_account_repository(
@@ -40,10 +41,11 @@ def build_post_repository(database: Database = Depends(build_database)) -> IPost
 
 
 def build_session_repository(
+    config: Configuration = Depends(config_from_state),
     database: Database = Depends(build_database),
 ) -> ISessionRepository:
     collection = database.get_collection(CollectionName.SESSIONS)
-    return SessionRepository(collection)
+    return SessionRepository(collection, config.SESSION_STORAGE_MODE)
 
 
 def build_provider_repository(
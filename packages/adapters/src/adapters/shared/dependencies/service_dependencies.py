@@ -1,7 +1,7 @@
 from fastapi import Depends
 
 from core.configuration import Configuration
-from core.secures import Jwt
+from core.secures import Jwt, TokenCache, PasswordExecutor
 
 from adapters.secondary import RabbitMQConnection
 from adapters.secondary import Supabase
@@ -25,6 +25,8 @@ from domain.services import (
 from .shared_dependencies import (
     config_from_state,
     queue_from_state,
+    token_cache_from_state,
+    password_executor_from_state,
     build_supabase,
     build_jwt,
 )
@@ -45,6 +47,8 @@ def build_auth_service(
     account_repository: IAccountRepository = Depends(build_account_repository),
     session_repository: ISessionRepository = Depends(build_session_repository),
     provider_repository: IProviderRepository = Depends(build_provider_repository),
+    token_cache: TokenCache = Depends(token_cache_from_state),
+    password_executor: PasswordExecutor = Depends(password_executor_from_state),
 ) -> AuthService:
     return AuthService(
         jwt,
@@ -53,6 +57,8 @@ def build_auth_service(
         account_repository,
         session_repository,
         provider_repository,
+        token_cache,
+        password_executor,
     )
 
 
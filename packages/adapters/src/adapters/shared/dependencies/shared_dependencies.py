@@ -1,11 +1,12 @@
 from fastapi import Depends, Request
 
 from core.configuration import Configuration
-from core.secures import Cryptography, Jwt
-from core.database import Database
+from core.secures import Cryptography, Jwt, TokenCache, PasswordExecutor
+from core.database import Database, DatabaseRegistry
 
 from adapters.secondary import RabbitMQConnection
 from adapters.secondary import Supabase
+from adapters.secondary import RateLimiter, MemoryRateLimiter, RedisRateLimiter
 
 
 # Global instances
@@ -49,6 +50,18 @@ def cryptography_from_state(request: Request) -> Cryptography:
     return request.app.state.cryptography
 
 
+def databases_from_state(request: Request) -> DatabaseRegistry:
+    return request.app.state.databases
+
+
+def token_cache_from_state(request: Request) -> TokenCache:
+    return request.app.state.token_cache
+
+
+def password_executor_from_state(request: Request) -> PasswordExecutor:
+    return request.app.state.password_executor
+
+
 # def build_rabbitmq_connection() -> RabbitMQConnection:
 #     return RabbitMQConnection(config.RABBITMQ_BROKER_URL)
 
@@ -70,10 +83,21 @@ def build_supabase(
     return Supabase(config)
 
 
+def build_rate_limiter(config: Configuration) -> RateLimiter:
+    match config.RATE_LIMIT_BACKEND:
+        case "memory":
+            return MemoryRateLimiter(config.RATE_LIMIT_MAX_CLIENTS)
+        case "redis":
+            return RedisRateLimiter(config.REDIS_URL)
+        case _:
+            raise ValueError(f"Unsupported rate limit backend: {config.RATE_LIMIT_BACKEND}")
+
+
 def build_database(
     config: Configuration = Depends(config_from_state),
+    databases: DatabaseRegistry = Depends(databases_from_state),
 ) -> Database:
-    return Database(config, config.IS_LOCAL)
+    return databases.get(config.IS_LOCAL)
 
 
 # async def augmenter_monitor(config: Configuration):
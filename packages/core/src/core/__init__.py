@@ -1,3 +1,3 @@
-from . import helpers, configuration, database, base, exceptions, secures
+from . import helpers, configuration, database, base, exceptions, secures, metrics
 
-__all__ = ["configuration", "helpers", "database", "base", "exceptions", "secures"]
+__all__ = ["configuration", "helpers", "database", "base", "exceptions", "secures", "metrics"]
@@ -1,8 +1,14 @@
-from .query import BaseQuery
+from .query import BaseQuery, ExportQuery
+from .cursor import Cursor
+from .bulk import BulkWriteReport, BulkWriteFailure
 from .response import HttpResponse, HttpPaginationResponse, PAGE, PAGE_SIZE, Meta
 
 __all__ = [
     "BaseQuery",
+    "ExportQuery",
+    "Cursor",
+    "BulkWriteReport",
+    "BulkWriteFailure",
     "HttpResponse",
     "HttpPaginationResponse",
     "Meta",
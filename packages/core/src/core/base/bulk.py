@@ -0,0 +1,22 @@
+from typing import List, Optional
+from fastapi_camelcase import CamelModel
+
+
+class BulkWriteFailure(CamelModel):
+    index: int  # position in the list handed to the repository
+    id: Optional[str] = None
+    code: Optional[int] = None
+    message: str
+
+
+class BulkWriteReport(CamelModel):
+    succeeded: List[str] = []
+    failed: List[BulkWriteFailure] = []
+    inserted_count: int = 0
+    matched_count: int = 0
+    modified_count: int = 0
+    upserted_count: int = 0
+
+    @property
+    def is_ok(self) -> bool:
+        return not self.failed
@@ -0,0 +1,30 @@
+import base64
+import binascii
+from typing import Any, Tuple
+from bson import ObjectId, json_util
+from bson.errors import InvalidId
+
+from core.exceptions import ExceptionHandler, ErrorCodes
+
+
+class Cursor:
+    # Opaque keyset cursor: the (order_by value, _id) of the last document of a page,
+    # tagged with the sort it was produced for so it cannot be replayed against another order.
+    @staticmethod
+    def encode(order_by: str, order: str, value: Any, _id: ObjectId) -> str:
+        payload = json_util.dumps({"k": order_by, "o": order, "v": value, "i": _id})
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def decode(cursor: str, order_by: str, order: str) -> Tuple[Any, ObjectId]:
+        try:
+            padding = "=" * (-len(cursor) % 4)
+            payload = json_util.loads(base64.urlsafe_b64decode(cursor + padding))
+            value, _id = payload["v"], ObjectId(payload["i"])
+        except (binascii.Error, ValueError, KeyError, TypeError, InvalidId):
+            raise ExceptionHandler(code=ErrorCodes.BAD_REQUEST, msg="Invalid pagination cursor 🥲")
+
+        if payload.get("k") != order_by or payload.get("o") != order:
+            raise ExceptionHandler(code=ErrorCodes.BAD_REQUEST, msg="Pagination cursor does not match the sort order 🥲")
+
+        return value, _id
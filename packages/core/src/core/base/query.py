@@ -1,4 +1,4 @@
-from typing import Literal
+from typing import Literal, Optional
 from fastapi_camelcase import CamelModel
 from pydantic import Field
 
@@ -9,3 +9,13 @@ class BaseQuery(CamelModel):
     order_by: Literal["created_at", "updated_at"] = "created_at"
     order: Literal["asc", "desc"] = "desc"
     search: str = ""
+    # keyset pagination: pass back meta.nextCursor to fetch the following page, page is then ignored
+    cursor: Optional[str] = None
+    # counting can be expensive on large or regex filtered collections, clients can opt out
+    include_total: bool = True
+
+
+class ExportQuery(CamelModel):
+    search: str = ""
+    # documents fetched and hydrated per round trip, bounds the memory used by one export
+    batch_size: int = Field(500, gt=0, le=5000)
@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, Optional
 from fastapi_camelcase import CamelModel
 
 PAGE = 1
@@ -14,8 +14,9 @@ class HttpResponse(CamelModel):
 class Meta(CamelModel):
     page: int
     page_size: int
-    total_page: int
-    total_record: int
+    total_page: Optional[int] = None
+    total_record: Optional[int] = None
+    next_cursor: Optional[str] = None
 
     @staticmethod
     def empty():
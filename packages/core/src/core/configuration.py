@@ -1,3 +1,4 @@
+from typing import Dict, Tuple
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 from core.secures import KeyBackend
@@ -10,18 +11,55 @@ class Configuration(BaseSettings):
     CORS_ALLOWED_ORIGINS: str
     MAX_AGE: int = 3600
 
+    # rate limiting - [memory, redis]
+    RATE_LIMIT_BACKEND: str = "memory"
+    RATE_LIMIT_REQUESTS: int = 100  # Maximum requests allowed in the duration
+    RATE_LIMIT_DURATION: int = 60  # seconds
+    RATE_LIMIT_MAX_CLIENTS: int = 10000  # memory backend only
+    # route prefix -> [requests, duration], e.g. {"/api/v1/auth": [10, 60]}
+    RATE_LIMIT_RULES: Dict[str, Tuple[int, int]] = {}
+
     # JWT
     ACCESS_TOKEN_EXPIRATION: int
     REFRESH_TOKEN_EXPIRATION: int
+    TOKEN_CACHE_SIZE: int = 10000
+    ACCOUNT_CACHE_SIZE: int = 10000
+    ACCOUNT_CACHE_TTL: int = 30
+
+    # password hashing (argon2)
+    PASSWORD_HASHER_WORKERS: int = 2
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536  # KiB
+    ARGON2_PARALLELISM: int = 4
 
     # database
     LOCAL_URI: str
     REMOTE_URI: str
     IS_LOCAL: bool
+    DATABASE_MAX_POOL_SIZE: int = 20
+    DATABASE_MIN_POOL_SIZE: int = 5
+    IS_INDEX_SYNC_ENABLED: bool = True
     IS_SYNC_DATABASE_ENABLED: bool
     SYNC_DATABASE_INTERVAL: int
+    # sync - [full, incremental, stream, checksum], incremental only sends documents changed since the last run,
+    # stream tails a change stream (replica set required) and falls back to incremental,
+    # checksum compares content hashes bucketed by _id prefix and repairs only the differing buckets
+    SYNC_MODE: str = "incremental"
+    SYNC_BATCH_SIZE: int = 500
+    # incremental runs re-scan this window before the watermark, writes committed later than that are missed
+    SYNC_WATERMARK_LAG_SECONDS: int = 60
+    # a document whose write keeps failing transiently is recorded in sync_failures and skipped after this many runs
+    SYNC_MAX_ATTEMPTS: int = 5
+    SYNC_STREAM_MAX_WAIT_MS: int = 500
+    SYNC_MAX_CONCURRENCY: int = 4
+    SYNC_CHECKSUM_LEAF_SIZE: int = 256
+    # documents only the remote has may have been written there directly, they are only counted unless enabled
+    SYNC_CHECKSUM_DELETE_EXTRA: bool = False
     IS_ENABLE_ARGUMENTATION: bool
     CLEAN_SESSION_INTERVAL: int
+    # sessions - [ttl, sweep], sweep keeps CleanSessionBackground as the only way expired sessions are removed
+    SESSION_STORAGE_MODE: str = "ttl"
+    CLEAN_SESSION_BATCH_SIZE: int = 1000
 
     # roboflow
     ROBOFLOW_KEY: str
@@ -36,8 +74,25 @@ class Configuration(BaseSettings):
     CLOUDINARY_API_KEY: str
     CLOUDINARY_API_SECRET: str
 
-    # queue
+    # queue - [rabbitmq, memory], memory keeps every message inside the process (tests, benchmarks)
+    QUEUE_BACKEND: str = "rabbitmq"
+    QUEUE_MEMORY_LATENCY_MS: float = 0
     RABBITMQ_BROKER_URL: str
+    # message encoding - [json, msgpack], consumers read every format, so upgrade consumers before producers;
+    # bodies of at least QUEUE_COMPRESSION_THRESHOLD bytes are zstd compressed (0 disables compression)
+    QUEUE_MESSAGE_FORMAT: str = "json"
+    QUEUE_COMPRESSION_THRESHOLD: int = 0
+    RABBITMQ_CHANNEL_POOL_SIZE: int = 4
+    RABBITMQ_CONFIRM_BATCH_SIZE: int = 256
+    # 0 disables the outbox, otherwise messages published within this window share one publish
+    RABBITMQ_OUTBOX_LINGER_MS: int = 0
+
+    # caching
+    REDIS_URL: str = "redis://localhost:6379/0"
+
+    # metrics, an empty directory keeps metrics per process (single worker)
+    METRICS_DIRECTORY: str = ""
+    METRICS_FLUSH_INTERVAL: int = 15
 
     # google
     GEMINI_API_KEY: str
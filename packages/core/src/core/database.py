@@ -1,9 +1,11 @@
-from pymongo import AsyncMongoClient
+from pymongo import AsyncMongoClient, monitoring
 from pymongo.server_api import ServerApi
 from pymongo.asynchronous.collection import AsyncCollection
 from enum import Enum
+from typing import Dict
 
 from core.configuration import Configuration
+from core.metrics import REGISTRY
 
 
 class CollectionName(str, Enum):
@@ -15,22 +17,117 @@ class CollectionName(str, Enum):
     POSTS = "posts"
     DISEASES = "diseases"
     NOTIFICATIONS = "notifications"
+    SYNC_STATES = "sync_states"
+    SYNC_FAILURES = "sync_failures"
+
+
+class PoolStatistics(monitoring.ConnectionPoolListener):
+    # NOTE: pymongo async calls listeners from the event loop thread, so plain counters are enough
+    def __init__(self) -> None:
+        self.connections = 0
+        self.checked_out = 0
+        self.waiters = 0
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.total_wait_time = 0.0
+        self.max_wait_time = 0.0
+        self.pool_cleared = 0
+
+    def pool_created(self, event: monitoring.PoolCreatedEvent) -> None:
+        pass
+
+    def pool_ready(self, event: monitoring.PoolReadyEvent) -> None:
+        pass
+
+    def pool_cleared(self, event: monitoring.PoolClearedEvent) -> None:
+        self.pool_cleared += 1
+
+    def pool_closed(self, event: monitoring.PoolClosedEvent) -> None:
+        pass
+
+    def connection_created(self, event: monitoring.ConnectionCreatedEvent) -> None:
+        self.connections += 1
+
+    def connection_ready(self, event: monitoring.ConnectionReadyEvent) -> None:
+        pass
+
+    def connection_closed(self, event: monitoring.ConnectionClosedEvent) -> None:
+        self.connections = max(0, self.connections - 1)
+
+    def connection_check_out_started(self, event: monitoring.ConnectionCheckOutStartedEvent) -> None:
+        self.waiters += 1
+
+    def connection_check_out_failed(self, event: monitoring.ConnectionCheckOutFailedEvent) -> None:
+        self.waiters = max(0, self.waiters - 1)
+        self.checkout_failures += 1
+
+    def connection_checked_out(self, event: monitoring.ConnectionCheckedOutEvent) -> None:
+        self.waiters = max(0, self.waiters - 1)
+        self.checked_out += 1
+        self.checkouts += 1
+
+        # duration is the time spent waiting for a connection (in seconds)
+        self.total_wait_time += event.duration
+        self.max_wait_time = max(self.max_wait_time, event.duration)
+
+    def connection_checked_in(self, event: monitoring.ConnectionCheckedInEvent) -> None:
+        self.checked_out = max(0, self.checked_out - 1)
+
+    def snapshot(self) -> Dict[str, float]:
+        average_wait_time = self.total_wait_time / self.checkouts if self.checkouts else 0.0
+        return {
+            "connections": self.connections,
+            "checked_out": self.checked_out,
+            "waiters": self.waiters,
+            "checkouts": self.checkouts,
+            "checkout_failures": self.checkout_failures,
+            "average_wait_time": average_wait_time,
+            "max_wait_time": self.max_wait_time,
+            "pool_cleared": self.pool_cleared,
+        }
+
+
+MONGO_COMMAND_DURATION = REGISTRY.histogram(
+    "mongo_command_duration_seconds",
+    "Duration of MongoDB commands",
+    ("database", "command", "outcome"),
+)
+
+
+class CommandLatency(monitoring.CommandListener):
+    def __init__(self, database: str) -> None:
+        self.database = database
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        pass
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        MONGO_COMMAND_DURATION.observe(event.duration_micros / 1_000_000, self.database, event.command_name, "success")
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        MONGO_COMMAND_DURATION.observe(event.duration_micros / 1_000_000, self.database, event.command_name, "failure")
 
 
 class Database:
     def __init__(self, config: Configuration, is_local: bool = False):
         URI = config.LOCAL_URI if is_local else config.REMOTE_URI
+        self.is_local = is_local
+        self.max_pool_size = config.DATABASE_MAX_POOL_SIZE
+        self.pool_statistics = PoolStatistics()
+        self.command_latency = CommandLatency("local" if is_local else "remote")
+
         self.client = AsyncMongoClient(
             URI,
             server_api=ServerApi("1"),
-            maxPoolSize=20,  # decrease max pool size
-            minPoolSize=5,  # Set min pool size
+            maxPoolSize=config.DATABASE_MAX_POOL_SIZE,
+            minPoolSize=config.DATABASE_MIN_POOL_SIZE,
             maxIdleTimeMS=30000,  # 30 seconds idle timeout
             connectTimeoutMS=20000,  # 20 seconds connect timeout
             serverSelectionTimeoutMS=20000,
             socketTimeoutMS=20000,
             retryWrites=True,
             w="majority",
+            event_listeners=[self.pool_statistics, self.command_latency],
         )
 
         self.db = self.client.agrismart  # name of the database
@@ -45,5 +142,37 @@ class Database:
         collection = self.db[name.value]
         return collection
 
+    def statistics(self) -> Dict[str, float]:
+        return {"max_pool_size": self.max_pool_size, **self.pool_statistics.snapshot()}
+
     async def close(self):
         await self.client.close()
+
+
+class DatabaseRegistry:
+    # One client (and therefore one connection pool) per target, shared by the whole worker process
+    def __init__(self, config: Configuration):
+        self.config = config
+        self.databases: Dict[bool, Database] = {}
+
+    def get(self, is_local: bool) -> Database:
+        database = self.databases.get(is_local)
+        if database is None:
+            database = Database(self.config, is_local=is_local)
+            self.databases[is_local] = database
+
+        return database
+
+    def default(self) -> Database:
+        return self.get(self.config.IS_LOCAL)
+
+    def statistics(self) -> Dict[str, Dict[str, float]]:
+        return {
+            "local" if is_local else "remote": database.statistics() for is_local, database in self.databases.items()
+        }
+
+    async def close(self):
+        for database in self.databases.values():
+            await database.close()
+
+        self.databases.clear()
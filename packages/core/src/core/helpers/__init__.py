@@ -1,4 +1,6 @@
 from .time import TimeHelper
 from .logger import LoggerHelper
+from .cache import TTLCache
+from .batch import BatchHelper
 
-__all__ = ["TimeHelper", "LoggerHelper"]
+__all__ = ["TimeHelper", "LoggerHelper", "TTLCache", "BatchHelper"]
@@ -0,0 +1,29 @@
+from typing import Iterator, List, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class BatchHelper:
+    @staticmethod
+    def chunk(
+        items: Sequence[T],
+        sizes: Sequence[int],
+        max_count: int,
+        max_bytes: int,
+    ) -> Iterator[Tuple[int, List[T]]]:
+        # yields (offset of the first item, chunk), a chunk closes at max_count items or max_bytes bytes,
+        # an item larger than max_bytes still goes out alone so the server can report it
+        offset = 0
+        chunk: List[T] = []
+        chunk_bytes = 0
+
+        for index, (item, size) in enumerate(zip(items, sizes)):
+            if chunk and (len(chunk) >= max_count or chunk_bytes + size > max_bytes):
+                yield offset, chunk
+                offset, chunk, chunk_bytes = index, [], 0
+
+            chunk.append(item)
+            chunk_bytes += size
+
+        if chunk:
+            yield offset, chunk
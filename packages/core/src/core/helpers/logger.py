@@ -1,4 +1,6 @@
+import sys
 import shutil
+from loguru import logger
 
 
 class LoggerHelper:
@@ -8,3 +10,10 @@ class LoggerHelper:
         text = f" {text} "
         banner = text.center(width, char)
         print(banner)
+
+    @staticmethod
+    def configure(level: str = "INFO"):
+        # enqueue=True moves only the sink write (terminal I/O) to a background thread,
+        # the message and the handler format are still rendered by the logging caller
+        logger.remove()
+        logger.add(sys.stderr, level=level, enqueue=True)
@@ -0,0 +1,297 @@
+import os
+import json
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# NOTE: metrics are updated from the event loop thread only, every worker process owns its own values
+# and multi-worker deployments aggregate per-process snapshots written to METRICS_DIRECTORY.
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = Tuple[str, ...]
+
+
+class GaugeMerge:
+    # how a gauge is combined across worker snapshots
+    # totals (in-flight work, open connections) add up
+    SUM = "sum"
+    # peaks, averages, per-worker limits and lag: the worst worker is what matters
+    MAX = "max"
+    # health flags: only true when every worker reports it
+    MIN = "min"
+
+    FUNCTIONS: Dict[str, Callable[[float, float], float]] = {SUM: lambda a, b: a + b, MAX: max, MIN: min}
+
+
+class Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+
+    def samples(self) -> List[list]: ...
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        super().__init__(name, documentation, label_names)
+        self.values: Dict[LabelValues, float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1.0) -> None:
+        self.values[label_values] = self.values.get(label_values, 0.0) + amount
+
+    def samples(self) -> List[list]:
+        return [[list(labels), value] for labels, value in self.values.items()]
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        merge: str = GaugeMerge.SUM,
+    ):
+        super().__init__(name, documentation, label_names)
+        self.merge = merge
+        self.values: Dict[LabelValues, float] = {}
+
+    def set(self, value: float, *label_values: str) -> None:
+        self.values[label_values] = float(value)
+
+    def samples(self) -> List[list]:
+        return [[list(labels), value] for labels, value in self.values.items()]
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+        # per label set: non-cumulative bucket counts (last slot is +Inf) and the running sum
+        self.counts: Dict[LabelValues, List[int]] = {}
+        self.sums: Dict[LabelValues, float] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        counts = self.counts.get(label_values)
+        if counts is None:
+            counts = [0] * (len(self.buckets) + 1)
+            self.counts[label_values] = counts
+            self.sums[label_values] = 0.0
+
+        counts[bisect_left(self.buckets, value)] += 1
+        self.sums[label_values] += value
+
+    def samples(self) -> List[list]:
+        return [[list(labels), [list(counts), self.sums[labels]]] for labels, counts in self.counts.items()]
+
+
+class MetricsRegistry:
+    FILE_PREFIX = "metrics-"
+
+    def __init__(self):
+        self.metrics: Dict[str, Metric] = {}
+        self.collectors: List[Callable[[], None]] = []
+
+    def _register(self, metric: Metric) -> Metric:
+        existing = self.metrics.get(metric.name)
+        if existing is not None:
+            return existing
+
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, label_names))  # type: ignore
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        merge: str = GaugeMerge.SUM,
+    ) -> Gauge:
+        return self._register(Gauge(name, documentation, label_names, merge))  # type: ignore
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, label_names, buckets))  # type: ignore
+
+    def record_statistics(
+        self,
+        prefix: str,
+        statistics: Dict[str, float],
+        label_names: Sequence[str] = (),
+        label_values: Sequence[str] = (),
+    ) -> None:
+        # exposes a component's statistics() dictionary as one gauge per key
+        for key, value in statistics.items():
+            gauge = self.gauge(
+                f"{prefix}_{key}",
+                f"{prefix} {key.replace('_', ' ')}",
+                label_names,
+                self.statistic_merge(key),
+            )
+            gauge.set(value, *label_values)
+
+    @staticmethod
+    def statistic_merge(key: str) -> str:
+        # max_wait_time, max_pool_size, average_wait_time, ... are per worker values, summing them means nothing
+        if key.startswith("max") or key.startswith("average"):
+            return GaugeMerge.MAX
+
+        return GaugeMerge.SUM
+
+    def register_collector(self, collector: Callable[[], None]) -> None:
+        # collectors refresh gauges right before a snapshot is taken
+        self.collectors.append(collector)
+
+    def snapshot(self) -> dict:
+        for collector in self.collectors:
+            collector()
+
+        snapshot = {}
+        for name, metric in self.metrics.items():
+            snapshot[name] = {
+                "kind": metric.kind,
+                "documentation": metric.documentation,
+                "label_names": list(metric.label_names),
+                "buckets": list(getattr(metric, "buckets", [])),
+                "merge": getattr(metric, "merge", GaugeMerge.SUM),
+                "samples": metric.samples(),
+            }
+
+        return snapshot
+
+    def dump(self, directory: str) -> None:
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{self.FILE_PREFIX}{os.getpid()}.json")
+        temporary_path = f"{path}.tmp"
+
+        with open(temporary_path, "w") as f:
+            json.dump(self.snapshot(), f)
+
+        # atomic rename, readers never see a half written snapshot
+        os.replace(temporary_path, path)
+
+    def remove_dump(self, directory: str) -> None:
+        path = os.path.join(directory, f"{self.FILE_PREFIX}{os.getpid()}.json")
+        if os.path.exists(path):
+            os.remove(path)
+
+    @staticmethod
+    def is_alive(pid: int) -> bool:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+
+        return True
+
+    def load(self, directory: str) -> List[dict]:
+        snapshots = []
+        for filename in os.listdir(directory):
+            if not filename.startswith(self.FILE_PREFIX) or not filename.endswith(".json"):
+                continue
+
+            path = os.path.join(directory, filename)
+            pid = int(filename.removeprefix(self.FILE_PREFIX).removesuffix(".json"))
+            if not self.is_alive(pid):
+                # worker is gone, its values must not be reported forever
+                os.remove(path)
+                continue
+
+            with open(path) as f:
+                snapshots.append(json.load(f))
+
+        return snapshots
+
+    @staticmethod
+    def merge(snapshots: List[dict]) -> dict:
+        merged: dict = {}
+        for snapshot in snapshots:
+            for name, metric in snapshot.items():
+                target = merged.setdefault(name, {**metric, "samples": {}})
+                for labels, value in metric["samples"]:
+                    key = tuple(labels)
+                    current = target["samples"].get(key)
+                    if current is None:
+                        target["samples"][key] = value
+                    elif metric["kind"] == "histogram":
+                        counts = [a + b for a, b in zip(current[0], value[0])]
+                        target["samples"][key] = [counts, current[1] + value[1]]
+                    else:
+                        # counters add up, gauges are combined with their own merge mode
+                        combine = GaugeMerge.FUNCTIONS[metric.get("merge", GaugeMerge.SUM)]
+                        target["samples"][key] = combine(current, value)
+
+        for metric in merged.values():
+            metric["samples"] = [[list(labels), value] for labels, value in metric["samples"].items()]
+
+        return merged
+
+    @staticmethod
+    def format_labels(label_names: Sequence[str], label_values: Sequence[str], extra: str = "") -> str:
+        pairs = []
+        for name, value in zip(label_names, label_values):
+            value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+            pairs.append(f'{name}="{value}"')
+
+        if extra:
+            pairs.append(extra)
+
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def render(self, snapshot: dict) -> str:
+        lines = []
+        for name, metric in sorted(snapshot.items()):
+            label_names = metric["label_names"]
+            lines.append(f"# HELP {name} {metric['documentation']}")
+            lines.append(f"# TYPE {name} {metric['kind']}")
+
+            for labels, value in metric["samples"]:
+                if metric["kind"] != "histogram":
+                    lines.append(f"{name}{self.format_labels(label_names, labels)} {value}")
+                    continue
+
+                counts, total = value
+                cumulative = 0
+                for bound, count in zip([*metric["buckets"], "+Inf"], counts):
+                    cumulative += count
+                    le = f'le="{bound}"'
+                    lines.append(f"{name}_bucket{self.format_labels(label_names, labels, le)} {cumulative}")
+
+                lines.append(f"{name}_sum{self.format_labels(label_names, labels)} {total}")
+                lines.append(f"{name}_count{self.format_labels(label_names, labels)} {cumulative}")
+
+        return "\n".join(lines) + "\n"
+
+    def exposition(self, directory: Optional[str] = None) -> str:
+        if not directory:
+            return self.render(self.snapshot())
+
+        self.dump(directory)
+        return self.render(self.merge(self.load(directory)))
+
+
+REGISTRY = MetricsRegistry()
@@ -1,4 +1,6 @@
 from .cryptography import Cryptography, KeyBackend, KeyType
 from .jwt import Jwt, JwtPayload
+from .token_cache import TokenCache
+from .password import PasswordExecutor
 
-__all__ = ["Cryptography", "KeyBackend", "KeyType", "Jwt", "JwtPayload"]
+__all__ = ["Cryptography", "KeyBackend", "KeyType", "Jwt", "JwtPayload", "TokenCache", "PasswordExecutor"]
@@ -1,7 +1,7 @@
 import os
 from enum import Enum
 from loguru import logger
-from typing import Optional, Tuple
+from typing import Dict, Optional, Tuple, Union
 
 from cryptography.hazmat.primitives.asymmetric import ec, rsa
 from cryptography.hazmat.primitives import serialization
@@ -27,6 +27,10 @@ class KeyType(Enum):
     REFRESH = "refresh"
 
 
+PublicKey = Union[ec.EllipticCurvePublicKey, rsa.RSAPublicKey]
+PrivateKey = Union[ec.EllipticCurvePrivateKey, rsa.RSAPrivateKey]
+
+
 class Cryptography:
     PUBLIC_KEY_FILENAME = "public_key.pem"
     PRIVATE_KEY_FILENAME = "private_key.pem"
@@ -52,6 +56,9 @@ class Cryptography:
         self.refresh_private_key: Optional[str] = None
         self.refresh_public_key: Optional[str] = None
 
+        # parsed key objects, keyed by (key type, is public)
+        self.key_objects: Dict[Tuple[KeyType, bool], Union[PublicKey, PrivateKey]] = {}
+
     def generate(self):
         if self.backend == KeyBackend.EC:
             self.generate_ec(self.directory)
@@ -67,6 +74,13 @@ class Cryptography:
     def caching_keypair(self):
         self.access_public_key, self.access_private_key = self.load_keypair(KeyType.ACCESS)
         self.refresh_public_key, self.refresh_private_key = self.load_keypair(KeyType.REFRESH)
+
+        # parse PEM once, so signing and verifying never touch the PEM parser again
+        self.key_objects.clear()
+        for key_type in KeyType:
+            for is_public in (True, False):
+                self.key_objects[(key_type, is_public)] = self.read_key_object(key_type, is_public)
+
         logger.info("Keypair cached successfully 🐳")
 
     def load_keypair(self, key_type: KeyType) -> Tuple[str, str]:
@@ -230,3 +244,23 @@ class Cryptography:
             )
 
             return pem.decode("utf-8")
+
+    def read_key_object(self, key_type: KeyType, is_public: bool) -> Union[PublicKey, PrivateKey]:
+        directory = os.path.join(self.directory, key_type.value)
+        if is_public:
+            with open(os.path.join(directory, Cryptography.PUBLIC_KEY_FILENAME), "rb") as f:
+                return serialization.load_pem_public_key(f.read(), backend=default_backend())  # type: ignore
+
+        with open(os.path.join(directory, Cryptography.PRIVATE_KEY_FILENAME), "rb") as f:
+            return serialization.load_pem_private_key(f.read(), password=None, backend=default_backend())  # type: ignore
+
+    def load_key_object(self, key_type: KeyType, is_public: bool) -> Union[PublicKey, PrivateKey]:
+        key = self.key_objects.get((key_type, is_public))
+        if key is not None:
+            return key
+
+        key = self.read_key_object(key_type, is_public)
+        if self.is_caching:
+            self.key_objects[(key_type, is_public)] = key
+
+        return key
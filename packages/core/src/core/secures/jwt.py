@@ -54,12 +54,15 @@ class Jwt:
         elif cryptography.backend == KeyBackend.RSA:
             self.algorithm = "RS256"
 
+        self.algorithms = [self.algorithm]
+
     def encode(self, payload: JwtPayload, key_type: KeyType) -> str:
-        private_key = self.cryptography.load_key(key_type, is_public=False)
-        token = jwt.encode(payload.model_dump(), private_key, algorithm=self.algorithm)
+        # key objects are passed straight to PyJWT, which skips PEM parsing on every call
+        private_key = self.cryptography.load_key_object(key_type, is_public=False)
+        token = jwt.encode(payload.model_dump(), private_key, algorithm=self.algorithm)  # type: ignore
         return token
 
     def decode(self, token: str, key_type: KeyType) -> JwtPayload:
-        public_key = self.cryptography.load_key(key_type, is_public=True)
-        payload = jwt.decode(token, public_key, algorithms=[self.algorithm])
+        public_key = self.cryptography.load_key_object(key_type, is_public=True)
+        payload = jwt.decode(token, public_key, algorithms=self.algorithms)  # type: ignore
         return JwtPayload.from_dict(payload)
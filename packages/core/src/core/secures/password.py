@@ -0,0 +1,80 @@
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+from argon2 import PasswordHasher
+from argon2.exceptions import VerificationError
+
+
+class PasswordExecutor:
+    # argon2 releases the GIL while hashing, so a small thread pool keeps the event loop free
+    def __init__(
+        self,
+        max_workers: int,
+        time_cost: int,
+        memory_cost: int,
+        parallelism: int,
+    ):
+        self.hasher = PasswordHasher(
+            time_cost=time_cost,
+            memory_cost=memory_cost,
+            parallelism=parallelism,
+        )
+
+        self.max_workers = max_workers
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="argon2")
+        # bounds work handed to the pool, callers above the limit wait on the event loop instead
+        self.semaphore = asyncio.Semaphore(max_workers)
+
+        self.waiting = 0
+        self.running = 0
+        self.completed = 0
+        self.max_waiting = 0
+        self.total_wait_time = 0.0
+
+    async def _run(self, function: Callable[..., Any], *args: Any) -> Any:
+        queued_at = time.perf_counter()
+        self.waiting += 1
+        self.max_waiting = max(self.max_waiting, self.waiting)
+
+        try:
+            await self.semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        self.total_wait_time += time.perf_counter() - queued_at
+        self.running += 1
+
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, function, *args)
+        finally:
+            self.running -= 1
+            self.completed += 1
+            self.semaphore.release()
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self.hasher.hash, password)
+
+    async def verify(self, password_hash: str, password: str) -> bool:
+        try:
+            return await self._run(self.hasher.verify, password_hash, password)
+        except VerificationError:
+            return False
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        # only parses the encoded parameters, cheap enough to run inline
+        return self.hasher.check_needs_rehash(password_hash)
+
+    def statistics(self) -> Dict[str, float]:
+        return {
+            "max_workers": self.max_workers,
+            "queue_depth": self.waiting,
+            "running": self.running,
+            "completed": self.completed,
+            "max_queue_depth": self.max_waiting,
+            "average_wait_time": self.total_wait_time / self.completed if self.completed else 0.0,
+        }
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,63 @@
+import time
+import hashlib
+from typing import Any, Dict, Optional
+
+from core.helpers import TTLCache
+
+from .jwt import JwtPayload
+
+
+class TokenCache:
+    def __init__(
+        self,
+        max_tokens: int,
+        max_token_ttl: int,
+        max_accounts: int,
+        account_ttl: int,
+    ):
+        # verified claims keyed by token digest, expiring at the token's exp
+        self.claims: TTLCache[bytes, JwtPayload] = TTLCache(max_tokens, max_token_ttl)
+        # session jti -> token digest, so sign-out and refresh can invalidate a cached token
+        self.jtis: TTLCache[str, bytes] = TTLCache(max_tokens, max_token_ttl)
+        # short-lived account lookups for auth_middleware
+        self.accounts: TTLCache[str, Any] = TTLCache(max_accounts, account_ttl)
+
+    @staticmethod
+    def digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get_claims(self, token: str) -> Optional[JwtPayload]:
+        return self.claims.get(self.digest(token))
+
+    def set_claims(self, token: str, claims: JwtPayload) -> None:
+        ttl = claims.exp - time.time()
+        if ttl <= 0:
+            return
+
+        digest = self.digest(token)
+        self.claims.set(digest, claims, ttl)
+        self.jtis.set(claims.jti, digest, ttl)
+
+    def get_account(self, account_id: str) -> Optional[Any]:
+        return self.accounts.get(account_id)
+
+    def set_account(self, account_id: str, account: Any) -> None:
+        self.accounts.set(account_id, account)
+
+    def invalidate(self, jti: str) -> None:
+        digest = self.jtis.pop(jti)
+        if digest is None:
+            return
+
+        claims = self.claims.pop(digest)
+        if claims is not None:
+            self.accounts.pop(claims.account_id)
+
+    def invalidate_account(self, account_id: str) -> None:
+        self.accounts.pop(account_id)
+
+    def statistics(self) -> Dict[str, Dict[str, int]]:
+        return {
+            "claims": self.claims.statistics(),
+            "accounts": self.accounts.statistics(),
+        }
@@ -2,11 +2,12 @@ from .account_entity import AccountEntity
 from .base_entity import BaseEntity
 from .role_entity import RoleEntity, EnumRole
 from .disease_entity import DiseaseEntity
-from .notification_entity import NotificationEntity
+from .notification_entity import NotificationEntity, NotificationType
 from .submission_entity import SubmissionEntity
 from .post_entity import PostEntity
 from .provider_entity import EnumProvider, ProviderEntity
 from .session_entity import SessionEntity
+from .read_models import BaseReadModel, AccountSummary, PostCard
 
 __all__ = [
     "AccountEntity",
@@ -15,9 +16,13 @@ __all__ = [
     "EnumRole",
     "DiseaseEntity",
     "NotificationEntity",
+    "NotificationType",
     "SubmissionEntity",
     "PostEntity",
     "EnumProvider",
     "ProviderEntity",
     "SessionEntity",
+    "BaseReadModel",
+    "AccountSummary",
+    "PostCard",
 ]
@@ -7,6 +7,7 @@ from domain.entities import BaseEntity
 class NotificationType(Enum):
     SUBMISSION = "submission"
     DISEASE = "disease"
+    POST = "post"
 
 
 class NotificationEntity(BaseEntity):
@@ -0,0 +1,32 @@
+from abc import ABC
+from datetime import datetime
+from typing import Dict, List, Optional
+from pydantic import Field
+
+from fastapi_camelcase import CamelModel
+
+
+class BaseReadModel(CamelModel, ABC):
+    # Lightweight view over a collection: only the declared fields are fetched from MongoDB
+    id: Optional[str] = Field(default=None, alias="id")
+
+    @classmethod
+    def projection(cls) -> Dict[str, int]:
+        # documents store snake_case field names, _id is always returned by MongoDB
+        return {name: 1 for name in cls.model_fields if name != "id"}
+
+
+class AccountSummary(BaseReadModel):
+    username: str
+    email: str
+    avatar: str
+
+
+class PostCard(BaseReadModel):
+    account_id: str
+    image_url: str
+    title: str
+    tags: List[str]
+    viewer: int
+    favorite: int
+    created_at: datetime
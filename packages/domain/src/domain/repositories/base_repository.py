@@ -1,19 +1,32 @@
 from abc import ABC, abstractmethod
-from typing import Generic, TypeVar, Optional, List, Tuple
+from typing import Generic, TypeVar, Optional, List, Tuple, Type, AsyncIterator
 
-from core.base import Meta
-from domain.entities import BaseEntity
+from core.base import Meta, BulkWriteReport
+from domain.entities import BaseEntity, BaseReadModel
 
 T = TypeVar("T", bound=BaseEntity)
+R = TypeVar("R", bound=BaseReadModel)
 
 
 class IBaseRepository(Generic[T], ABC):
     @abstractmethod
     async def create(self, entity: T) -> T: ...
 
+    @abstractmethod
+    async def create_many(self, entities: List[T]) -> BulkWriteReport: ...
+
+    @abstractmethod
+    async def upsert_many(self, entities: List[T]) -> BulkWriteReport: ...
+
+    @abstractmethod
+    async def bulk_update(self, entities: List[T]) -> BulkWriteReport: ...
+
     @abstractmethod
     async def find_one(self, query: dict) -> Optional[T]: ...
 
+    @abstractmethod
+    async def find_one_projected(self, query: dict, model: Type[R]) -> Optional[R]: ...
+
     @abstractmethod
     async def update_one(self, entity: T) -> T: ...
 
@@ -26,6 +39,18 @@ class IBaseRepository(Generic[T], ABC):
     @abstractmethod
     async def find(self, query: Optional[dict] = None) -> List[T]: ...
 
+    @abstractmethod
+    async def find_projected(self, query: Optional[dict], model: Type[R]) -> List[R]: ...
+
+    @abstractmethod
+    def iter_find(self, query: Optional[dict] = None, batch_size: int = 500) -> AsyncIterator[T]: ...
+
+    @abstractmethod
+    def iter_find_projected(self, query: Optional[dict], model: Type[R], batch_size: int = 500) -> AsyncIterator[R]: ...
+
+    @abstractmethod
+    async def count(self, query: dict) -> int: ...
+
     @abstractmethod
     async def paginated(
         self,
@@ -34,4 +59,19 @@ class IBaseRepository(Generic[T], ABC):
         page_size: int = 20,
         order: str = "asc",
         order_by: str = "created_at",
+        cursor: Optional[str] = None,
+        include_total: bool = True,
     ) -> Tuple[List[T], Meta]: ...
+
+    @abstractmethod
+    async def paginated_projected(
+        self,
+        model: Type[R],
+        query: Optional[dict] = None,
+        page: int = 1,
+        page_size: int = 20,
+        order: str = "asc",
+        order_by: str = "created_at",
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+    ) -> Tuple[List[R], Meta]: ...
@@ -1,11 +1,11 @@
 from bson import ObjectId
-from typing import List, Tuple
+from typing import List, Tuple, AsyncIterator
 from fastapi import Depends
 
-from core.base import Meta
+from core.base import ExportQuery, Meta
 from core.exceptions import ExceptionHandler, ErrorCodes
 
-from domain.entities import AccountEntity, ProviderEntity, EnumProvider
+from domain.entities import AccountEntity, AccountSummary, ProviderEntity, EnumProvider
 from domain.usecases import (
     ManageAccountUseCase,
     FindAccountsQuery,
@@ -33,20 +33,24 @@ class AccountService(ManageAccountUseCase, ManageAccountProviderUseCase):
     async def find_accounts(
         self,
         query: FindAccountsQuery,
-    ) -> Tuple[List[AccountEntity], Meta]:
-        query_dict = {
-            "email": {
+    ) -> Tuple[List[AccountSummary], Meta]:
+        query_dict = {}
+        if query.search:
+            # an empty search matches everything, leaving the filter out allows an estimated count
+            query_dict["email"] = {
                 "$regex": query.search,
                 "$options": "i",
-            },
-        }
+            }
 
-        accounts, meta = await self.account_repository.paginated(
+        accounts, meta = await self.account_repository.paginated_projected(
+            AccountSummary,
             query_dict,
             page=query.page,
             page_size=query.page_size,
             order=query.order,
             order_by=query.order_by,
+            cursor=query.cursor,
+            include_total=query.include_total,
         )
 
         return accounts, meta
@@ -58,6 +62,25 @@ class AccountService(ManageAccountUseCase, ManageAccountProviderUseCase):
 
         return account
 
+    async def find_summary_by_id(self, account_id: str) -> AccountSummary:
+        # used on every authenticated request, the password hash and timestamps are never loaded
+        account = await self.account_repository.find_one_projected({"_id": ObjectId(account_id)}, AccountSummary)
+        if not account:
+            raise ExceptionHandler(code=ErrorCodes.NOT_FOUND, msg=f"Account with ID {account_id} not found 🥹")
+
+        return account
+
+    def export_accounts(self, query: ExportQuery) -> AsyncIterator[AccountSummary]:
+        query_dict = {}
+        if query.search:
+            query_dict["email"] = {
+                "$regex": query.search,
+                "$options": "i",
+            }
+
+        # streamed straight from the cursor, password hashes are never part of an export
+        return self.account_repository.iter_find_projected(query_dict, AccountSummary, query.batch_size)
+
     async def find_by_email(self, req: FindAccountByEmailQuery) -> AccountEntity:
         account = await self.account_repository.find_one({"email": req.email})
         if not account:
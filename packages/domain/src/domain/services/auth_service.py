@@ -2,11 +2,10 @@ import uuid
 import asyncio
 from typing import Tuple
 from fastapi import Depends
-from argon2 import PasswordHasher
 from bson import ObjectId
 
 from core.configuration import Configuration
-from core.secures import Jwt, JwtPayload, KeyType
+from core.secures import Jwt, JwtPayload, KeyType, TokenCache, PasswordExecutor
 from core.helpers import TimeHelper
 from core.exceptions import ExceptionHandler, ErrorCodes
 
@@ -33,6 +32,8 @@ class AuthService(ManageSignInUseCase, ManageAuthSessionUseCase):
         account_repository: IAccountRepository = Depends(),
         session_repository: ISessionRepository = Depends(),
         provider_repository: IProviderRepository = Depends(),
+        token_cache: TokenCache = Depends(),
+        password_executor: PasswordExecutor = Depends(),
     ):
         self.account_repository = account_repository
         self.session_repository = session_repository
@@ -40,6 +41,8 @@ class AuthService(ManageSignInUseCase, ManageAuthSessionUseCase):
         self.supabase = supabase
         self.jwt = jwt
         self.config = config
+        self.token_cache = token_cache
+        self.password_executor = password_executor
 
     async def _sign_tokens(self, account: AccountEntity) -> Tuple[str, str, str]:
         timestamp = TimeHelper.vn_timezone().timestamp()
@@ -131,9 +134,8 @@ class AuthService(ManageSignInUseCase, ManageAuthSessionUseCase):
 
     async def auth_with_email_password(self, req: AuthWithEmailPasswordRequest) -> AuthResponse:
         account = await self.account_repository.find_one({"email": req.email})
-        ph = PasswordHasher()
         if account is None:
-            password_hash = ph.hash(req.password)
+            password_hash = await self.password_executor.hash(req.password)
 
             account_entity = AccountEntity.create(
                 username=req.email.split("@")[0],
@@ -150,9 +152,14 @@ class AuthService(ManageSignInUseCase, ManageAuthSessionUseCase):
                 raise ExceptionHandler(ErrorCodes.BAD_REQUEST, "Account have social provider, please reset password 🥺")
 
             # verify password
-            if not ph.verify(account.password, req.password):
+            if not await self.password_executor.verify(account.password, req.password):
                 raise ExceptionHandler(ErrorCodes.BAD_REQUEST, "Your password is incorrect, please try again 🤧")
 
+            # upgrade hashes created with older argon2 parameters
+            if self.password_executor.needs_rehash(account.password):
+                account.password = await self.password_executor.hash(req.password)
+                await self.account_repository.update_one(account)
+
         return await self._sign_tokens_and_create_session(
             account=account,
             device_token=req.device_token,
@@ -192,8 +199,16 @@ class AuthService(ManageSignInUseCase, ManageAuthSessionUseCase):
             self.session_repository.delete_one({"access_token_jti": payload.jti}),
         ]
         await asyncio.gather(*tasks)
+
+        # old access token shares the jti of the refreshed session
+        self.token_cache.invalidate(payload.jti)
         return AuthResponse(access_token=access_token, refresh_token=refresh_token)
 
     async def sign_out(self, account_id: str) -> bool:
+        sessions = await self.session_repository.find({"account_id": ObjectId(account_id)})
+        for session in sessions:
+            self.token_cache.invalidate(session.access_token_jti)
+
+        self.token_cache.invalidate_account(account_id)
         await self.session_repository.delete_many({"account_id": ObjectId(account_id)})
         return True
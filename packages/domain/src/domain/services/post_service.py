@@ -1,9 +1,12 @@
 from bson import ObjectId
+from typing import List, Tuple, AsyncIterator
 from fastapi import Depends
 
-from domain.entities import PostEntity
+from core.base import ExportQuery, Meta
+
+from domain.entities import AccountSummary, PostEntity, PostCard, NotificationType
 from domain.repositories import IPostRepository, IAccountRepository
-from domain.usecases import ManagePostUseCase, CreatePostRequest
+from domain.usecases import ManagePostUseCase, CreatePostRequest, FindPostsQuery
 
 from adapters.secondary import RabbitMQConnection
 
@@ -20,7 +23,7 @@ class PostService(ManagePostUseCase):
         self.queue = queue
 
     async def create_post(self, account_id: str, req: CreatePostRequest) -> PostEntity:
-        account = await self.account_repository.find_one({"_id": ObjectId(account_id)})
+        account = await self.account_repository.find_one_projected({"_id": ObjectId(account_id)}, AccountSummary)
         if not account:
             raise ValueError("Owner account does not exist 🐶")
 
@@ -32,14 +35,51 @@ class PostService(ManagePostUseCase):
             tags=req.tags,
         )
 
+        # the notification references the post, so it is only sent once the post has its id
+        post = await self.post_repository.create(post)
+
         await self.queue.send_messages(
-            {
-                "account_id": account_id,
-                "message": "New post created",
-            },
+            [
+                {
+                    "account_id": account_id,
+                    "ref_id": post.id,
+                    "ref_type": NotificationType.POST.value,
+                    "message": "New post created",
+                }
+            ],
             "agrismart.notifications",
         )
 
-        print(f"Creating post: {post}")
-        # return await self.post_repository.create(post)
         return post
+
+    async def find_posts(self, query: FindPostsQuery) -> Tuple[List[PostCard], Meta]:
+        query_dict = {}
+        if query.search:
+            query_dict["title"] = {
+                "$regex": query.search,
+                "$options": "i",
+            }
+
+        # cards skip the captions, which are by far the largest part of a post
+        posts, meta = await self.post_repository.paginated_projected(
+            PostCard,
+            query_dict,
+            page=query.page,
+            page_size=query.page_size,
+            order=query.order,
+            order_by=query.order_by,
+            cursor=query.cursor,
+            include_total=query.include_total,
+        )
+
+        return posts, meta
+
+    def export_posts(self, query: ExportQuery) -> AsyncIterator[PostEntity]:
+        query_dict = {}
+        if query.search:
+            query_dict["title"] = {
+                "$regex": query.search,
+                "$options": "i",
+            }
+
+        return self.post_repository.iter_find(query_dict, query.batch_size)
@@ -53,6 +53,8 @@ class RoleService(ManageRoleUseCase):
             page_size=query.page_size,
             order=query.order,
             order_by=query.order_by,
+            cursor=query.cursor,
+            include_total=query.include_total,
         )
 
         return roles, meta
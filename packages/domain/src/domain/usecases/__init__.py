@@ -18,7 +18,7 @@ from .account_usecases import (
 from .role_usecases import ManageRoleUseCase, CreateRoleRequest, FindRolesQuery, UpdateRoleRequest
 from .media_usecases import UploadMediaUseCase, UploadMediaRequest
 from .notification_usecases import PushNotificationUseCase
-from .post_usecases import ManagePostUseCase, CreatePostRequest
+from .post_usecases import ManagePostUseCase, CreatePostRequest, FindPostsQuery
 from .diagnostic_usecases import GradingDiagnosticUseCase
 from .session_usecases import ManageSessionUseCase, CreateSessionParams
 
@@ -50,6 +50,7 @@ __all__ = [
     # post
     "ManagePostUseCase",
     "CreatePostRequest",
+    "FindPostsQuery",
     # diagnostic
     "GradingDiagnosticUseCase",
     # session
@@ -1,9 +1,9 @@
 from abc import ABC, abstractmethod
-from typing import Tuple, List
+from typing import Tuple, List, AsyncIterator
 from fastapi_camelcase import CamelModel
 
-from core.base import BaseQuery, Meta
-from domain.entities import AccountEntity, EnumProvider, ProviderEntity
+from core.base import BaseQuery, ExportQuery, Meta
+from domain.entities import AccountEntity, AccountSummary, EnumProvider, ProviderEntity
 
 # ============================== MANAGE ACCOUNT USECASES ==============================
 
@@ -28,11 +28,17 @@ class ManageAccountUseCase(ABC):
     async def find_accounts(
         self,
         query: FindAccountsQuery,
-    ) -> Tuple[List[AccountEntity], Meta]: ...
+    ) -> Tuple[List[AccountSummary], Meta]: ...
 
     @abstractmethod
     async def find_by_id(self, account_id: str) -> AccountEntity: ...
 
+    @abstractmethod
+    async def find_summary_by_id(self, account_id: str) -> AccountSummary: ...
+
+    @abstractmethod
+    def export_accounts(self, query: ExportQuery) -> AsyncIterator[AccountSummary]: ...
+
     @abstractmethod
     async def create_account(self, req: CreateAccountRequest) -> AccountEntity: ...
 
@@ -1,8 +1,9 @@
-from typing import List
+from typing import List, Tuple, AsyncIterator
 from fastapi_camelcase import CamelModel
 from abc import ABC, abstractmethod
 
-from domain.entities import PostEntity
+from core.base import BaseQuery, ExportQuery, Meta
+from domain.entities import PostEntity, PostCard
 
 
 class CreatePostRequest(CamelModel):
@@ -12,6 +13,16 @@ class CreatePostRequest(CamelModel):
     captions: List[str]
 
 
+class FindPostsQuery(BaseQuery):
+    pass
+
+
 class ManagePostUseCase(ABC):
     @abstractmethod
     async def create_post(self, account_id: str, req: CreatePostRequest) -> PostEntity: ...
+
+    @abstractmethod
+    async def find_posts(self, query: FindPostsQuery) -> Tuple[List[PostCard], Meta]: ...
+
+    @abstractmethod
+    def export_posts(self, query: ExportQuery) -> AsyncIterator[PostEntity]: ...
@@ -1,31 +1,42 @@
 from core.configuration import Configuration
-from core.database import Database, CollectionName
+from core.database import DatabaseRegistry, CollectionName
+
+from adapters.secondary import SessionStorageMode
 
 from .sync_background import SyncBackground
 from .background_task import BackgroundTask
 from .clean_session_background import CleanSessionBackground
+from .metrics_background import MetricsBackground
 
 
 class ManageBackgroundTasks:
     def __init__(
         self,
         configuration: Configuration,
-        database: Database
+        databases: DatabaseRegistry
     ):
         self.configuration = configuration
-        self.sync_background = SyncBackground(configuration)
+        self.sync_background = SyncBackground(configuration, databases)
         self.clean_session_background = CleanSessionBackground(
             configuration.CLEAN_SESSION_INTERVAL,
-            database.get_collection(CollectionName.SESSIONS)
+            databases.default().get_collection(CollectionName.SESSIONS),
+            is_enabled=configuration.SESSION_STORAGE_MODE == SessionStorageMode.SWEEP,
+            batch_size=configuration.CLEAN_SESSION_BATCH_SIZE,
+        )
+        self.metrics_background = MetricsBackground(
+            configuration.METRICS_FLUSH_INTERVAL,
+            configuration.METRICS_DIRECTORY,
         )
 
     async def start(self):
         await self.sync_background.start()
         await self.clean_session_background.start()
+        await self.metrics_background.start()
 
     async def stop(self):
         await self.sync_background.stop()
         await self.clean_session_background.stop()
+        await self.metrics_background.stop()
 
 
-__all__ = ["SyncBackground", "ManageBackgroundTasks", "BackgroundTask", "CleanSessionBackground"]
+__all__ = ["SyncBackground", "ManageBackgroundTasks", "BackgroundTask", "CleanSessionBackground", "MetricsBackground"]
@@ -2,22 +2,49 @@ import time
 from loguru import logger
 from pymongo.asynchronous.collection import AsyncCollection
 
+from core.metrics import REGISTRY
+
 from .background_task import BackgroundTask
 
+SESSIONS_DELETED = REGISTRY.counter("sessions_deleted_total", "Expired sessions deleted by the sweep")
+SESSIONS_DELETION_RATE = REGISTRY.gauge("sessions_deletion_rate", "Expired sessions deleted per second in the last sweep")
+
 
 class CleanSessionBackground(BackgroundTask):
+    # Fallback for SESSION_STORAGE_MODE=sweep, with the TTL mode MongoDB removes expired sessions itself
     def __init__(
         self,
         interval: int,
         collection: AsyncCollection,
+        is_enabled: bool = True,
+        batch_size: int = 1000,
     ):
         super().__init__(
             name="Clean Session",
-            is_enabled=True,
+            is_enabled=is_enabled,
             interval=interval,
         )
         self.collection = collection
+        self.batch_size = batch_size
 
     async def run_task(self):
-        sessions = await self.collection.delete_many({"expired_at": {"$lt": time.time()}})
-        logger.info(f"Cleaned {sessions.deleted_count} expired sessions from the database")
+        start_time = time.perf_counter()
+        now = time.time()
+        deleted = 0
+
+        # small batches walked on the expired_at index keep every delete short and yield between batches
+        while True:
+            cursor = self.collection.find({"expired_at": {"$lt": now}}, projection={"_id": 1})
+            docs = await cursor.sort("expired_at", 1).limit(self.batch_size).to_list(length=None)
+            if not docs:
+                break
+
+            result = await self.collection.delete_many({"_id": {"$in": [doc["_id"] for doc in docs]}})
+            deleted += result.deleted_count
+            if len(docs) < self.batch_size:
+                break
+
+        duration = time.perf_counter() - start_time
+        SESSIONS_DELETED.inc(amount=deleted)
+        SESSIONS_DELETION_RATE.set(deleted / duration if duration > 0 else 0.0)
+        logger.info(f"Cleaned {deleted} expired sessions from the database in {duration:.2f}s")
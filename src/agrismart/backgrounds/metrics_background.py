@@ -0,0 +1,22 @@
+from core.metrics import REGISTRY
+
+from .background_task import BackgroundTask
+
+
+class MetricsBackground(BackgroundTask):
+    def __init__(self, interval: int, directory: str):
+        super().__init__(
+            name="Metrics",
+            is_enabled=bool(directory),
+            interval=interval,
+        )
+        self.directory = directory
+
+    async def run_task(self):
+        # keeps this worker's snapshot fresh for whichever worker serves the scrape
+        REGISTRY.dump(self.directory)
+
+    async def stop(self):
+        await super().stop()
+        if self.directory:
+            REGISTRY.remove_dump(self.directory)
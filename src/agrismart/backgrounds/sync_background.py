@@ -5,13 +5,14 @@ from loguru import logger
 from typing import Optional
 
 from core.configuration import Configuration
-from adapters.secondary import SyncScheduler
+from core.database import DatabaseRegistry
+from adapters.secondary import SyncScheduler, SyncMode
 
 
 class SyncBackground:
-    def __init__(self, config: Configuration):
+    def __init__(self, config: Configuration, databases: DatabaseRegistry):
         self.config = config
-        self.sync_scheduler = SyncScheduler(config)
+        self.sync_scheduler = SyncScheduler(config, databases)
         self.task: Optional[asyncio.Task] = None
         self.is_running = False
 
@@ -45,7 +46,31 @@ class SyncBackground:
 
         await self.sync_scheduler.close()
 
+    async def _run_stream(self):
+        # returns once change streams turn out to be unavailable, the interval scan takes over from there
+        while self.is_running:
+            try:
+                if not await self.sync_scheduler.tail_changes():
+                    return
+
+                # failing documents are skipped after SYNC_MAX_ATTEMPTS reopens, which are spaced out exponentially
+                delay = self.sync_scheduler.reopen_delay()
+                logger.info(f"Change stream stopped, reopening from the stored resume token in {delay:.0f}s")
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error in change stream sync: {e}")
+                await asyncio.sleep(30)
+
     async def _run_scheduler(self):
+        if self.config.SYNC_MODE == SyncMode.STREAM:
+            try:
+                await self._run_stream()
+            except asyncio.CancelledError:
+                logger.info("Sync scheduler cancelled")
+                return
+
         interval = self.config.SYNC_DATABASE_INTERVAL * 60  # Convert minutes to seconds
         logger.info(f"Sync background scheduler will run every {interval // 60} seconds")
         while self.is_running:
@@ -59,12 +84,21 @@ class SyncBackground:
 
                 table = []
                 for collection, stats in results.items():
-                    table.append([collection, stats["synced"], stats["skipped"], stats["errors"]])  # type: ignore
+                    table.append(
+                        [
+                            collection,
+                            stats["synced"],
+                            stats["skipped"],
+                            stats["errors"],
+                            f"{stats['duration']:.2f}",
+                            f"{stats['docs_per_second']:.1f}",
+                        ]
+                    )
 
                 end = datetime.datetime.now()
                 logger.info(f"Sync background scheduler finished at {end} - Duration: {duration} seconds")
                 logger.info(
-                    f"Sync results:\n{tabulate(table, headers=["Collection", "Synced", "Skipped", "Errors"], tablefmt="pretty")}"
+                    f"Sync results:\n{tabulate(table, headers=["Collection", "Synced", "Skipped", "Errors", "Duration (s)", "Docs/s"], tablefmt="pretty")}"
                 )
 
                 logger.info(f"Next sync in {interval // 60} minutes")
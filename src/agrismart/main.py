@@ -9,15 +9,27 @@ from contextlib import asynccontextmanager
 
 from core.configuration import Configuration
 from core.exceptions import ErrorCodes, ExceptionHandler
-from core.secures import Cryptography, KeyBackend
-
-from adapters.primary import RateLimitingMiddleware, TracingMiddleware, v1, v2
-from adapters.secondary import RabbitMQConnection
+from core.secures import Cryptography, KeyBackend, TokenCache, PasswordExecutor
+from core.database import DatabaseRegistry, CollectionName
+from core.helpers import LoggerHelper
+from core.metrics import REGISTRY, GaugeMerge
+
+from adapters.primary import RateLimitingMiddleware, TracingMiddleware, v1, v2, metrics
+from adapters.secondary import RabbitMQConnection, MemoryBrokerConnection
+from adapters.secondary import sync_indexes, find_collection_scans, SessionRepository
 from adapters.secondary import Cloudinary
-from adapters.shared.dependencies import build_database
+from adapters.shared.dependencies import build_rate_limiter
 
 from agrismart.backgrounds import ManageBackgroundTasks
 
+EXCEPTIONS_TOTAL = REGISTRY.counter("exceptions_total", "Handled exceptions by error code", ("code",))
+RABBITMQ_CONNECTED = REGISTRY.gauge(
+    "rabbitmq_connected",
+    "Whether the RabbitMQ connection and channel are open on every worker",
+    merge=GaugeMerge.MIN,
+)
+RABBITMQ_CONSUMERS = REGISTRY.gauge("rabbitmq_consumers", "Running RabbitMQ consumer tasks")
+
 
 @asynccontextmanager
 async def lifespan(application: FastAPI):
@@ -40,7 +52,50 @@ async def lifespan(application: FastAPI):
     cryptography.generate()
 
     # Initialize RabbitMQ connection
-    queue = RabbitMQConnection(configuration.RABBITMQ_BROKER_URL)
+    queue_options = dict(
+        channel_pool_size=configuration.RABBITMQ_CHANNEL_POOL_SIZE,
+        confirm_batch_size=configuration.RABBITMQ_CONFIRM_BATCH_SIZE,
+        outbox_linger_ms=configuration.RABBITMQ_OUTBOX_LINGER_MS,
+        message_format=configuration.QUEUE_MESSAGE_FORMAT,
+        compression_threshold=configuration.QUEUE_COMPRESSION_THRESHOLD,
+    )
+    if configuration.QUEUE_BACKEND == "memory":
+        queue = MemoryBrokerConnection(configuration.QUEUE_MEMORY_LATENCY_MS, **queue_options)
+    else:
+        queue = RabbitMQConnection(configuration.RABBITMQ_BROKER_URL, **queue_options)
+
+    # Process-wide database clients, every repository reuses these connection pools
+    databases = DatabaseRegistry(configuration)
+    database = databases.default()
+
+    # Sessions written under the previous storage mode are converted once
+    sessions = SessionRepository(database.get_collection(CollectionName.SESSIONS), configuration.SESSION_STORAGE_MODE)
+    migrated = await sessions.migrate_storage()
+    if migrated:
+        logger.info(f"Converted {migrated} sessions to the {configuration.SESSION_STORAGE_MODE} storage mode")
+
+    # Reconcile the index specs declared by the repositories
+    if configuration.IS_INDEX_SYNC_ENABLED:
+        await sync_indexes(database)
+        if configuration.MODE == "DEVELOPMENT":
+            for offender in await find_collection_scans(database):
+                logger.warning(f"Query is planned as a collection scan: {offender} 🐢")
+
+    # Verified access tokens and their accounts, shared by every request on this worker
+    token_cache = TokenCache(
+        max_tokens=configuration.TOKEN_CACHE_SIZE,
+        max_token_ttl=configuration.ACCESS_TOKEN_EXPIRATION,
+        max_accounts=configuration.ACCOUNT_CACHE_SIZE,
+        account_ttl=configuration.ACCOUNT_CACHE_TTL,
+    )
+
+    # Argon2 hashing runs on a bounded thread pool instead of the event loop
+    password_executor = PasswordExecutor(
+        max_workers=configuration.PASSWORD_HASHER_WORKERS,
+        time_cost=configuration.ARGON2_TIME_COST,
+        memory_cost=configuration.ARGON2_MEMORY_COST,
+        parallelism=configuration.ARGON2_PARALLELISM,
+    )
 
     # Store in app state
     # noinspection PyUnresolvedReferences
@@ -49,17 +104,39 @@ async def lifespan(application: FastAPI):
     application.state.queue = queue
     # noinspection PyUnresolvedReferences
     application.state.cryptography = cryptography
+    # noinspection PyUnresolvedReferences
+    application.state.databases = databases
+    # noinspection PyUnresolvedReferences
+    application.state.token_cache = token_cache
+    # noinspection PyUnresolvedReferences
+    application.state.password_executor = password_executor
+
+    # Gauges are refreshed from the shared instances right before every snapshot
+    def collect_gauges():
+        for name, statistics in databases.statistics().items():
+            REGISTRY.record_statistics("mongo_pool", statistics, ("database",), (name,))
+
+        for name, statistics in token_cache.statistics().items():
+            REGISTRY.record_statistics("token_cache", statistics, ("cache",), (name,))
+
+        REGISTRY.record_statistics("password_executor", password_executor.statistics())
+        RABBITMQ_CONNECTED.set(queue.status())
+        REGISTRY.record_statistics("rabbitmq_channel_pool", queue.statistics())
+        RABBITMQ_CONSUMERS.set(len(queue.consumer_tasks))
+
+    REGISTRY.register_collector(collect_gauges)
 
     # Initialize external services
     Cloudinary.setup(config)
 
     await queue.connect()
-    await queue.start_all_consumers()
+    # consumers pause while requests are already queueing for a Mongo connection
+    await queue.start_all_consumers(database, probes=[lambda: database.pool_statistics.waiters > 0])
 
     # Initialize Background Tasks
     background_tasks = ManageBackgroundTasks(
         configuration,
-        build_database(configuration),
+        databases,
     )
     await background_tasks.start()
 
@@ -70,12 +147,22 @@ async def lifespan(application: FastAPI):
     await queue.disconnect()
     await background_tasks.stop()
 
+    for name, statistics in databases.statistics().items():
+        logger.info(f"Database {name} pool statistics: {statistics}")
 
+    await databases.close()
+    await rate_limiter.close()
+    password_executor.shutdown()
+    await logger.complete()
+
+
+LoggerHelper.configure()
 app = FastAPI(lifespan=lifespan)
 
 # Initialize CORS middleware
 config = Configuration()
 origins = [str(origin) for origin in config.CORS_ALLOWED_ORIGINS.split(",")]
+rate_limiter = build_rate_limiter(config)
 
 # noinspection PyTypeChecker
 app.add_middleware(
@@ -89,10 +176,17 @@ app.add_middleware(
 # noinspection PyTypeChecker
 app.add_middleware(TracingMiddleware)
 # noinspection PyTypeChecker
-app.add_middleware(RateLimitingMiddleware)
+app.add_middleware(
+    RateLimitingMiddleware,
+    limiter=rate_limiter,
+    requests=config.RATE_LIMIT_REQUESTS,
+    duration=config.RATE_LIMIT_DURATION,
+    rules=config.RATE_LIMIT_RULES,
+)
 
 app.include_router(v1, prefix="/api/v1")
 app.include_router(v2, prefix="/api/v2")
+app.include_router(metrics)
 
 
 # Custom exception handlers when validation fails
@@ -105,6 +199,7 @@ async def custom_request_validation_exception_handler(_: Request, exc: RequestVa
 # Custom exception handler for general exceptions
 @app.exception_handler(ExceptionHandler)
 async def exception_handler(_: Request, exc: ExceptionHandler):
+    EXCEPTIONS_TOTAL.inc(exc.code.value)
     return JSONResponse(
         status_code=status.HTTP_200_OK,
         content={
@@ -0,0 +1,132 @@
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from tabulate import tabulate
+from aio_pika import Message
+
+from adapters.secondary import BatchConsumer, ChannelPool, FlowController, LoopLagMonitor, QueueTopology
+
+from .publishing import open_connection
+
+QUEUE_NAME = "agrismart.benchmark.consumers"
+BATCH_SIZE = 10
+
+
+def busy(seconds: float) -> None:
+    # holds the GIL like a diagnosis model would, so the event loop feels it too
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+async def run_case(broker: str, messages: int, work: float, is_adaptive: bool, latency_ms: float) -> list:
+    loop = asyncio.get_running_loop()
+    connection = await open_connection(broker, latency_ms)
+
+    channel = await connection.channel()
+    topology = QueueTopology(QUEUE_NAME, max_retries=0, retry_delay_ms=0)
+    queue = await topology.declare(channel)
+    await queue.purge()
+
+    pool = ChannelPool(connection, size=1, confirm_batch_size=256)
+    await pool.open()
+    await pool.publish([Message(body=b"{}") for _ in range(messages)], QUEUE_NAME)
+
+    # the saturable downstream: two model workers behind a queue of pending messages
+    executor = ThreadPoolExecutor(max_workers=2)
+    state = {"pending": 0, "max_pending": 0, "done": 0, "max_lag": 0.0, "pauses": 0}
+    finished = asyncio.Event()
+
+    async def handler(batch):
+        state["pending"] += len(batch)
+        state["max_pending"] = max(state["max_pending"], state["pending"])
+        try:
+            await loop.run_in_executor(executor, busy, work * len(batch))
+        finally:
+            state["pending"] -= len(batch)
+
+        state["done"] += len(batch)
+        if state["done"] >= messages:
+            finished.set()
+
+        return []
+
+    monitor = LoopLagMonitor(interval=0.02)
+    monitor.start()
+
+    controller = None
+    if is_adaptive:
+        controller = FlowController(
+            QUEUE_NAME,
+            prefetch=BATCH_SIZE * 2,
+            min_prefetch=BATCH_SIZE,
+            max_prefetch=BATCH_SIZE * 50,
+            target_latency=work * BATCH_SIZE * 2,
+            monitor=monitor,
+            probes=[lambda: state["pending"] > BATCH_SIZE * 4],
+        )
+
+    consumer = BatchConsumer(
+        topology,
+        handler,
+        batch_size=BATCH_SIZE,
+        max_wait=0.02,
+        prefetch=BATCH_SIZE * 2 if is_adaptive else BATCH_SIZE * 50,
+        concurrency=8,
+        publisher=pool,
+        controller=controller,
+        control_interval=0.25,
+    )
+
+    async def sample():
+        was_paused = False
+        while True:
+            await asyncio.sleep(0.05)
+            state["max_lag"] = max(state["max_lag"], monitor.lag)
+            if controller and controller.is_paused and not was_paused:
+                state["pauses"] += 1
+            was_paused = bool(controller and controller.is_paused)
+
+    consume_channel = await connection.channel()
+    start_time = time.perf_counter()
+    tasks = [asyncio.create_task(consumer.run(consume_channel)), asyncio.create_task(sample())]
+
+    await finished.wait()
+    duration = time.perf_counter() - start_time
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    await monitor.stop()
+    await pool.close()
+    await queue.delete(if_unused=False, if_empty=False)
+    await channel.queue_delete(topology.dead_queue_name)
+    await connection.close()
+    executor.shutdown()
+
+    return [
+        "Adaptive prefetch + backpressure" if is_adaptive else "Fixed prefetch",
+        messages,
+        f"{messages / duration:,.0f}",
+        state["max_pending"],
+        f"{state['max_lag'] * 1000:.1f}",
+        state["pauses"],
+        controller.prefetch if controller else consumer.prefetch,
+    ]
+
+
+def consumers(broker: str, messages: int = 2000, work_ms: float = 2.0, latency_ms: float = 0) -> None:
+    table = [
+        asyncio.run(run_case(broker, messages, work_ms / 1000, is_adaptive, latency_ms))
+        for is_adaptive in (False, True)
+    ]
+
+    print(
+        tabulate(
+            table,
+            headers=["Consumer", "Messages", "Msg/sec", "Max in handler", "Max loop lag (ms)", "Pauses", "Final prefetch"],
+            tablefmt="pretty",
+            colalign=("left", "right", "right", "right", "right", "right", "right"),
+        )
+    )
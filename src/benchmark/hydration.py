@@ -0,0 +1,94 @@
+import time
+from typing import Callable, List, Type
+from bson import ObjectId
+from tabulate import tabulate
+from pydantic import BaseModel
+
+from core.helpers import TimeHelper
+from domain.entities import AccountEntity, PostEntity, PostCard
+
+from adapters.secondary.repositories.codec import ModelCodec
+
+
+def legacy_convert(doc: dict, model: Type[BaseModel]) -> BaseModel:
+    # previous BaseRepository.convert_doc_to_entity
+    doc["id"] = str(doc["_id"])
+    for key, value in doc.items():
+        if "_id" in key and key != "_id":
+            doc[key] = str(value) if isinstance(value, ObjectId) else value
+
+    return model(**doc)
+
+
+def build_account(index: int) -> dict:
+    return {
+        "_id": ObjectId(),
+        "username": f"benchmark_{index}",
+        "email": f"benchmark_{index}@agrismart.dev",
+        "password": "$argon2id$v=19$m=65536,t=3,p=4$c2FsdHNhbHQ$aGFzaGhhc2hoYXNoaGFzaA",
+        "avatar": f"https://res.cloudinary.com/agrismart/avatars/{index}.png",
+        "created_at": TimeHelper.vn_timezone(),
+        "updated_at": TimeHelper.vn_timezone(),
+        "deleted_at": None,
+    }
+
+
+def build_post(index: int) -> dict:
+    return {
+        "_id": ObjectId(),
+        "account_id": ObjectId(),
+        "image_url": f"https://res.cloudinary.com/agrismart/posts/{index}.png",
+        "title": f"Rice blast outbreak report #{index}",
+        "captions": [f"Paragraph {paragraph} of the report " * 8 for paragraph in range(5)],
+        "tags": ["rice", "blast", "mekong"],
+        "viewer": index,
+        "favorite": index // 2,
+        "created_at": TimeHelper.vn_timezone(),
+        "updated_at": TimeHelper.vn_timezone(),
+        "deleted_at": None,
+    }
+
+
+def measure(operation: Callable[[List[dict]], object], docs: List[dict], rounds: int) -> float:
+    # documents are mutated while decoding, every round gets fresh copies outside the timed section
+    elapsed = 0.0
+    for _ in range(rounds):
+        batch = [dict(doc) for doc in docs]
+        start_time = time.perf_counter()
+        operation(batch)
+        elapsed += time.perf_counter() - start_time
+
+    return elapsed / rounds
+
+
+def hydration(documents: int = 10000, rounds: int = 5) -> None:
+    datasets = [
+        ("AccountEntity", AccountEntity, [build_account(index) for index in range(documents)]),
+        ("PostEntity", PostEntity, [build_post(index) for index in range(documents)]),
+        ("PostCard", PostCard, [build_post(index) for index in range(documents)]),
+    ]
+
+    table = []
+    for name, model, docs in datasets:
+        codec = ModelCodec.for_model(model)
+
+        cases = [
+            ("legacy key walk + model(**doc)", lambda batch: [legacy_convert(doc, model) for doc in batch]),
+            ("codec + TypeAdapter (bulk)", codec.decode_many),
+        ]
+
+        baseline = None
+        for path, function in cases:
+            seconds = measure(function, docs, rounds)
+            baseline = baseline or seconds
+            per_10k = seconds * 10000 / documents * 1000
+            table.append([name, path, f"{per_10k:,.1f}", f"{baseline / seconds:.2f}x"])
+
+    print(
+        tabulate(
+            table,
+            headers=["Model", "Path", "ms / 10k docs", "Speedup"],
+            tablefmt="pretty",
+            colalign=("left", "left", "right", "right"),
+        )
+    )
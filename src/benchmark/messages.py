@@ -0,0 +1,76 @@
+import json
+import time
+from typing import Callable
+from tabulate import tabulate
+
+from adapters.secondary import MessageCodec, decode
+
+
+def measure(operation: Callable[[], object], iterations: int) -> float:
+    start_time = time.perf_counter()
+    for _ in range(iterations):
+        operation()
+
+    return iterations / (time.perf_counter() - start_time)
+
+
+def build_payloads() -> dict:
+    notification = {
+        "account_id": "66a0f0c2a1b2c3d4e5f60001",
+        "ref_id": "66a0f0c2a1b2c3d4e5f6abcd",
+        "ref_type": "post",
+        "message": "New post created",
+    }
+
+    # submission metadata: one entry per detected leaf region
+    submission = {
+        "account_id": "66a0f0c2a1b2c3d4e5f60001",
+        "submission_id": "66a0f0c2a1b2c3d4e5f6beef",
+        "image_url": "https://res.cloudinary.com/agrismart/submissions/66a0f0c2a1b2c3d4e5f6beef.jpg",
+        "model": "rice-leaf-disease-yolo",
+        "predictions": [
+            {
+                "label": ["bacterial_leaf_blight", "brown_spot", "leaf_smut", "healthy"][index % 4],
+                "confidence": round(0.5 + (index % 50) / 100, 4),
+                "box": [index * 3.5, index * 2.25, index * 3.5 + 64.0, index * 2.25 + 48.0],
+            }
+            for index in range(200)
+        ],
+    }
+
+    return {"notification": notification, "submission": submission}
+
+
+def messages(iterations: int = 10000) -> None:
+    codecs = [
+        ("orjson", MessageCodec("json")),
+        ("orjson + zstd", MessageCodec("json", compression_threshold=1)),
+        ("msgpack", MessageCodec("msgpack")),
+        ("msgpack + zstd", MessageCodec("msgpack", compression_threshold=1)),
+    ]
+
+    table = []
+    for name, payload in build_payloads().items():
+        # the previous path: json text encoded as UTF-8, json.loads(body.decode()) in the consumer
+        legacy = json.dumps(payload).encode()
+        encode_ops = measure(lambda: json.dumps(payload).encode(), iterations)
+        decode_ops = measure(lambda: json.loads(legacy.decode()), iterations)
+        table.append([name, "json (legacy)", len(legacy), f"{encode_ops:,.0f}", f"{decode_ops:,.0f}"])
+
+        for codec_name, codec in codecs:
+            body, content_type, content_encoding, headers = codec.encode(payload)
+            if decode(body, content_type, content_encoding, headers) != json.loads(legacy):
+                print(f"⚠️ {codec_name} does not round trip the {name} payload")
+
+            encode_ops = measure(lambda: codec.encode(payload), iterations)
+            decode_ops = measure(lambda: decode(body, content_type, content_encoding, headers), iterations)
+            table.append([name, codec_name, len(body), f"{encode_ops:,.0f}", f"{decode_ops:,.0f}"])
+
+    print(
+        tabulate(
+            table,
+            headers=["Payload", "Encoding", "Bytes", "Encode/sec", "Decode/sec"],
+            tablefmt="pretty",
+            colalign=("left", "left", "right", "right", "right"),
+        )
+    )
@@ -0,0 +1,119 @@
+import os
+import time
+import asyncio
+from datetime import datetime, timedelta
+import httpx
+from loguru import logger
+from tabulate import tabulate
+from fastapi import FastAPI, Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from adapters.primary import RateLimitingMiddleware, TracingMiddleware
+from adapters.secondary import MemoryRateLimiter
+
+
+class LegacyTracingMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        start_time = time.perf_counter()
+
+        client_ip = request.client.host if request.client else "Unknown"
+        method = request.method
+        url = str(request.url)
+        user_agent = request.headers.get("User-Agent", "Unknown")
+
+        logger.info(f"📌 [Request] IP: {client_ip}, Method: {method}, URL: {url}, User-Agent: {user_agent}")
+
+        response = await call_next(request)
+        process_time = time.perf_counter() - start_time
+
+        logger.info(
+            f"✅ [Response] IP: {client_ip}, Method: {method}, URL: {url}, User-Agent: {user_agent}, Process Time: {process_time:.4f}s"
+        )
+
+        response.headers["X-Process-Time"] = str(process_time)
+        return response
+
+
+class LegacyRateLimitingMiddleware(BaseHTTPMiddleware):
+    RATE_LIMIT_DURATION = timedelta(minutes=1)
+    RATE_LIMIT_REQUESTS = 10**9
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.request_counts = {}
+
+    async def dispatch(self, request: Request, call_next):
+        client_ip = request.client.host  # type: ignore
+        request_count, last_request = self.request_counts.get(client_ip, (0, datetime.min))
+        if datetime.now() - last_request > self.RATE_LIMIT_DURATION:
+            request_count = 1
+        else:
+            request_count += 1
+
+        self.request_counts[client_ip] = (request_count, datetime.now())
+        return await call_next(request)
+
+
+def build_application(is_legacy: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"message": "pong"}
+
+    if is_legacy:
+        app.add_middleware(LegacyTracingMiddleware)
+        app.add_middleware(LegacyRateLimitingMiddleware)
+    else:
+        app.add_middleware(TracingMiddleware)
+        app.add_middleware(
+            RateLimitingMiddleware,
+            limiter=MemoryRateLimiter(max_clients=10000),
+            requests=10**9,
+            duration=60,
+        )
+
+    return app
+
+
+async def run_load(app: FastAPI, requests: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=app, client=("127.0.0.1", 50000))
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def call():
+            async with semaphore:
+                response = await client.get("/ping", headers={"User-Agent": "benchmark"})
+                response.raise_for_status()
+
+        start_time = time.perf_counter()
+        await asyncio.gather(*[call() for _ in range(requests)])
+        return requests / (time.perf_counter() - start_time)
+
+
+def middlewares(requests: int = 5000, concurrency: int = 50) -> None:
+    results = []
+
+    for name, is_legacy in [("BaseHTTPMiddleware + sync logging", True), ("Pure ASGI + enqueued logging", False)]:
+        # write logs somewhere cheap so the comparison measures the request path, not the terminal
+        with open(os.devnull, "w") as devnull:
+            logger.remove()
+            sink = logger.add(devnull, enqueue=not is_legacy)
+
+            rps = asyncio.run(run_load(build_application(is_legacy), requests, concurrency))
+            results.append((name, rps))
+
+            # remove() drains the enqueued records before the file is closed
+            logger.remove(sink)
+
+    baseline = results[0][1]
+    table = [[name, requests, concurrency, f"{rps:,.0f}", f"{rps / baseline:.2f}x"] for name, rps in results]
+
+    print(
+        tabulate(
+            table,
+            headers=["Stack", "Requests", "Concurrency", "Req/sec", "Speedup"],
+            tablefmt="pretty",
+            colalign=("left", "right", "right", "right", "right"),
+        )
+    )
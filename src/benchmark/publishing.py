@@ -0,0 +1,123 @@
+import time
+import asyncio
+import orjson
+from typing import Awaitable, Callable
+from tabulate import tabulate
+from aio_pika import connect_robust, Message, DeliveryMode
+from aio_pika.abc import AbstractRobustConnection
+
+from adapters.secondary import ChannelPool, PublisherOutbox, MemoryBroker
+
+QUEUE_NAME = "agrismart.benchmark"
+
+
+async def open_connection(broker: str, latency_ms: float = 0) -> AbstractRobustConnection:
+    # "memory" runs against the in-process broker, deterministic and without a RabbitMQ server
+    if broker == "memory":
+        return MemoryBroker(latency_ms / 1000).connect()  # type: ignore
+
+    return await connect_robust(broker)
+
+
+def build_message(index: int) -> Message:
+    body = orjson.dumps({"account_id": f"66a0f0c2a1b2c3d4e5f6{index:04x}", "message": "New post created"})
+    return Message(body=body, content_type="application/json", delivery_mode=DeliveryMode.PERSISTENT)
+
+
+async def run_load(publish: Callable[[int], Awaitable[None]], messages: int, concurrency: int) -> float:
+    # every caller sends one message, as PostService.create_post does per request
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def call(index: int):
+        async with semaphore:
+            await publish(index)
+
+    start_time = time.perf_counter()
+    await asyncio.gather(*[call(index) for index in range(messages)])
+    return messages / (time.perf_counter() - start_time)
+
+
+async def transaction_path(connection: AbstractRobustConnection, messages: int, concurrency: int) -> float:
+    channel = await connection.channel(publisher_confirms=False)
+    # a transaction spans the whole channel, concurrent callers have to take turns
+    lock = asyncio.Lock()
+
+    async def publish(index: int):
+        async with lock:
+            async with channel.transaction():
+                await channel.default_exchange.publish(build_message(index), routing_key=QUEUE_NAME)
+
+    try:
+        return await run_load(publish, messages, concurrency)
+    finally:
+        await channel.close()
+
+
+async def pool_path(
+    connection: AbstractRobustConnection,
+    messages: int,
+    concurrency: int,
+    pool_size: int,
+    linger: float = 0,
+) -> float:
+    pool = ChannelPool(connection, pool_size, confirm_batch_size=256)
+    await pool.open()
+    outbox = PublisherOutbox(pool, linger) if linger else None
+
+    async def publish(index: int):
+        if outbox:
+            await outbox.publish([build_message(index)], QUEUE_NAME)
+        else:
+            await pool.publish([build_message(index)], QUEUE_NAME)
+
+    try:
+        return await run_load(publish, messages, concurrency)
+    finally:
+        if outbox:
+            await outbox.close()
+        await pool.close()
+
+
+async def run_publishing(broker: str, messages: int, concurrency: int, pool_size: int, latency_ms: float) -> list:
+    connection = await open_connection(broker, latency_ms)
+    channel = await connection.channel()
+    queue = await channel.declare_queue(QUEUE_NAME, auto_delete=True)
+
+    cases = [
+        ("Transaction per publish, one channel", lambda: transaction_path(connection, messages, concurrency)),
+        ("Confirms, channel pool", lambda: pool_path(connection, messages, concurrency, pool_size)),
+        ("Confirms, channel pool + 2ms outbox", lambda: pool_path(connection, messages, concurrency, pool_size, 0.002)),
+    ]
+
+    results = []
+    try:
+        for name, case in cases:
+            results.append((name, await case()))
+            await queue.purge()
+    finally:
+        await queue.delete(if_unused=False, if_empty=False)
+        await connection.close()
+
+    return results
+
+
+def publishing(
+    broker: str,
+    messages: int = 5000,
+    concurrency: int = 50,
+    pool_size: int = 4,
+    latency_ms: float = 0,
+) -> None:
+    results = asyncio.run(run_publishing(broker, messages, concurrency, pool_size, latency_ms))
+
+    baseline = results[0][1]
+    table = [[name, messages, concurrency, f"{rate:,.0f}", f"{rate / baseline:.2f}x"] for name, rate in results]
+
+    print(
+        tabulate(
+            table,
+            headers=["Path", "Messages", "Concurrency", "Publishes/sec", "Speedup"],
+            tablefmt="pretty",
+            colalign=("left", "right", "right", "right", "right"),
+        )
+    )
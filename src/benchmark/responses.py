@@ -0,0 +1,70 @@
+import json
+import time
+from typing import Callable
+from tabulate import tabulate
+from fastapi.responses import JSONResponse
+from fastapi.encoders import jsonable_encoder
+
+from core.base import HttpPaginationResponse, Meta
+from domain.entities import AccountEntity
+
+from adapters.primary import FastJSONResponse
+
+
+def measure(operation: Callable[[], object], iterations: int) -> float:
+    start_time = time.perf_counter()
+    for _ in range(iterations):
+        operation()
+
+    return iterations / (time.perf_counter() - start_time)
+
+
+def build_page(size: int) -> HttpPaginationResponse:
+    accounts = []
+    for index in range(size):
+        account = AccountEntity.create(
+            username=f"benchmark_{index}",
+            email=f"benchmark_{index}@agrismart.dev",
+            password=None,
+            avatar=f"https://res.cloudinary.com/agrismart/avatars/{index}.png",
+        )
+        account.id = f"66a0f0c2a1b2c3d4e5f6{index:04x}"
+        accounts.append(account)
+
+    return HttpPaginationResponse(
+        status_code=200,
+        message="Accounts retrieved successfully 🐳",
+        meta=Meta(page=1, page_size=size, total_page=1, total_record=size),
+        data=accounts,
+    )
+
+
+def responses(iterations: int = 1000, size: int = 100) -> None:
+    page = build_page(size)
+
+    # both paths must produce the same document, only the cost may differ
+    legacy = json.loads(JSONResponse(content=jsonable_encoder(page)).body)
+    fast = json.loads(FastJSONResponse(content=page).body)
+    if legacy != fast:
+        print("⚠️ Serialized bodies differ between the two paths")
+
+    cases = [
+        ("jsonable_encoder + JSONResponse", lambda: JSONResponse(content=jsonable_encoder(page))),
+        ("model_dump(mode=json) + orjson", lambda: FastJSONResponse(content=page)),
+    ]
+
+    table = []
+    baseline = None
+    for path, function in cases:
+        ops = measure(function, iterations)
+        baseline = baseline or ops
+        table.append([path, size, f"{ops:,.0f}", f"{1000 / ops:.3f}", f"{ops / baseline:.2f}x"])
+
+    print(
+        tabulate(
+            table,
+            headers=["Path", "Accounts", "Responses/sec", "ms/response", "Speedup"],
+            tablefmt="pretty",
+            colalign=("left", "right", "right", "right", "right"),
+        )
+    )
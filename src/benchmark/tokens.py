@@ -0,0 +1,75 @@
+import time
+import uuid
+import tempfile
+from typing import Callable
+import jwt
+from tabulate import tabulate
+
+from core.secures import Cryptography, Jwt, JwtPayload, KeyBackend, KeyType
+
+
+def measure(operation: Callable[[], object], iterations: int) -> float:
+    start_time = time.perf_counter()
+    for _ in range(iterations):
+        operation()
+
+    return iterations / (time.perf_counter() - start_time)
+
+
+def build_payload() -> JwtPayload:
+    timestamp = int(time.time())
+    return JwtPayload(
+        exp=timestamp + 3600,
+        iat=timestamp,
+        jti=str(uuid.uuid4()),
+        email="benchmark@agrismart.dev",
+        account_id="66a0f0c2a1b2c3d4e5f60718",
+    )
+
+
+def tokens(iterations: int = 1000) -> None:
+    table = []
+    payload = build_payload()
+
+    for backend in KeyBackend:
+        with tempfile.TemporaryDirectory() as directory:
+            cryptography = Cryptography(directory, backend, is_caching=True)
+            cryptography.generate()
+            uncached = Cryptography(directory, backend, is_caching=False)
+
+            cached_jwt = Jwt(cryptography)
+            algorithm = cached_jwt.algorithm
+            token = cached_jwt.encode(payload, KeyType.ACCESS)
+
+            # previous implementation: PEM strings handed to PyJWT, parsed on every call
+            def pem_encode(crypto: Cryptography) -> str:
+                private_key = crypto.load_key(KeyType.ACCESS, is_public=False)
+                return jwt.encode(payload.model_dump(), private_key, algorithm=algorithm)
+
+            def pem_decode(crypto: Cryptography) -> dict:
+                public_key = crypto.load_key(KeyType.ACCESS, is_public=True)
+                return jwt.decode(token, public_key, algorithms=[algorithm])
+
+            cases = [
+                ("encode", "PEM string (no caching)", lambda: pem_encode(uncached)),
+                ("encode", "PEM string (cached)", lambda: pem_encode(cryptography)),
+                ("encode", "Key object (cached)", lambda: cached_jwt.encode(payload, KeyType.ACCESS)),
+                ("decode", "PEM string (no caching)", lambda: pem_decode(uncached)),
+                ("decode", "PEM string (cached)", lambda: pem_decode(cryptography)),
+                ("decode", "Key object (cached)", lambda: cached_jwt.decode(token, KeyType.ACCESS)),
+            ]
+
+            baselines = {}
+            for operation, path, function in cases:
+                ops = measure(function, iterations)
+                baseline = baselines.setdefault(operation, ops)
+                table.append([backend.name, operation, path, f"{ops:,.0f}", f"{ops / baseline:.2f}x"])
+
+    print(
+        tabulate(
+            table,
+            headers=["Backend", "Operation", "Path", "Ops/sec", "Speedup"],
+            tablefmt="pretty",
+            colalign=("center", "center", "left", "right", "right"),
+        )
+    )
@@ -0,0 +1,45 @@
+import sys
+import asyncio
+import argparse
+from loguru import logger
+
+from core.configuration import Configuration
+from core.database import DatabaseRegistry
+
+from adapters.secondary import sync_indexes, assert_no_collection_scans
+
+
+async def check(is_syncing_indexes: bool) -> bool:
+    configuration = Configuration()
+    databases = DatabaseRegistry(configuration)
+    database = databases.default()
+
+    try:
+        # a fresh database (CI) has none of the declared indexes yet, every plan would be a COLLSCAN
+        if is_syncing_indexes:
+            await sync_indexes(database)
+
+        await assert_no_collection_scans(database)
+    except AssertionError as exception:
+        logger.error(str(exception))
+        return False
+    finally:
+        await databases.close()
+
+    logger.info("Every declared query plan is served by an index ✅")
+    return True
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Explain every repository's QUERY_PLANS and fail when one is planned as a collection scan."
+    )
+    parser.add_argument(
+        "--sync-indexes",
+        action="store_true",
+        help="Create the declared indexes before explaining the queries",
+    )
+
+    args = parser.parse_args()
+    if not asyncio.run(check(args.sync_indexes)):
+        sys.exit(1)